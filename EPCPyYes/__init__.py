@@ -32,3 +32,55 @@ __release__ = 'stable'
 
 
 TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), 'templates/epcis')
+
+COMPILED_TEMPLATES_PATH = os.environ.get(
+    'EPCPYYES_COMPILED_TEMPLATES',
+    os.path.join(os.path.dirname(__file__), 'templates/compiled.zip'))
+'''
+Path to a bundle of precompiled templates (a zip file or a directory)
+created by `EPCPyYes.core.v1_2.environment.compile_templates`.  When the
+bundle exists the default environment loads templates from it instead of
+parsing and compiling the template sources.
+'''
+
+TEMPLATE_BYTECODE_CACHE = os.environ.get('EPCPYYES_TEMPLATE_CACHE')
+'''
+Optional directory for an on-disk Jinja2 bytecode cache used by the
+default environment.
+'''
+
+INLINE_INCLUDES = os.environ.get(
+    'EPCPYYES_INLINE_INCLUDES', '0').lower() not in ('0', 'false', 'no', '')
+'''
+When true the registry environments inline the `{% include %}` tags of
+the templates when they are compiled (see
+`EPCPyYes.core.v1_2.environment.InliningEnvironment`).  Set the
+`EPCPYYES_INLINE_INCLUDES` environment variable to 1 to turn it on.
+'''
+
+CACHE_FRAGMENTS = os.environ.get(
+    'EPCPYYES_CACHE_FRAGMENTS', '0').lower() not in ('0', 'false', 'no', '')
+'''
+When true the template events keep the XML and JSON they render until
+one of their properties is set, so rendering the same event again skips
+the templates and encoders.  Off by default: each cached event holds on
+to its rendered output and changing a list of an event in place is not
+noticed.  Set it (or `EPCPYYES_CACHE_FRAGMENTS=1`) to turn the cache on
+for all events, or set `cache_fragments` on a single event.
+'''
+
+JSON_BACKEND = os.environ.get('EPCPYYES_JSON_BACKEND', 'json')
+'''
+The JSON backend used by `render_json` and the other JSON render methods
+(see `EPCPyYes.core.v1_2.json_backends`).  `json`, the default, is the
+standard library and writes the same text whatever is installed.  Set it
+(or `EPCPYYES_JSON_BACKEND`) to `orjson`, or to `auto` for `orjson` when
+it is installed, for the faster but compact output of `orjson`.
+'''
+
+ID_GENERATOR = os.environ.get('EPCPYYES_ID_GENERATOR', 'uuid4')
+'''
+The generator of the identifiers EPCPyYes makes up- decoded event ids
+and SBDH instance identifiers (see `EPCPyYes.core.ids`).  `uuid4`, the
+default, `ulid` or `counter`; set `EPCPYYES_ID_GENERATOR` to change it.
+'''
@@ -16,7 +16,7 @@
 import enum
 from datetime import datetime
 from typing import List
-from uuid import uuid4
+from EPCPyYes.core.ids import LAZY_ID, new_id
 
 
 class PartnerType(enum.Enum):
@@ -185,7 +185,7 @@ class DocumentIdentification(object):
     ):
         self._standard = standard
         self._type_version = type_version
-        self._instance_identifier = instance_identifier or str(uuid4())
+        self._instance_identifier = instance_identifier or LAZY_ID
         self._document_type = document_type
         self._multiple_type = multiple_type
         self._creation_date_and_time = creation_date_and_time
@@ -208,6 +208,9 @@ class DocumentIdentification(object):
 
     @property
     def instance_identifier(self):
+        # generated when first read unless one was given
+        if self._instance_identifier is LAZY_ID:
+            self._instance_identifier = new_id()
         return self._instance_identifier
 
     @instance_identifier.setter
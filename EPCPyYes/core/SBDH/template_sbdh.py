@@ -23,6 +23,7 @@ class StandardBusinessDocumentHeader(sbdh.StandardBusinessDocumentHeader,
     '''
     The SBDH header as defined in the GS1 protocol.
     '''
+    encoder = json_encoders.sbdh_encoder
 
     def __init__(
             self,
@@ -38,8 +39,6 @@ class StandardBusinessDocumentHeader(sbdh.StandardBusinessDocumentHeader,
                          partners, header_version)
         TemplateMixin.__init__(self)
         self.template = 'epcis/sbdh.xml'
-        self.encoder = json_encoders.StandardBusinessDocumentHeaderEncoder()
 
-    def render(self):
-        self._context = {"header": self}
-        return super().render()
+    def get_context(self):
+        return {"header": self}
@@ -0,0 +1,169 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The generators of the identifiers EPCPyYes makes up- the `id` of the
+events created by the JSON decoders and the `InstanceIdentifier` of
+SBDH headers.
+
+Three generators ship with EPCPyYes:
+
+* `uuid4`- random UUIDs (`str(uuid.uuid4())`), the default.
+* `ulid`- ULID-style identifiers: 26 characters of Crockford base 32
+  holding the millisecond timestamp and 80 random bits.  They sort by
+  creation time and skip the entropy reads of `uuid4`.
+* `counter`- a monotonic counter (`1`, `2`, ...).  Unique within a
+  process only.
+
+`EPCPyYes.ID_GENERATOR` picks the default and `register_id_generator`
+adds your own:
+
+.. code-block:: python
+
+    ids.register_id_generator('node', ids.CounterIDGenerator('node-1:'))
+    EPCPyYes.ID_GENERATOR = 'node'
+
+Values set to `LAZY_ID` are only generated when they are first read, so
+identifiers nobody looks at are never generated at all.
+'''
+import itertools
+import os
+import random
+import threading
+import time
+from uuid import uuid4
+
+import EPCPyYes
+
+
+class _LazyID(object):
+    '''
+    The type of `LAZY_ID`.
+    '''
+
+    def __repr__(self):
+        return 'LAZY_ID'
+
+    def __reduce__(self):
+        # unpickles to the module's instance so identity checks still
+        # hold for events decoded in worker processes
+        return 'LAZY_ID'
+
+
+LAZY_ID = _LazyID()
+'''
+Stands in for an identifier that is generated with `new_id` when it is
+first read.
+'''
+
+
+def uuid4_id():
+    '''
+    :return: A random UUID string.
+    '''
+    return str(uuid4())
+
+
+_random = random.Random()
+_CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+# the characters of every 10 bit value, so a 130 bit value is written
+# with 13 lookups
+_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]
+_SHIFTS = tuple(range(120, -1, -10))
+
+
+def _reseed():
+    _random.seed()
+
+
+if hasattr(os, 'register_at_fork'):
+    # forked workers would generate the same random bits otherwise
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def ulid_id():
+    '''
+    :return: A ULID-style identifier- the millisecond timestamp and 80
+        random bits in 26 characters of Crockford base 32.
+    '''
+    value = int(time.time() * 1000) << 80 | _random.getrandbits(80)
+    return ''.join([_PAIRS[value >> shift & 1023] for shift in _SHIFTS])
+
+
+class CounterIDGenerator(object):
+    '''
+    Generates the identifiers of a monotonic counter, optionally with a
+    prefix that keeps the counters of several processes apart.
+    '''
+
+    def __init__(self, prefix: str = '', start: int = 1):
+        '''
+        :param prefix: Put in front of every number.
+        :param start: The first number.
+        '''
+        self.prefix = prefix
+        self._count = itertools.count(start)
+
+    def __call__(self):
+        return '%s%d' % (self.prefix, next(self._count))
+
+
+_generators = {
+    'uuid4': uuid4_id,
+    'ulid': ulid_id,
+    'counter': CounterIDGenerator(),
+}
+_lock = threading.Lock()
+
+
+def register_id_generator(name: str, generator):
+    '''
+    Registers an identifier generator under the given name.
+    :param name: The name set as `EPCPyYes.ID_GENERATOR` or passed to
+        `new_id`.
+    :param generator: A callable returning a new identifier string.
+    '''
+    with _lock:
+        _generators[name] = generator
+
+
+def get_id_generator(name: str = None):
+    '''
+    Returns the generator registered under the given name.
+    :param name: The generator name.  The default is
+        `EPCPyYes.ID_GENERATOR`.
+    :return: A callable returning a new identifier string.
+    '''
+    name = name or EPCPyYes.ID_GENERATOR
+    try:
+        return _generators[name]
+    except KeyError:
+        raise ValueError('Unknown ID generator %r.  Available generators '
+                         'are: %s' % (name, ', '.join(sorted(_generators))))
+
+
+def available_id_generators():
+    '''
+    :return: The names of the registered generators.
+    '''
+    return sorted(_generators)
+
+
+def new_id(name: str = None):
+    '''
+    :param name: The generator name.  The default is
+        `EPCPyYes.ID_GENERATOR`.
+    :return: A new identifier string.
+    '''
+    return get_id_generator(name)()
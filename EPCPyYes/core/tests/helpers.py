@@ -0,0 +1,270 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Factories for the events, headers and lists used throughout the tests.
+'''
+import uuid
+from datetime import datetime
+
+from EPCPyYes.core.v1_2.helpers import gtin_urn_generator, \
+    get_current_utc_time_and_offset, gln13_data_to_sgln_urn
+from EPCPyYes.core.v1_2.events import BusinessTransaction, \
+    Source, Destination, Action, QuantityElement, ErrorDeclaration
+from EPCPyYes.core.v1_2.template_events import ObjectEvent, AggregationEvent, \
+    TransactionEvent, TransformationEvent
+from EPCPyYes.core.v1_2.CBV.dispositions import Disposition
+from EPCPyYes.core.v1_2.CBV.source_destination import SourceDestinationTypes
+from EPCPyYes.core.v1_2.CBV.business_steps import BusinessSteps
+from EPCPyYes.core.v1_2.CBV.business_transactions import \
+    BusinessTransactionType
+from EPCPyYes.core.v1_2.CBV.instance_lot_master_data import \
+    InstanceLotMasterDataAttribute, \
+    LotLevelAttributeName, ItemLevelAttributeName
+from EPCPyYes.core.v1_2.CBV import helpers, error_reasons
+from EPCPyYes.core.SBDH import template_sbdh
+from EPCPyYes.core.SBDH import sbdh
+
+PARENT_ID = 'urn:epc:id:sgtin:305555.2555555.235'
+
+
+def create_epcs(start=1000, end=1002):
+    # create a range for the number generation
+    # (we can use SerialBox as well)
+    nums = range(start, end)
+    # generate some URNS
+    epcs = gtin_urn_generator('305555', '1', '555555', nums)
+    return list(epcs)
+
+
+def create_error_declaration():
+    return ErrorDeclaration(
+        reason=error_reasons.ErrorReason.incorrect_data.value,
+        corrective_event_ids=[str(uuid.uuid4()), str(uuid.uuid4())]
+    )
+
+
+def create_business_transaction_list():
+    business_transaction_list = [
+        BusinessTransaction('urn:epcglobal:cbv:bt:0555555555555.DE45_111',
+                            BusinessTransactionType.Despatch_Advice),
+        BusinessTransaction('urn:epcglobal:cbv:bt:0555555555555.00001',
+                            BusinessTransactionType.Bill_Of_Lading)
+    ]
+    return business_transaction_list
+
+
+def create_source_list():
+    # send in the GLN info
+    biz_location = gln13_data_to_sgln_urn(company_prefix='305555',
+                                          location_reference='123456')
+    read_point = gln13_data_to_sgln_urn(company_prefix='305555',
+                                        location_reference='123456',
+                                        extension='12')
+    # create a source list
+    source_list = [
+        Source(SourceDestinationTypes.possessing_party.value,
+               biz_location),
+        Source(SourceDestinationTypes.location.value, read_point)
+    ]
+    return biz_location, read_point, source_list
+
+
+def create_destination_list():
+    # create a destination and a destination list
+    destination_party = gln13_data_to_sgln_urn(company_prefix='0614141',
+                                               location_reference='00001')
+    destination_location = gln13_data_to_sgln_urn(company_prefix='0614141',
+                                                  location_reference='00001',
+                                                  extension='23')
+    destination_list = [
+        Destination(SourceDestinationTypes.owning_party.value,
+                    destination_party),
+        Destination(SourceDestinationTypes.location.value,
+                    destination_location)
+    ]
+    return destination_list
+
+
+def create_ilmd():
+    return [
+        InstanceLotMasterDataAttribute(
+            name=LotLevelAttributeName.itemExpirationDate.value,
+            value='2015-12-31'),
+        InstanceLotMasterDataAttribute(
+            name=ItemLevelAttributeName.lotNumber.value,
+            value='DL232')
+    ]
+
+
+def create_quantity_list(quantity=100, uom=None):
+    trade_item = helpers.make_trade_item_master_data_urn('305555', '0',
+                                                         '555551')
+    return [
+        QuantityElement(epc_class=trade_item, quantity=quantity, uom=uom),
+        QuantityElement(epc_class=trade_item, quantity=94.3,
+                        uom='LB')]
+
+
+def create_object_event(biz_location, business_transaction_list,
+                        destination_list, epcs, now, read_point,
+                        source_list, tzoffset, action=None, ilmd=None):
+    # create the event
+    event_id = str(uuid.uuid4())
+    error_declaration = create_error_declaration()
+    oe = ObjectEvent(now, tzoffset,
+                     record_time=now,
+                     action=action,
+                     epc_list=epcs,
+                     biz_step=BusinessSteps.commissioning.value,
+                     disposition=Disposition.encoded.value,
+                     business_transaction_list=business_transaction_list,
+                     biz_location=biz_location,
+                     read_point=read_point,
+                     source_list=source_list,
+                     destination_list=destination_list,
+                     ilmd=ilmd, error_declaration=error_declaration,
+                     event_id=event_id)
+    return oe
+
+
+def create_object_event_template():
+    epcs = create_epcs()
+    # get the current time and tz
+    now, tzoffset = get_current_utc_time_and_offset()
+    business_transaction_list = create_business_transaction_list()
+    biz_location, read_point, source_list = create_source_list()
+    destination_list = create_destination_list()
+    oe = create_object_event(biz_location, business_transaction_list,
+                             destination_list, epcs, now, read_point,
+                             source_list, tzoffset,
+                             action=Action.add.value,
+                             ilmd=create_ilmd())
+    oe.clean()
+    return oe
+
+
+def create_aggregation_event(epcs, parent_id):
+    business_transaction_list = create_business_transaction_list()
+    biz_location, read_point, source_list = create_source_list()
+    destination_list = create_destination_list()
+    ae = AggregationEvent(
+        action=Action.add.value,
+        parent_id=parent_id, child_epcs=epcs,
+        business_transaction_list=business_transaction_list,
+        biz_location=biz_location, read_point=read_point,
+        source_list=source_list,
+        destination_list=destination_list,
+        child_quantity_list=create_quantity_list(),
+        error_declaration=create_error_declaration(),
+        event_id=str(uuid.uuid4()),
+        biz_step=BusinessSteps.packing.value,
+        record_time=datetime.now()
+    )
+    return ae
+
+
+def create_transaction_event(epcs, parent_id):
+    now, tzoffset = get_current_utc_time_and_offset()
+    business_transaction_list = create_business_transaction_list()
+    biz_location, read_point, source_list = create_source_list()
+    destination_list = create_destination_list()
+    te = TransactionEvent(
+        now,
+        tzoffset,
+        now,
+        action=Action.add.value,
+        parent_id=parent_id,
+        epc_list=epcs,
+        business_transaction_list=business_transaction_list,
+        biz_location=biz_location,
+        read_point=read_point,
+        source_list=source_list,
+        destination_list=destination_list,
+        biz_step=BusinessSteps.shipping.value,
+        disposition=Disposition.in_transit.value,
+        event_id=str(uuid.uuid4()),
+        error_declaration=create_error_declaration())
+    te.quantity_list = create_quantity_list()
+    return te
+
+
+def create_transformation_event():
+    now, tzoffset = get_current_utc_time_and_offset()
+    business_transaction_list = create_business_transaction_list()
+    biz_location, read_point, source_list = create_source_list()
+    destination_list = create_destination_list()
+    te = TransformationEvent(
+        now, tzoffset, now, str(uuid.uuid4()), create_epcs(1000, 1010),
+        input_quantity_list=create_quantity_list(100, 'EA'),
+        output_epc_list=create_epcs(2000, 2010),
+        output_quantity_list=create_quantity_list(10, 'EA'),
+        transformation_id=str(uuid.uuid4()),
+        biz_step=BusinessSteps.repackaging.value,
+        disposition=Disposition.returned.value,
+        read_point=read_point,
+        biz_location=biz_location,
+        business_transaction_list=business_transaction_list,
+        source_list=source_list,
+        destination_list=destination_list,
+        error_declaration=create_error_declaration(),
+        ilmd=create_ilmd())
+    return te
+
+
+def create_sbdh():
+    sender = sbdh.Partner(
+        partner_type=sbdh.PartnerType.SENDER,
+        partner_id=sbdh.PartnerIdentification(
+            authority='SGLN',
+            value='urn:epc:id:sgln:039999.999999.0'
+        ),
+        contact='John Smith',
+        telephone_number='555-555-5555',
+        email_address='john.smith@pharma.local',
+        contact_type_identifier='Seller'
+    )
+    receiver = sbdh.Partner(
+        partner_type=sbdh.PartnerType.RECEIVER,
+        partner_id=sbdh.PartnerIdentification(
+            authority='SGLN',
+            value='urn:epc:id:sgln:039999.111111.0'
+        ),
+        contact='Joe Blow',
+        telephone_number='555-555-2222',
+        email_address='joe.blow@distributor.local',
+        contact_type_identifier='Buyer'
+    )
+    document_identification = sbdh.DocumentIdentification(
+        creation_date_and_time=datetime.now().isoformat(sep="T"),
+        document_type=sbdh.DocumentType.EVENTS
+    )
+    return template_sbdh.StandardBusinessDocumentHeader(
+        document_identification=document_identification,
+        partners=[sender, receiver]
+    )
+
+
+def create_events():
+    '''
+    :return: One event of every type- an object, aggregation, transaction
+        and transformation event followed by a second object event.
+    '''
+    return [
+        create_object_event_template(),
+        create_aggregation_event(create_epcs(1000, 1009), PARENT_ID),
+        create_transaction_event(create_epcs(1000, 1010), PARENT_ID),
+        create_transformation_event(),
+        create_object_event_template(),
+    ]
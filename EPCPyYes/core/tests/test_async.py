@@ -0,0 +1,114 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import asyncio
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    AsyncChunkIterator
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class AsyncStream(object):
+    '''
+    A writable with a coroutine `write` and a `drain` method, like an
+    asyncio StreamWriter.
+    '''
+
+    def __init__(self):
+        self.data = io.BytesIO()
+        self.drains = 0
+
+    async def write(self, data):
+        self.data.write(data)
+
+    async def drain(self):
+        self.drains += 1
+
+
+class AsyncRenderTests(unittest.TestCase):
+    '''
+    Tests render_async, aiter_render and render_to_async.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.doc = EPCISEventListDocument(self.events,
+                                          header=create_sbdh())
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_render_async(self):
+        expected = self.doc.render()
+        self.assertEqual(self.run_async(self.doc.render_async()), expected)
+        for event in self.events:
+            self.assertEqual(self.run_async(event.render_async()),
+                             event.render())
+        self.assertEqual(self.run_async(self.doc.render_async('fast')),
+                         self.doc.render(backend='fast'))
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(self.run_async(
+                self.doc.render_async(executor=executor)), expected)
+
+    def test_render_yields_to_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def render():
+            task = asyncio.ensure_future(ticker())
+            chunks = []
+            async for chunk in self.doc.aiter_render(batch_size=16):
+                chunks.append(chunk)
+            task.cancel()
+            return chunks
+
+        chunks = self.run_async(render())
+        self.assertEqual(''.join(chunks), self.doc.render())
+        self.assertGreater(len(chunks), 1)
+        self.assertGreaterEqual(len(ticks), len(chunks) - 1)
+
+    def test_render_to_async(self):
+        expected = self.doc.render().encode('utf-8')
+        stream = io.BytesIO()
+        written = self.run_async(self.doc.render_to_async(stream))
+        self.assertEqual(stream.getvalue(), expected)
+        self.assertEqual(written, len(expected))
+        stream = AsyncStream()
+        self.run_async(self.doc.render_to_async(stream, buffer_size=1024))
+        self.assertEqual(stream.data.getvalue(), expected)
+        self.assertGreater(stream.drains, 1)
+        text = io.StringIO()
+        self.run_async(self.doc.render_to_async(text, backend='fast'))
+        self.assertEqual(text.getvalue(), self.doc.render(backend='fast'))
+
+    def test_empty_iterator(self):
+        iterator = AsyncChunkIterator([])
+        self.assertRaises(StopAsyncIteration, self.run_async,
+                          iterator.__anext__())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from jinja2 import DictLoader
+
+from EPCPyYes.core.v1_2.environment import get_environment, \
+    compact_environment, compact_markup, registry
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    ObjectEvent
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc
+from EPCPyYes.core.tests.test_xml_serializer import normalize
+
+
+class CompactRenderTests(unittest.TestCase):
+    '''
+    Tests rendering without the whitespace between elements.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.doc = EPCISEventListDocument(self.events,
+                                          header=create_sbdh())
+
+    def test_compact_markup(self):
+        self.assertEqual(compact_markup('\n    <epcList>\n        <epc>'),
+                         '<epcList><epc>')
+        self.assertEqual(compact_markup('</epc>\n    '), '</epc>')
+        self.assertEqual(compact_markup('<destination\n        type="'),
+                         '<destination type="')
+        self.assertEqual(compact_markup('\n    '), '')
+        self.assertEqual(compact_markup(' '), ' ')
+
+    def test_compact_document(self):
+        data = self.doc.render(compact=True)
+        self.assertNotIn('>\n', data)
+        self.assertNotIn('> ', data)
+        self.assertLess(len(data), len(self.doc.render()))
+        self.assertEqual(normalize(data), normalize(self.doc.render()))
+        validate_epcis_doc(data.encode('utf-8'))
+        stream = io.StringIO()
+        self.doc.render_to(stream, compact=True)
+        self.assertEqual(stream.getvalue(), data)
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(self.doc.render(parallel=executor, compact=True),
+                             data)
+
+    def test_compact_events(self):
+        for event in self.events:
+            data = event.render(compact=True)
+            self.assertNotIn('\n', data)
+            self.assertEqual(normalize(data), normalize(event.render()))
+
+    def test_compact_environment(self):
+        env = get_environment()
+        compact = compact_environment(env)
+        self.assertIs(compact_environment(env), compact)
+        self.assertIs(compact_environment(compact), compact)
+        self.assertIn(compact, registry)
+        env = get_environment(DictLoader(
+            {'epcis/object_event.xml': '<ObjectEvent>\n    <a/>\n'
+                                       '</ObjectEvent>'}))
+        event = ObjectEvent(epc_list=[], env=env)
+        self.assertEqual(event.render(compact=True),
+                         '<ObjectEvent><a/></ObjectEvent>')
+        self.assertIn('\n', event.render())
+
+    def test_unsupported_backend(self):
+        self.assertRaises(ValueError, self.doc.render, backend='fast',
+                          compact=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import asyncio
+import gzip
+import io
+import unittest
+import zlib
+
+from EPCPyYes.core.v1_2.compression import iter_compress, compressor
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class CompressionTests(unittest.TestCase):
+    '''
+    Tests compressing the output of render_to as it is rendered.
+    '''
+
+    def setUp(self):
+        self.doc = EPCISEventListDocument(
+            create_events() * 20, header=create_sbdh())
+        self.expected = self.doc.render().encode('utf-8')
+
+    def test_gzip(self):
+        sizes = []
+        for level in (1, 6, 9):
+            stream = io.BytesIO()
+            written = self.doc.render_to(stream, buffer_size=4096,
+                                         compression='gzip',
+                                         compression_level=level)
+            self.assertEqual(written, len(stream.getvalue()))
+            self.assertEqual(gzip.decompress(stream.getvalue()),
+                             self.expected)
+            sizes.append(written)
+        self.assertLess(sizes[-1], sizes[0])
+        self.assertLess(sizes[0], len(self.expected))
+
+    def test_zlib(self):
+        stream = io.BytesIO()
+        self.doc.render_to(stream, compression='zlib', backend='fast')
+        self.assertEqual(zlib.decompress(stream.getvalue()),
+                         self.doc.render(backend='fast').encode('utf-8'))
+
+    def test_async(self):
+        stream = io.BytesIO()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.doc.render_to_async(
+                stream, compression='gzip'))
+        finally:
+            loop.close()
+        self.assertEqual(gzip.decompress(stream.getvalue()), self.expected)
+
+    def test_iter_compress(self):
+        data = b''.join(iter_compress(self.doc.iter_render(), level=1))
+        self.assertEqual(gzip.decompress(data), self.expected)
+        self.assertEqual(gzip.decompress(b''.join(iter_compress([]))), b'')
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.doc.render_to, io.StringIO(),
+                          compression='gzip')
+        self.assertRaises(ValueError, compressor, 'bzip2')
+        self.assertRaises(ValueError, compressor, 'gzip', 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
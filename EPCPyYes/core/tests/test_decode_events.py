@@ -0,0 +1,84 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import json
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from EPCPyYes.core.v1_2 import json_decoders
+from EPCPyYes.core.v1_2.json_decoders import decode_events, \
+    TransformationEventDecoder
+from EPCPyYes.core.v1_2.template_events import TransformationEvent
+from EPCPyYes.core.tests.helpers import create_events
+
+
+def _without_id(event):
+    data = json.loads(event.render_json(backend='json'))
+    for values in data.values():
+        # the event decoders give every event a new id
+        values.pop('id')
+    return data
+
+
+class DecodeEventsTests(unittest.TestCase):
+    '''
+    Tests decoding mixed event payloads in one call.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.expected = [_without_id(event) for event in self.events]
+
+    def test_mixed_payloads(self):
+        payloads = [json.loads(self.events[0].render_json()),
+                    self.events[1].render_json()]
+        payloads += [event.render_json().encode('utf-8')
+                     for event in self.events[2:]]
+        decoded = list(decode_events(payloads))
+        self.assertEqual([_without_id(event) for event in decoded],
+                         self.expected)
+
+    def test_shared_decoders(self):
+        data = [json.loads(event.render_json()) for event in self.events]
+        list(decode_events(data))
+        shared = dict(json_decoders._shared_decoders)
+        list(decode_events(data))
+        self.assertEqual(json_decoders._shared_decoders, shared)
+        self.assertEqual(len(shared), 4)
+
+    def test_transformation_without_cbv_values(self):
+        event = TransformationEvent(
+            '2018-01-01T00:00:00+00:00', '+00:00',
+            input_epc_list=['urn:epc:id:sgtin:305555.0555555.1'],
+            output_epc_list=['urn:epc:id:sgtin:305555.0555555.2'])
+        copy = TransformationEventDecoder(event.render_json()).get_event()
+        self.assertIsNone(copy.biz_step)
+        self.assertIsNone(copy.disposition)
+        self.assertEqual(_without_id(copy), _without_id(event))
+
+    def test_workers(self):
+        payloads = [event.render_json() for event in self.events] * 3
+        with ProcessPoolExecutor(2) as executor:
+            decoded = list(decode_events(payloads, workers=executor,
+                                         batch_size=2))
+        self.assertEqual([_without_id(event) for event in decoded],
+                         self.expected * 3)
+
+    def test_unknown_event(self):
+        payloads = [self.events[0].render_json(), {'unknownEvent': {}}]
+        events = decode_events(payloads)
+        next(events)
+        with self.assertRaisesRegex(ValueError, 'Payload 2'):
+            next(events)
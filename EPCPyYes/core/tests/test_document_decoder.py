@@ -0,0 +1,103 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import json
+import unittest
+
+from EPCPyYes.core.SBDH import sbdh
+from EPCPyYes.core.v1_2.json_decoders import EPCISDocumentDecoder, \
+    StandardBusinessDocumentHeaderDecoder
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    ObjectEvent
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+def _without_ids(data):
+    data = json.loads(data)
+    for event in data['events']:
+        for values in event.values():
+            # the event decoders give every event a new id
+            values.pop('id')
+    return data
+
+
+class EPCISDocumentDecoderTests(unittest.TestCase):
+    '''
+    Tests decoding whole JSON documents incrementally.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.doc = EPCISEventListDocument(
+            self.events, header=create_sbdh())
+
+    def test_round_trip(self):
+        for data in (self.doc.render_json(backend='json'),
+                     self.doc.render_pretty_json()):
+            for stream in (io.BytesIO(data.encode('utf-8')),
+                           io.StringIO(data)):
+                # tiny chunks split every token across reads
+                decoder = EPCISDocumentDecoder(stream, chunk_size=7)
+                self.assertIsInstance(decoder.read_header(),
+                                      sbdh.StandardBusinessDocumentHeader)
+                self.assertEqual(
+                    _without_ids(decoder.document().render_json(
+                        backend='json')), _without_ids(data))
+                self.assertEqual(decoder.created_date,
+                                 self.doc.created_date)
+
+    def test_events_are_decoded_lazily(self):
+        data = self.doc.render_json()
+        stream = io.StringIO(data)
+        decoder = EPCISDocumentDecoder(stream, chunk_size=256)
+        events = iter(decoder)
+        self.assertEqual(type(next(events)), type(self.events[0]))
+        self.assertLess(stream.tell(), len(data))
+        self.assertIsNone(decoder.created_date)
+        self.assertEqual(len(list(events)), len(self.events) - 1)
+
+    def test_event_larger_than_chunk_size(self):
+        epcs = ['urn:epc:id:sgtin:305555.0555555.%d' % i
+                for i in range(5000)]
+        doc = EPCISEventListDocument([ObjectEvent(epc_list=epcs)])
+        data = doc.render_json(backend='json').encode('utf-8')
+        stream = io.BytesIO(data)
+        reads = []
+        read = stream.read
+        stream.read = lambda size: reads.append(size) or read(size)
+        event, = EPCISDocumentDecoder(stream, chunk_size=64)
+        self.assertEqual(event.epc_list, epcs)
+        # the reads grow with the event instead of staying one chunk each
+        self.assertLess(len(reads), 20)
+        self.assertGreater(max(reads), len(data) // 4)
+
+    def test_header_without_optional_fields(self):
+        header = StandardBusinessDocumentHeaderDecoder(
+            {'documentIdentification': {'standard': 'EPCglobal'}}
+        ).get_header()
+        self.assertIsNone(header.schema_location)
+        self.assertEqual(header.partners, [])
+        self.assertEqual(header.document_identification.standard,
+                         'EPCglobal')
+
+    def test_invalid_documents(self):
+        for data in ('[]', '{"events": [', '{"events": [{"other": {}}]}',
+                     '{"events": [] "createdDate": null}'):
+            with self.assertRaises(ValueError):
+                list(EPCISDocumentDecoder(io.StringIO(data)))
+        decoder = EPCISDocumentDecoder(io.StringIO('{}'))
+        self.assertEqual(list(decoder), [])
+        self.assertIsNone(decoder.header)
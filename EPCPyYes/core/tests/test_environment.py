@@ -0,0 +1,267 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import os
+import shutil
+import tempfile
+import unittest
+import threading
+import warnings
+import zipfile
+
+import EPCPyYes
+from jinja2 import FileSystemLoader, DictLoader, ChoiceLoader, \
+    ModuleLoader, nodes
+
+from EPCPyYes.core.v1_2 import environment
+from EPCPyYes.core.v1_2.environment import get_environment, \
+    EnvironmentRegistry, loader_spec, make_loader, compile_templates, \
+    bundle_is_current, InliningEnvironment
+from EPCPyYes.core.v1_2.template_events import ObjectEvent, \
+    AggregationEvent, EPCISDocument, EPCISEventListDocument
+from EPCPyYes.core.SBDH import template_sbdh
+
+
+class EnvironmentRegistryTests(unittest.TestCase):
+    '''
+    Tests the process-wide Jinja2 environment registry.
+    '''
+
+    def test_events_share_environment(self):
+        oe = ObjectEvent(epc_list=['urn:epc:id:sgtin:305555.1555555.1'])
+        ae = AggregationEvent(child_epcs=['urn:epc:id:sgtin:305555.1555555.1'])
+        doc = EPCISDocument(object_events=[oe])
+        list_doc = EPCISEventListDocument([oe, ae])
+        header = template_sbdh.StandardBusinessDocumentHeader()
+        env = get_environment()
+        for obj in (oe, ae, doc, list_doc, header):
+            self.assertIs(obj._env, env)
+        self.assertIs(oe.template, ObjectEvent(epc_list=[]).template)
+
+    def test_explicit_environment_is_kept(self):
+        env = get_environment(
+            FileSystemLoader(os.path.dirname(EPCPyYes.TEMPLATES_PATH)))
+        oe = ObjectEvent(epc_list=['urn:epc:id:sgtin:305555.1555555.1'],
+                         env=env)
+        self.assertIs(oe._env, env)
+        self.assertIn('<ObjectEvent>', oe.render())
+
+    def test_keyed_by_loader_configuration(self):
+        registry = EnvironmentRegistry()
+        env = registry.get_environment(
+            FileSystemLoader(EPCPyYes.TEMPLATES_PATH))
+        self.assertIs(env, registry.get_environment(
+            FileSystemLoader(EPCPyYes.TEMPLATES_PATH)))
+        self.assertIsNot(env, registry.get_environment(
+            FileSystemLoader(EPCPyYes.TEMPLATES_PATH), autoescape=True))
+        self.assertIsNot(env, registry.get_environment())
+        self.assertEqual(len(registry), 3)
+        self.assertIn(env, registry)
+        registry.clear()
+        self.assertEqual(len(registry), 0)
+        self.assertNotIn(env, registry)
+
+    def test_loader_specs(self):
+        spec = loader_spec(None)
+        self.assertEqual(spec, environment.DEFAULT_LOADER_SPEC)
+        self.assertEqual(loader_spec(make_loader(spec)), spec)
+        fs_spec = loader_spec(FileSystemLoader(EPCPyYes.TEMPLATES_PATH))
+        self.assertEqual(loader_spec(make_loader(fs_spec)), fs_spec)
+        dict_spec = loader_spec(DictLoader({}))
+        self.assertEqual(dict_spec[0], 'instance')
+        self.assertRaises(ValueError, make_loader, dict_spec)
+
+    def test_unhashable_option(self):
+        self.assertRaises(TypeError, EnvironmentRegistry().get_environment,
+                          None, globals={})
+
+    def test_thread_safety(self):
+        registry = EnvironmentRegistry()
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            results.append(registry.get_environment())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(registry), 1)
+        self.assertTrue(all(env is results[0] for env in results))
+
+
+class InliningTests(unittest.TestCase):
+    '''
+    Tests the environments that inline template includes.
+    '''
+
+    def setUp(self):
+        self.env = get_environment(inline_includes=True)
+
+    def events(self, env):
+        epcs = ['urn:epc:id:sgtin:305555.1555555.1']
+        return [
+            ObjectEvent(event_time='2018-01-01T00:00:00',
+                        record_time='2018-01-01T00:00:00',
+                        epc_list=epcs, biz_step='shipping', env=env),
+            AggregationEvent(event_time='2018-01-01T00:00:00',
+                             record_time='2018-01-01T00:00:00',
+                             parent_id='urn:epc:id:sscc:305555.0000000001',
+                             child_epcs=epcs, env=env),
+        ]
+
+    def test_same_output(self):
+        self.assertIsInstance(self.env, InliningEnvironment)
+        self.assertIsNot(self.env, get_environment(inline_includes=False))
+        for env in (None, self.env):
+            env = env or get_environment(inline_includes=False)
+            events = self.events(env)
+            doc = EPCISEventListDocument(
+                events, created_date='2018-01-01T00:00:00')
+            doc._env = env
+            doc.template = env.get_template(doc.template.name)
+            output = [event.render() for event in events] + \
+                     [doc.render(), doc.render(compact=True)]
+            if env is self.env:
+                self.assertEqual(output, expected)
+            expected = output
+
+    def test_includes_are_inlined(self):
+        source, _, _ = self.env.loader.get_source(self.env,
+                                                  'epcis/object_event.xml')
+        tree = self.env.parse(source, 'epcis/object_event.xml')
+        self.assertIsNone(tree.find(nodes.Include))
+        self.assertIsNotNone(tree.find(nodes.For))
+        # includes of dynamic names are left alone
+        tree = self.env.parse('{% include name %}')
+        self.assertIsNotNone(tree.find(nodes.Include))
+
+    def test_overridden_include(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(tmp, 'epcis'))
+            with open(os.path.join(tmp, 'epcis', 'event_times.xml'),
+                      'w') as f:
+                f.write('<eventTime>overridden</eventTime>\n')
+            templates = os.path.dirname(EPCPyYes.TEMPLATES_PATH)
+            env = get_environment(
+                ChoiceLoader([FileSystemLoader(tmp),
+                              FileSystemLoader(templates)]),
+                inline_includes=True)
+            self.assertIsInstance(env, InliningEnvironment)
+            xml = self.events(env)[0].render()
+        finally:
+            shutil.rmtree(tmp)
+        self.assertIn('<eventTime>overridden</eventTime>', xml)
+        self.assertNotIn('2018-01-01', xml)
+
+
+class CompiledTemplateTests(unittest.TestCase):
+    '''
+    Tests precompiled template bundles and the bytecode cache.
+    '''
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bundle_path = EPCPyYes.COMPILED_TEMPLATES_PATH
+        self.bytecode_cache = EPCPyYes.TEMPLATE_BYTECODE_CACHE
+
+    def tearDown(self):
+        EPCPyYes.COMPILED_TEMPLATES_PATH = self.bundle_path
+        EPCPyYes.TEMPLATE_BYTECODE_CACHE = self.bytecode_cache
+        shutil.rmtree(self.tmp)
+
+    def render(self, env):
+        return ObjectEvent(
+            event_time='2018-01-01T00:00:00',
+            record_time='2018-01-01T00:00:00',
+            epc_list=['urn:epc:id:sgtin:305555.1555555.1'], env=env).render()
+
+    def test_compiled_bundle(self):
+        for zip in ('deflated', None):
+            bundle = compile_templates(os.path.join(self.tmp, str(zip)),
+                                       zip=zip)
+            self.assertTrue(bundle_is_current(bundle))
+            EPCPyYes.COMPILED_TEMPLATES_PATH = bundle
+            env = EnvironmentRegistry().get_environment()
+            self.assertIsInstance(env.loader, ChoiceLoader)
+            self.assertIsInstance(env.loader.loaders[0], ModuleLoader)
+            self.assertEqual(self.render(env), self.render(get_environment()))
+
+    def test_inlined_bundle(self):
+        bundle = compile_templates(os.path.join(self.tmp, 'inline.zip'),
+                                   inline=True)
+        self.assertTrue(bundle_is_current(bundle, inline=True))
+        self.assertFalse(bundle_is_current(bundle))
+        EPCPyYes.COMPILED_TEMPLATES_PATH = bundle
+        registry = EnvironmentRegistry()
+        env = registry.get_environment(inline_includes=True)
+        self.assertIsInstance(env.loader, ChoiceLoader)
+        self.assertNotIsInstance(
+            registry.get_environment(inline_includes=False).loader,
+            ChoiceLoader)
+        self.assertEqual(self.render(env), self.render(get_environment()))
+
+    def test_bundle_checked_once(self):
+        bundle = compile_templates(os.path.join(self.tmp, 'compiled.zip'))
+        self.assertTrue(bundle_is_current(bundle))
+        calls = []
+
+        def templates_checksum():
+            calls.append(1)
+            return 'checksum'
+
+        self.addCleanup(setattr, environment, 'templates_checksum',
+                        environment.templates_checksum)
+        environment.templates_checksum = templates_checksum
+        self.assertTrue(bundle_is_current(bundle))
+        self.assertFalse(bundle_is_current(bundle, inline=True))
+        self.assertEqual(calls, [])
+        # writing the bundle again drops what was remembered about it
+        compile_templates(bundle)
+        self.assertTrue(bundle_is_current(bundle))
+        self.assertEqual(len(calls), 2)
+
+    def test_stale_bundle_is_ignored(self):
+        bundle = os.path.join(self.tmp, 'compiled.zip')
+        compile_templates(bundle)
+        with zipfile.ZipFile(bundle, 'a') as zf:
+            zf.writestr('epcpyyes_bundle.json',
+                        '{"jinja2": "0.0", "checksum": ""}')
+        EPCPyYes.COMPILED_TEMPLATES_PATH = bundle
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            env = EnvironmentRegistry().get_environment()
+        self.assertNotIsInstance(env.loader, ChoiceLoader)
+        self.assertTrue(caught)
+        self.assertFalse(bundle_is_current(os.path.join(self.tmp, 'none')))
+
+    def test_bytecode_cache(self):
+        EPCPyYes.COMPILED_TEMPLATES_PATH = None
+        EPCPyYes.TEMPLATE_BYTECODE_CACHE = self.tmp
+        env = EnvironmentRegistry().get_environment()
+        self.assertIsNotNone(env.bytecode_cache)
+        self.render(env)
+        self.assertTrue(os.listdir(self.tmp))
+        # a second environment loads from the cache
+        env = EnvironmentRegistry().get_environment()
+        self.assertEqual(self.render(env), self.render(get_environment()))
+
+
+if __name__ == '__main__':
+    unittest.main()
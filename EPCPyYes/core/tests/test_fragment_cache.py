@@ -0,0 +1,130 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import pickle
+import unittest
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.events import BusinessTransaction
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    fragment_cache
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class FragmentCacheTests(unittest.TestCase):
+    '''
+    Tests the rendered fragment cache of the template events.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.doc = EPCISEventListDocument(self.events,
+                                          header=create_sbdh())
+        fragment_cache.reset()
+
+    def enable(self):
+        self.addCleanup(setattr, EPCPyYes, 'CACHE_FRAGMENTS',
+                        EPCPyYes.CACHE_FRAGMENTS)
+        EPCPyYes.CACHE_FRAGMENTS = True
+
+    def test_off_by_default(self):
+        self.assertFalse(EPCPyYes.CACHE_FRAGMENTS)
+        event = self.events[0]
+        event.render()
+        event.render_json()
+        self.doc.render()
+        self.assertNotIn('_fragments', event.__dict__)
+        self.assertEqual(fragment_cache.misses, 0)
+        # without the cache changes made in place show up right away
+        event.epc_list.append('urn:epc:id:sgtin:305555.0555555.999')
+        self.assertIn('0555555.999', event.render())
+        self.assertIn('0555555.999', event.render_json())
+
+    def test_hits_and_misses(self):
+        self.enable()
+        event = self.events[0]
+        xml = event.render()
+        self.assertEqual(fragment_cache.as_dict(),
+                         {'hits': 0, 'misses': 1, 'hit_ratio': 0.0})
+        self.assertIs(event.render(), xml)
+        self.assertEqual(event.render_json(), event.render_json())
+        self.assertEqual(fragment_cache.hits, 2)
+        self.assertEqual(fragment_cache.misses, 2)
+
+    def test_instance_opt_in(self):
+        event, other = self.events[:2]
+        event.cache_fragments = True
+        self.assertIs(event.render(), event.render())
+        other.render()
+        self.assertIn('_fragments', event.__dict__)
+        self.assertNotIn('_fragments', other.__dict__)
+
+    def test_invalidation(self):
+        self.enable()
+        event = self.events[0]
+        xml = event.render()
+        json = event.render_json()
+        event.biz_step = 'urn:epcglobal:cbv:bizstep:shipping'
+        self.assertNotEqual(event.render(), xml)
+        self.assertIn('shipping', event.render_json())
+        self.assertNotEqual(event.render_json(), json)
+        event.business_transaction_list = [
+            BusinessTransaction('urn:epc:id:gdti:0614141.00001.1618034')]
+        self.assertIn('0614141.00001.1618034', event.render())
+        event.epc_list.append('urn:epc:id:sgtin:305555.0555555.999')
+        event.clear_cache()
+        self.assertIn('0555555.999', event.render())
+        self.assertIn('0555555.999', event.render_json())
+
+    def test_documents_reuse_fragments(self):
+        self.enable()
+        xml = self.doc.render()
+        json = self.doc.render_json(backend='json')
+        fast = self.doc.render(backend='fast')
+        for event in self.events:
+            event.render()
+            event.render_json(backend='json')
+            event.render(backend='fast')
+        misses = fragment_cache.misses
+        hits = fragment_cache.hits
+        self.assertEqual(self.doc.render(), xml)
+        self.assertEqual(self.doc.render_json(backend='json'), json)
+        self.assertEqual(self.doc.render(backend='fast'), fast)
+        self.assertEqual(fragment_cache.misses, misses)
+        self.assertEqual(fragment_cache.hits - hits, 3 * len(self.events))
+
+    def test_documents_do_not_fill_the_cache(self):
+        self.enable()
+        self.doc.render()
+        self.doc.render(backend='fast')
+        self.doc.render_json()
+        self.doc.render_to(io.BytesIO())
+        self.doc.render_json_to(io.BytesIO())
+        self.assertEqual(fragment_cache.misses, 0)
+        for event in self.events:
+            self.assertNotIn('_fragments', event.__dict__)
+
+    def test_pickle_drops_fragments(self):
+        self.enable()
+        event = self.events[0]
+        xml = event.render()
+        copy = pickle.loads(pickle.dumps(event))
+        self.assertNotIn('_fragments', copy.__dict__)
+        self.assertEqual(copy.render(), xml)
+
+
+if __name__ == '__main__':
+    unittest.main()
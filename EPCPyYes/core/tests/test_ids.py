@@ -0,0 +1,84 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import json
+import pickle
+import time
+import unittest
+import uuid
+
+import EPCPyYes
+from EPCPyYes.core import ids
+from EPCPyYes.core.SBDH import sbdh
+from EPCPyYes.core.v1_2.json_decoders import decode_events
+from EPCPyYes.core.tests.helpers import create_events
+
+
+class IDTests(unittest.TestCase):
+    '''
+    Tests the identifier generators and lazily generated identifiers.
+    '''
+
+    def setUp(self):
+        self.payloads = [event.render_json()
+                         for event in create_events()]
+
+    def use_generator(self, name):
+        self.addCleanup(setattr, EPCPyYes, 'ID_GENERATOR',
+                        EPCPyYes.ID_GENERATOR)
+        EPCPyYes.ID_GENERATOR = name
+
+    def test_generators(self):
+        uuid.UUID(ids.new_id('uuid4'))
+        first = ids.new_id('ulid')
+        time.sleep(0.002)
+        second = ids.new_id('ulid')
+        self.assertEqual(len(first), 26)
+        self.assertLess(first, second)
+        counter = ids.CounterIDGenerator('node-1:', 7)
+        self.assertEqual([counter(), counter()], ['node-1:7', 'node-1:8'])
+        self.assertRaises(ValueError, ids.new_id, 'missing')
+
+    def test_register_generator(self):
+        ids.register_id_generator('fixed', lambda: 'fixed')
+        self.addCleanup(ids._generators.pop, 'fixed')
+        self.assertIn('fixed', ids.available_id_generators())
+        self.use_generator('fixed')
+        event, = decode_events(self.payloads[:1])
+        self.assertEqual(event.id, 'fixed')
+
+    def test_lazy_event_ids(self):
+        events = list(decode_events(self.payloads))
+        for event in events:
+            self.assertIs(event._id, ids.LAZY_ID)
+        copy = pickle.loads(pickle.dumps(events[0]))
+        self.assertIs(copy._id, ids.LAZY_ID)
+        # generated once, on first access, with the default generator
+        event_id = events[0].id
+        uuid.UUID(event_id)
+        self.assertEqual(events[0].id, event_id)
+        self.assertEqual(
+            json.loads(events[0].render_json())['objectEvent']['id'],
+            event_id)
+
+    def test_lazy_instance_identifier(self):
+        self.use_generator('ulid')
+        identification = sbdh.DocumentIdentification()
+        self.assertIs(identification._instance_identifier, ids.LAZY_ID)
+        identifier = identification.instance_identifier
+        self.assertEqual(len(identifier), 26)
+        self.assertEqual(identification.instance_identifier, identifier)
+        self.assertEqual(sbdh.DocumentIdentification(
+            instance_identifier='abc').instance_identifier, 'abc')
@@ -0,0 +1,86 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import json
+import os
+import unittest
+
+import EPCPyYes
+from EPCPyYes.core.v1_2 import json_backends
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONBackendTests(unittest.TestCase):
+    '''
+    Tests the pluggable JSON backends.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.doc = EPCISEventListDocument(
+            self.events, header=create_sbdh())
+
+    def test_default_backend(self):
+        backend = EPCPyYes.JSON_BACKEND
+        self.addCleanup(setattr, EPCPyYes, 'JSON_BACKEND', backend)
+        if 'EPCPYYES_JSON_BACKEND' not in os.environ:
+            # the output must not depend on whether orjson is installed
+            self.assertEqual(backend, 'json')
+        EPCPyYes.JSON_BACKEND = 'json'
+        self.assertEqual(json_backends.get_json_backend().name, 'json')
+        self.assertEqual(self.doc.render_json(),
+                         json.dumps(self.doc.render_dict()))
+        EPCPyYes.JSON_BACKEND = json_backends.AUTO
+        self.assertEqual(json_backends.get_json_backend().name,
+                         'orjson' if orjson else 'json')
+        self.assertRaises(ValueError, json_backends.get_json_backend,
+                          'missing')
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_matches_stdlib(self):
+        for obj in self.events + [self.doc]:
+            fast = obj.render_json(backend='orjson')
+            self.assertEqual(json.loads(fast),
+                             json.loads(obj.render_json(backend='json')))
+            self.assertNotIn(', ', fast)
+        self.assertEqual(
+            json.loads(self.doc.render_pretty_json(2, True, 'orjson')),
+            json.loads(self.doc.render_pretty_json(2, True, 'json')))
+        # only indents of 2 are pretty printed by orjson
+        self.assertEqual(self.doc.render_pretty_json(backend='orjson'),
+                         self.doc.render_pretty_json(backend='json'))
+
+    def test_register_backend(self):
+        class UpperBackend(json_backends.StdlibJSONBackend):
+            name = 'upper'
+
+            def encode(self, obj):
+                return super().encode(obj).upper()
+
+        json_backends.register_json_backend('upper', UpperBackend)
+        self.addCleanup(json_backends._backends.pop, 'upper')
+        self.addCleanup(json_backends._instances.pop, 'upper', None)
+        self.assertIn('upper', json_backends.available_json_backends())
+        event = self.events[0]
+        self.assertEqual(event.render_json(backend='upper'),
+                         event.render_json(backend='json').upper())
+        self.assertRaises(ValueError, json_backends.register_json_backend,
+                          json_backends.AUTO, UpperBackend)
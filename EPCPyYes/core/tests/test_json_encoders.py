@@ -0,0 +1,103 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import json
+import unittest
+
+from EPCPyYes.core.v1_2 import events, json_encoders
+from EPCPyYes.core.v1_2.events import Action
+from EPCPyYes.core.v1_2.json_backends import available_json_backends
+from EPCPyYes.core.v1_2.template_events import ObjectEvent, \
+    EPCISEventListDocument
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class JSONEncoderTests(unittest.TestCase):
+    '''
+    Tests the type dispatched JSON encoding functions.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.header = create_sbdh()
+
+    def test_dispatch(self):
+        for event in self.events:
+            self.assertEqual(json.dumps(json_encoders.encode(event)),
+                             event.render_json(backend='json'))
+            self.assertEqual(json_encoders.encode(event),
+                             event.encoder.default(event))
+        self.assertEqual(json_encoders.encode(self.header),
+                         self.header.render_dict())
+        doc = EPCISEventListDocument(self.events, header=self.header)
+        self.assertEqual(json.dumps(json_encoders.encode(doc)),
+                         doc.render_json(backend='json'))
+        self.assertIs(json_encoders.encoder_for(ObjectEvent),
+                      json_encoders.encode_object_event)
+        self.assertRaises(TypeError, json_encoders.encode, object())
+
+    def test_shared_encoders(self):
+        self.assertIs(self.events[0].encoder, self.events[4].encoder)
+        self.assertIs(self.events[0].encoder,
+                      json_encoders.object_event_encoder)
+        self.assertNotIn('encoder', self.events[0].__dict__)
+
+    def test_register_encoder(self):
+        class CustomEvent(ObjectEvent):
+            pass
+
+        event = CustomEvent(epc_list=['urn:epc:id:sgtin:305555.1555555.1'])
+        self.assertIs(json_encoders.encoder_for(CustomEvent),
+                      json_encoders.encode_object_event)
+        json_encoders.register_encoder(CustomEvent,
+                                       lambda o: {'custom': o.epc_list})
+        try:
+            self.assertEqual(json_encoders.encode(event),
+                             {'custom': event.epc_list})
+            # the render methods go through the registered function too
+            self.assertEqual(event.render_dict(), {'custom': event.epc_list})
+            for backend in available_json_backends():
+                self.assertEqual(
+                    json.loads(event.render_json(backend=backend)),
+                    {'custom': event.epc_list})
+        finally:
+            del json_encoders.ENCODERS[CustomEvent]
+            json_encoders._dispatch.clear()
+        self.assertIs(json_encoders.encoder_for(events.ObjectEvent),
+                      json_encoders.encode_object_event)
+
+    def test_instance_encoder(self):
+        class CustomEncoder(json.JSONEncoder):
+            def default(self, o):
+                return {'custom': o.epc_list}
+
+        event = self.events[0]
+        event.encoder = CustomEncoder()
+        self.assertFalse(json_encoders.has_shared_encoder(event))
+        self.assertEqual(event.render_dict(), {'custom': event.epc_list})
+        for backend in available_json_backends():
+            self.assertEqual(json.loads(event.render_json(backend=backend)),
+                             {'custom': event.epc_list})
+
+    def test_unserializable_values(self):
+        # values json can not serialize are written as null
+        event = ObjectEvent(epc_list=[], action=Action.add)
+        self.assertIsNone(
+            json.loads(event.render_json(backend='json'))['objectEvent'][
+                'action'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import unittest
+
+from EPCPyYes.core.SBDH import sbdh
+from EPCPyYes.core.v1_2.lxml_reader import EPCISReader, iter_events
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class LXMLReaderTests(unittest.TestCase):
+    '''
+    Tests reading EPCIS XML back into template events.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.doc = EPCISEventListDocument(
+            self.events, header=create_sbdh())
+
+    def test_round_trip(self):
+        expected = self.doc.render_dict()
+        for backend in ('template', 'fast', 'lxml'):
+            xml = self.doc.render(backend=backend).encode('utf-8')
+            reader = EPCISReader(io.BytesIO(xml))
+            self.assertIsInstance(reader.read_header(),
+                                  sbdh.StandardBusinessDocumentHeader)
+            self.assertEqual(reader.schema_version, '1.2')
+            self.assertEqual(reader.document().render_dict(), expected)
+
+    def test_events(self):
+        xml = self.doc.render().encode('utf-8')
+        read = list(iter_events(io.BytesIO(xml)))
+        # the transformation event is read from its extension in place
+        self.assertEqual([type(event) for event in read],
+                         [type(event) for event in self.events])
+        for event, copy in zip(self.events, read):
+            self.assertEqual(copy.render(), event.render())
+
+    def test_rerender(self):
+        xml = self.doc.render()
+        reader = EPCISReader(io.BytesIO(xml.encode('utf-8')))
+        self.assertEqual(reader.document().render(), xml)
+
+    def test_no_header(self):
+        doc = EPCISEventListDocument(self.events[:2])
+        reader = EPCISReader(io.BytesIO(doc.render().encode('utf-8')))
+        self.assertIsNone(reader.read_header())
+        self.assertEqual(len(list(reader)), 2)
+        self.assertEqual(reader.created_date, doc.created_date)
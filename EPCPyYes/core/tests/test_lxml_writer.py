@@ -0,0 +1,103 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import os
+import tempfile
+import unittest
+
+from EPCPyYes.core.v1_2.template_events import EPCISDocument, \
+    EPCISEventListDocument, ObjectEvent
+from EPCPyYes.core.v1_2.CBV.instance_lot_master_data import \
+    InstanceLotMasterDataAttribute, ItemLevelAttributeName
+from EPCPyYes.core.v1_2.lxml_writer import writer
+from EPCPyYes.core.tests.helpers import create_sbdh
+from EPCPyYes.core.tests.test_xml_serializer import create_events, \
+    normalize
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc
+
+
+class LXMLWriterTests(unittest.TestCase):
+    '''
+    Tests the lxml incremental writer backend.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+
+    def assertWriterMatches(self, obj):
+        stream = io.BytesIO()
+        writer.write(obj, stream)
+        data = stream.getvalue().decode('utf-8')
+        self.assertEqual(normalize(data), normalize(obj.render()))
+        self.assertEqual(obj.render(backend='lxml'), data)
+        return data
+
+    def test_events(self):
+        for event in self.events:
+            self.assertWriterMatches(event)
+        header = create_sbdh()
+        data = header.render(backend='lxml')
+        self.assertIn('<sbdh:StandardBusinessDocumentHeader xmlns:sbdh=', data)
+        self.assertIn('<sbdh:Type>Events</sbdh:Type>', data)
+
+    def test_documents(self):
+        events = self.events
+        list_doc = EPCISEventListDocument(events,
+                                          header=create_sbdh())
+        list_doc.render_xml_declaration = True
+        data = self.assertWriterMatches(list_doc)
+        self.assertTrue(data.startswith('<?xml'))
+        validate_epcis_doc(data.encode('utf-8'))
+        # the document start, one chunk per event and the document end
+        self.assertEqual(len(list(list_doc.iter_render(backend='lxml'))), 7)
+        doc = EPCISDocument(header=create_sbdh(),
+                            object_events=[events[0]],
+                            aggregation_events=[events[1]],
+                            transaction_events=[events[2]],
+                            transformation_events=events[3:])
+        validate_epcis_doc(self.assertWriterMatches(doc).encode('utf-8'))
+
+    def test_write_to_file_name(self):
+        doc = EPCISEventListDocument(iter(self.events))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'events.xml')
+            writer.write(doc, path)
+            with open(path, 'rb') as f:
+                validate_epcis_doc(f.read())
+
+    def test_escaping(self):
+        event = ObjectEvent(
+            event_time='2018-01-01T00:00:00+00:00',
+            epc_list=['urn:epc:id:sgtin:305555.1555555.1'],
+            ilmd=[InstanceLotMasterDataAttribute(
+                ItemLevelAttributeName.lotNumber, '</cbvmd:lotNumber>&')])
+        data = event.render(backend='lxml')
+        self.assertIn('&lt;/cbvmd:lotNumber&gt;&amp;</cbvmd:lotNumber>', data)
+        validate_epcis_doc(EPCISEventListDocument([event]).render(
+            backend='lxml').encode('utf-8'))
+        event.ilmd[0].value = 'DL\x0b1'
+        event.clear_cache()
+        self.assertRaises(ValueError, event.render, backend='lxml')
+
+    def test_unknown_event(self):
+        class CustomEvent(object):
+            event_type = None
+
+        self.assertRaises(TypeError, writer.write, CustomEvent(), io.BytesIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
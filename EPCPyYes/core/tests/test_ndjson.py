@@ -0,0 +1,88 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import gzip
+import io
+import unittest
+
+from EPCPyYes.core.v1_2.json_backends import available_json_backends
+from EPCPyYes.core.v1_2.json_decoders import iter_decode_ndjson
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class NDJSONTests(unittest.TestCase):
+    '''
+    Tests writing and reading events as JSON Lines.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        self.header = create_sbdh()
+
+    def assertEventsMatch(self, decoded):
+        self.assertEqual(len(decoded), len(self.events))
+        for event, copy in zip(self.events, decoded):
+            self.assertEqual(type(copy), type(event))
+            self.assertEqual(getattr(copy, 'action', None),
+                             getattr(event, 'action', None))
+            self.assertEqual(copy.biz_step, event.biz_step)
+            self.assertEqual(getattr(copy, 'epc_list', None),
+                             getattr(event, 'epc_list', None))
+            self.assertEqual(getattr(copy, 'child_epcs', None),
+                             getattr(event, 'child_epcs', None))
+
+    def test_round_trip(self):
+        doc = EPCISEventListDocument(self.events, header=self.header)
+        for backend in available_json_backends():
+            stream = io.BytesIO()
+            written = doc.render_ndjson(stream, backend=backend)
+            data = stream.getvalue()
+            self.assertEqual(written, len(data))
+            self.assertEqual(
+                data.decode('utf-8').splitlines(),
+                [event.render_json(backend=backend) for event in self.events])
+            stream.seek(0)
+            self.assertEventsMatch(list(iter_decode_ndjson(stream, backend)))
+
+    def test_compressed_round_trip(self):
+        doc = EPCISEventListDocument(self.events)
+        stream = io.BytesIO()
+        doc.render_ndjson(stream, compression='gzip')
+        stream.seek(0)
+        with gzip.open(stream) as lines:
+            self.assertEventsMatch(list(iter_decode_ndjson(lines)))
+
+    def test_lines_are_read_lazily(self):
+        lines = [event.render_json() + '\n' for event in self.events]
+        lines.insert(1, '\n')
+        consumed = []
+
+        def generate():
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        events = iter_decode_ndjson(generate())
+        first = next(events)
+        self.assertEqual(len(consumed), 1)
+        self.assertEventsMatch([first] + list(events))
+
+    def test_unknown_event(self):
+        lines = [self.events[0].render_json(), '{"unknownEvent": {}}']
+        events = iter_decode_ndjson(lines)
+        next(events)
+        with self.assertRaises(ValueError):
+            next(events)
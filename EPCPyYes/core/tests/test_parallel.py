@@ -0,0 +1,100 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from jinja2 import DictLoader
+
+from EPCPyYes.core.v1_2.environment import get_environment
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    ObjectEvent
+from EPCPyYes.core.v1_2.parallel import iter_render_parallel, iter_in_pool
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc
+
+
+class ParallelRenderTests(unittest.TestCase):
+    '''
+    Tests pickling template events and rendering event list documents in
+    worker processes.
+    '''
+
+    def setUp(self):
+        self.events = create_events() * 20
+        self.doc = EPCISEventListDocument(self.events,
+                                          header=create_sbdh())
+
+    def test_pickle_events(self):
+        for obj in self.events[:5] + [create_sbdh()]:
+            # rendering generates the lazy identifiers the copy must share
+            expected = obj.render()
+            copy = pickle.loads(pickle.dumps(obj))
+            self.assertIs(copy._env, obj._env)
+            self.assertEqual(copy.render(), expected)
+            self.assertEqual(copy.render_json(), obj.render_json())
+        expected = self.doc.render()
+        copy = pickle.loads(pickle.dumps(self.doc))
+        self.assertEqual(copy.render(), expected)
+
+    def test_unpicklable_environment(self):
+        env = get_environment(DictLoader(
+            {'epcis/object_event.xml': '<ObjectEvent/>'}))
+        event = ObjectEvent(epc_list=[], env=env)
+        self.assertRaises(pickle.PicklingError, pickle.dumps, event)
+
+    def test_render_in_processes(self):
+        expected = self.doc.render()
+        self.assertEqual(self.doc.render(parallel=2), expected)
+        stream = io.BytesIO()
+        self.doc.render_to(stream, workers=2, backend='fast')
+        self.assertEqual(stream.getvalue().decode('utf-8'),
+                         self.doc.render(backend='fast'))
+        validate_epcis_doc(stream.getvalue())
+
+    def test_order_and_generators(self):
+        expected = self.doc.render()
+        doc = EPCISEventListDocument(iter(self.events),
+                                     header=self.doc.header)
+        doc.created_date = self.doc.created_date
+        with ThreadPoolExecutor(3) as executor:
+            chunks = list(iter_render_parallel(doc, executor, batch_size=7))
+        self.assertEqual(''.join(chunks), expected)
+        # the start, one chunk per batch and the end
+        self.assertEqual(len(chunks), 2 + -(-len(self.events) // 7))
+
+    def test_window(self):
+        pulled = []
+
+        def arguments():
+            for number in range(10):
+                pulled.append(number)
+                yield (number,)
+
+        with ThreadPoolExecutor(2) as executor:
+            results = iter_in_pool(abs, arguments(), executor, window=3)
+            self.assertEqual(next(results), 0)
+            self.assertEqual(len(pulled), 3)
+            self.assertEqual(list(results), list(range(1, 10)))
+
+    def test_unsupported_backend(self):
+        self.assertRaises(ValueError, self.doc.render, backend='lxml',
+                          parallel=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
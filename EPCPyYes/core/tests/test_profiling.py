@@ -0,0 +1,166 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import unittest
+
+from jinja2 import Environment, DictLoader
+
+from EPCPyYes.core.v1_2 import profiling, json_encoders
+from EPCPyYes.core.v1_2.environment import EPCPyYesEnvironment
+from EPCPyYes.core.v1_2.json_decoders import ObjectEventDecoder
+from EPCPyYes.core.v1_2.xml_serializer import serializer
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    TemplateMixin
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh
+
+
+class ProfilingTests(unittest.TestCase):
+    '''
+    Tests the render profiling hooks.
+    '''
+
+    def setUp(self):
+        self.events = create_events()
+        for event in self.events:
+            event.clear_cache()
+        self.doc = EPCISEventListDocument(
+            self.events, header=create_sbdh())
+
+    def test_records_renders(self):
+        with profiling.profile() as profiler:
+            xml = self.doc.render()
+            for event in self.events:
+                event.render()
+            self.doc.render_json()
+        stats = profiler.as_dict()
+        self.assertEqual(stats['render']['EPCISEventListDocument'],
+                         {'count': 1, 'seconds': stats['render'][
+                             'EPCISEventListDocument']['seconds'],
+                          'bytes': len(xml), 'epcs': 0})
+        self.assertEqual(stats['render']['ObjectEvent']['count'], 2)
+        self.assertEqual(stats['render']['ObjectEvent']['epcs'], 4)
+        self.assertEqual(stats['template']['epcis/sbdh.xml']['count'], 1)
+        self.assertIn('epcis/ilmd.xml', stats['template'])
+        self.assertEqual(stats['encode']['ObjectEvent']['count'], 2)
+        self.assertEqual(stats['encode']['AggregationEvent']['epcs'],
+                         len(self.events[1].child_epcs))
+        self.assertIn('ilmd_list', stats['encode_part'])
+        self.assertIn('render_json', stats)
+
+    def assertEventsRecorded(self, stats):
+        self.assertEqual(
+            {name: (values['count'], values['epcs'])
+             for name, values in stats['event'].items()},
+            {'ObjectEvent': (2, 4),
+             'AggregationEvent': (1, len(self.events[1].child_epcs)),
+             'TransactionEvent': (1, len(self.events[2].epc_list)),
+             'TransformationEvent': (
+                 1, len(self.events[3].input_epc_list) +
+                 len(self.events[3].output_epc_list))})
+
+    def test_render_to(self):
+        # the templates are loaded before the profiler is enabled
+        self.doc.render()
+        stream = io.BytesIO()
+        with profiling.profile() as profiler:
+            self.doc.render_to(stream)
+        stats = profiler.as_dict()
+        self.assertEqual(stats['render']['EPCISEventListDocument']['count'],
+                         1)
+        self.assertEqual(stats['render']['EPCISEventListDocument']['bytes'],
+                         len(stream.getvalue().decode('utf-8')))
+        self.assertEventsRecorded(stats)
+        for name in ('object_event', 'aggregation_event',
+                     'transaction_event', 'transformation_event', 'sbdh',
+                     'epcis_events_document'):
+            self.assertIn('epcis/%s.xml' % name, stats['template'])
+
+    def test_fast_backend(self):
+        with profiling.profile() as profiler:
+            self.doc.render(backend='fast')
+        stats = profiler.as_dict()
+        self.assertEqual(stats['render']['EPCISEventListDocument']['count'],
+                         1)
+        self.assertEventsRecorded(stats)
+
+    def test_cached_events(self):
+        for event in self.events:
+            event.cache_fragments = True
+            event.render()
+        with profiling.profile() as profiler:
+            self.doc.render()
+        stats = profiler.as_dict()
+        self.assertEventsRecorded(stats)
+        self.assertNotIn('epcis/object_event.xml', stats['template'])
+
+    def test_records_decoders(self):
+        data = self.events[0].render_json()
+        with profiling.profile() as profiler:
+            ObjectEventDecoder(data).get_event()
+        stats = profiler.as_dict()
+        self.assertEqual(stats['parse']['ObjectEventDecoder']['count'], 1)
+        self.assertEqual(stats['decode']['ObjectEventDecoder']['epcs'],
+                         len(self.events[0].epc_list))
+        self.assertIn('ilmd', stats['decode_part'])
+
+    def test_disabled_restores_methods(self):
+        methods = dict(vars(TemplateMixin))
+        get_template = Environment.get_template
+        default = json_encoders.ObjectEventEncoder.__dict__['default']
+        template = self.events[0].template
+        root_render_func = template.root_render_func
+        with profiling.profile() as profiler:
+            self.events[0].render()
+            self.assertIsNot(TemplateMixin.__dict__['render'],
+                             methods['render'])
+            self.assertIn('get_template', vars(EPCPyYesEnvironment))
+            self.assertIs(Environment.get_template, get_template)
+        self.assertEqual(dict(vars(TemplateMixin)), methods)
+        self.assertNotIn('serialize_event', vars(serializer))
+        self.assertNotIn('get_template', vars(EPCPyYesEnvironment))
+        self.assertIs(json_encoders.ObjectEventEncoder.__dict__['default'],
+                      default)
+        self.assertIs(json_encoders.encoder_for(type(self.events[0])),
+                      json_encoders.encode_object_event)
+        self.assertIs(template.root_render_func, root_render_func)
+        self.assertFalse(profiler.enabled)
+        count = profiler.as_dict()['render']['ObjectEvent']['count']
+        self.doc.render()
+        self.assertEqual(
+            profiler.as_dict()['render']['ObjectEvent']['count'], count)
+
+    def test_other_environments(self):
+        env = Environment(loader=DictLoader({'other.xml': '<other/>'}))
+        with profiling.profile() as profiler:
+            env.get_template('other.xml').render()
+            self.events[0].render()
+        self.assertNotIn('other.xml', profiler.as_dict()['template'])
+
+    def test_prometheus(self):
+        with profiling.profile() as profiler:
+            self.events[0].render()
+        text = profiler.to_prometheus()
+        self.assertIn('# TYPE epcpyyes_seconds_total counter', text)
+        self.assertIn('epcpyyes_calls_total{operation="render",'
+                      'name="ObjectEvent"} 1\n', text)
+        self.assertIn('epcpyyes_epcs_total{operation="render",'
+                      'name="ObjectEvent"} 2\n', text)
+        profiler.reset()
+        self.assertEqual(profiler.as_dict(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
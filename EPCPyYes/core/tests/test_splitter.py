@@ -0,0 +1,153 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import unittest
+
+from EPCPyYes.core.v1_2.splitter import AggregationPolicy, _Part
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    ObjectEvent, AggregationEvent, TransformationEvent
+from EPCPyYes.core.tests.helpers import create_sbdh
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc
+
+SGTIN = 'urn:epc:id:sgtin:305555.0555555.%d'
+SSCC = 'urn:epc:id:sscc:305555.%010d'
+
+
+def make_events(cases=6, items=4):
+    '''
+    Yields, for each case, the commissioning of its items and the case
+    followed by the aggregation packing the items into the case.
+    '''
+    for case in range(cases):
+        children = [SGTIN % (case * items + i) for i in range(items)]
+        for epc in children:
+            yield ObjectEvent(epc_list=[epc])
+        yield ObjectEvent(epc_list=[SSCC % case])
+        yield AggregationEvent(parent_id=SSCC % case, child_epcs=children)
+
+
+class SplitterTests(unittest.TestCase):
+    '''
+    Tests splitting event list documents.
+    '''
+
+    def setUp(self):
+        self.header = create_sbdh()
+        self.events = list(make_events())
+        self.doc = EPCISEventListDocument(self.events, header=self.header)
+
+    def test_max_events(self):
+        identifier = self.header.document_identification.instance_identifier
+        parts = list(self.doc.split(max_events=4))
+        self.assertEqual([len(part.template_events) for part in parts],
+                         [4] * 9)
+        self.assertEqual(sum([part.template_events for part in parts], []),
+                         self.events)
+        identifiers = {part.header.document_identification.instance_identifier
+                       for part in parts}
+        self.assertEqual(len(identifiers), len(parts))
+        self.assertNotIn(identifier, identifiers)
+        self.assertEqual(
+            self.header.document_identification.instance_identifier,
+            identifier)
+        for part in parts:
+            validate_epcis_doc(part.render().encode('utf-8'))
+
+    def test_transformation_events_keep_their_place(self):
+        transformation = TransformationEvent(
+            input_epc_list=[SGTIN % 0], output_epc_list=[SGTIN % 100])
+        doc = EPCISEventListDocument(self.events, header=self.header)
+        doc.transformation_events = [transformation]
+        xml = doc.render()
+        self.assertGreater(xml.index('<TransformationEvent>'),
+                           xml.rindex('<AggregationEvent>'))
+        parts = list(doc.split(max_events=10))
+        self.assertEqual(sum([part.template_events for part in parts], []),
+                         self.events + [transformation])
+        for part in parts:
+            validate_epcis_doc(part.render().encode('utf-8'))
+
+    def test_max_bytes(self):
+        size = len(self.doc.render().encode('utf-8'))
+        for kwargs in ({}, {'compact': True}, {'backend': 'fast'}):
+            parts = list(self.doc.split(max_bytes=size // 5, **kwargs))
+            self.assertGreaterEqual(len(parts), 5)
+            for part in parts:
+                self.assertLessEqual(
+                    len(part.render(**kwargs).encode('utf-8')), size // 5)
+            self.assertEqual(sum([part.template_events for part in parts],
+                                 []), self.events)
+
+    def test_streaming(self):
+        pulled = []
+
+        def generate():
+            for event in make_events():
+                pulled.append(event)
+                yield event
+
+        doc = EPCISEventListDocument(generate(), header=self.header)
+        parts = doc.split(max_events=5)
+        first = next(parts)
+        self.assertEqual(len(first.template_events), 5)
+        self.assertEqual(len(pulled), 6)
+        self.assertEqual(len(list(parts)), 7)
+
+    def test_keep_with_commissioning(self):
+        parts = list(self.doc.split(
+            max_events=8, policy=AggregationPolicy.keep_with_commissioning))
+        self.assertEqual(sum([part.template_events for part in parts], []),
+                         self.events)
+        for part in parts:
+            commissioned = set()
+            for event in part.template_events:
+                if isinstance(event, AggregationEvent):
+                    self.assertIn(event.parent_id, commissioned)
+                    self.assertTrue(commissioned.issuperset(
+                        event.child_epcs))
+                else:
+                    commissioned.update(event.epc_list)
+        # every case group of six events stays together
+        self.assertEqual([len(part.template_events) for part in parts],
+                         [6] * 6)
+        # even when a group does not fit
+        parts = list(self.doc.split(
+            max_events=5, policy='keep_with_commissioning'))
+        self.assertEqual([len(part.template_events) for part in parts],
+                         [6] * 6)
+
+    def test_unsafe_ranges_are_merged(self):
+        part = _Part(None, 0)
+        for event in make_events(cases=3):
+            part.add(event, 0, part.dependency(event))
+        # one range per case, the commissioning of its first item excluded
+        self.assertEqual(part.unsafe, [(1, 5), (7, 11), (13, 17)])
+        pallet = AggregationEvent(parent_id=SSCC % 99,
+                                  child_epcs=[SSCC % case
+                                              for case in range(3)])
+        # the pallet depends on the first case and merges all three
+        part.add(pallet, 0, part.dependency(pallet))
+        self.assertEqual(part.unsafe, [(1, 18)])
+        self.assertEqual(part.split_point(), 19)
+        self.assertEqual(part.split_point(4), 0)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.doc.split)
+        self.assertRaises(ValueError, self.doc.split, max_bytes=1000,
+                          backend='lxml')
+
+
+if __name__ == '__main__':
+    unittest.main()
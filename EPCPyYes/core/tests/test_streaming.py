@@ -0,0 +1,190 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import json
+import re
+import unittest
+import types
+
+from EPCPyYes.core.v1_2.json_backends import available_json_backends, \
+    get_json_backend
+from EPCPyYes.core.v1_2.template_events import EPCISDocument, \
+    EPCISEventListDocument, write_chunks
+from EPCPyYes.core.tests.helpers import create_events, create_sbdh, \
+    create_transformation_event
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc
+
+
+class StreamingRenderTests(unittest.TestCase):
+    '''
+    Tests the iter_render and render_to APIs of the template classes.
+    '''
+
+    def assertStreamsMatch(self, obj):
+        expected = obj.render()
+        chunks = obj.iter_render()
+        self.assertIsInstance(chunks, types.GeneratorType)
+        self.assertEqual(''.join(chunks), expected)
+        binary = io.BytesIO()
+        written = obj.render_to(binary, buffer_size=64)
+        self.assertEqual(binary.getvalue(), expected.encode('utf-8'))
+        self.assertEqual(written, len(binary.getvalue()))
+        text = io.StringIO()
+        obj.render_to(text)
+        self.assertEqual(text.getvalue(), expected)
+        return expected
+
+    def test_event_streams(self):
+        for event in create_events():
+            self.assertStreamsMatch(event)
+        self.assertStreamsMatch(create_sbdh())
+
+    def test_event_list_document_stream(self):
+        doc = EPCISEventListDocument(create_events(),
+                                     header=create_sbdh(),
+                                     render_xml_declaration=False)
+        validate_epcis_doc(self.assertStreamsMatch(doc).encode('utf-8'))
+
+    def test_event_list_document_from_generator(self):
+        events = create_events()
+        doc = EPCISEventListDocument(events, render_xml_declaration=False)
+        created_date = doc.created_date
+        expected = doc.render()
+        consumed = []
+
+        def generate():
+            for event in events:
+                consumed.append(event)
+                yield event
+
+        doc = EPCISEventListDocument(generate(), render_xml_declaration=False)
+        doc.created_date = created_date
+        chunks = doc.iter_render()
+        first = next(chunks)
+        self.assertEqual(consumed, [])
+        self.assertEqual(first + ''.join(chunks), expected)
+        self.assertEqual(len(consumed), len(events))
+        stream = io.StringIO()
+        doc = EPCISEventListDocument(iter(events),
+                                     render_xml_declaration=False)
+        doc.created_date = created_date
+        doc.render_to(stream)
+        self.assertEqual(stream.getvalue(), expected)
+
+    def test_multiple_transformation_events(self):
+        events = create_events()
+        events[1:1] = [create_transformation_event(),
+                       create_transformation_event()]
+        doc = EPCISEventListDocument(events, render_xml_declaration=False)
+        data = doc.render()
+        self.assertEqual(data.count('<TransformationEvent>'), 3)
+        self.assertEqual(len(re.findall(
+            r'<extension>\s*<TransformationEvent>', data)), 3)
+        self.assertEqual(doc.render(), data)
+        validate_epcis_doc(data.encode('utf-8'))
+
+    def test_render_leaves_events_untouched(self):
+        events = create_events()
+        events[3:3] = [create_transformation_event()]
+        original = list(events)
+        doc = EPCISEventListDocument(events, render_xml_declaration=False)
+        data = doc.render()
+        self.assertEqual(doc.render(), data)
+        self.assertIs(doc.template_events, events)
+        self.assertEqual(events, original)
+        self.assertEqual(doc.transformation_events, [])
+        # events are written in the order they were supplied
+        positions = [data.index(tag) for tag in (
+            '<AggregationEvent>', '<TransactionEvent>',
+            '<TransformationEvent>', '</EventList>')]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_document_stream(self):
+        events = create_events()
+        doc = EPCISDocument(header=create_sbdh(),
+                            object_events=[events[0], events[4]],
+                            aggregation_events=[events[1]],
+                            transaction_events=[events[2]],
+                            transformation_events=[events[3]])
+        validate_epcis_doc(self.assertStreamsMatch(doc).encode('utf-8'))
+
+    def test_json_streams(self):
+        events = create_events()
+        docs = [
+            EPCISEventListDocument(events, header=create_sbdh()),
+            EPCISEventListDocument(events),
+            EPCISDocument(header=create_sbdh(),
+                          object_events=[events[0], events[4]],
+                          aggregation_events=[events[1]],
+                          transaction_events=[events[2]],
+                          transformation_events=[events[3]]),
+        ]
+        for name in available_json_backends():
+            backend = get_json_backend(name)
+            for doc in docs:
+                expected = backend.dumps(doc.encoder.default(doc))
+                self.assertEqual(doc.render_json(backend=name), expected)
+                self.assertEqual(''.join(doc.iter_render_json(name)),
+                                 expected)
+                stream = io.BytesIO()
+                written = doc.render_json_to(stream, buffer_size=64,
+                                             backend=name)
+                self.assertEqual(stream.getvalue(), expected.encode('utf-8'))
+                self.assertEqual(written, len(expected.encode('utf-8')))
+            self.assertEqual(''.join(events[0].iter_render_json(name)),
+                             events[0].render_json(backend=name))
+
+    def test_json_stream_from_generator(self):
+        events = create_events()
+        doc = EPCISEventListDocument(events)
+        expected = doc.render_json()
+        consumed = []
+
+        def generate():
+            for event in events:
+                consumed.append(event)
+                yield event
+
+        doc = EPCISEventListDocument(generate(), header=None)
+        doc.created_date = json.loads(expected)['createdDate']
+        chunks = doc.iter_render_json()
+        self.assertEqual(next(chunks), '{')
+        self.assertEqual(consumed, [])
+        self.assertEqual('{' + ''.join(chunks), expected)
+        self.assertEqual(len(consumed), len(events))
+
+    def test_write_chunks_buffers(self):
+        class Recorder(object):
+            def __init__(self):
+                self.writes = []
+
+            def write(self, data):
+                self.writes.append(data)
+
+        recorder = Recorder()
+        chunks = ['ab', 'é'] * 1000
+        written = write_chunks(chunks, recorder, buffer_size=1024)
+        self.assertEqual(b''.join(recorder.writes),
+                         ''.join(chunks).encode('utf-8'))
+        self.assertEqual(written, 4000)
+        self.assertTrue(1 < len(recorder.writes) < 10)
+        for data in recorder.writes[:-1]:
+            self.assertGreaterEqual(len(data.decode('utf-8')), 1024)
+        self.assertEqual(write_chunks([], recorder), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
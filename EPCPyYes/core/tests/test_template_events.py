@@ -15,31 +15,21 @@
 
 import unittest
 import json
-import uuid
 import re
 from datetime import datetime
 
 from EPCPyYes.core.errors import ValidationError
 from EPCPyYes.core.v1_2.helpers import gtin_urn_generator, \
-    get_current_utc_time_and_offset, gln13_data_to_sgln_urn, gtin_to_urn
-from EPCPyYes.core.v1_2.events import BusinessTransaction, \
-    Source, Destination, \
-    Action, QuantityElement, ErrorDeclaration
-from EPCPyYes.core.v1_2.template_events import ObjectEvent, AggregationEvent, \
-    EPCISDocument, TransactionEvent, TransformationEvent, \
+    get_current_utc_time_and_offset, gtin_to_urn
+from EPCPyYes.core.v1_2.events import Action
+from EPCPyYes.core.v1_2.template_events import EPCISDocument, \
     EPCISEventListDocument
 from EPCPyYes.core.v1_2.CBV.dispositions import Disposition
-from EPCPyYes.core.v1_2.CBV.source_destination import SourceDestinationTypes
 from EPCPyYes.core.v1_2.CBV.business_steps import BusinessSteps
-from EPCPyYes.core.v1_2.CBV.business_transactions import \
-    BusinessTransactionType
-from EPCPyYes.core.v1_2.CBV.instance_lot_master_data import \
-    InstanceLotMasterDataAttribute, \
-    LotLevelAttributeName, ItemLevelAttributeName
-from EPCPyYes.core.v1_2.CBV import helpers, error_reasons
 from EPCPyYes.core.tests.test_utils import validate_epcis_doc
-from EPCPyYes.core.SBDH import template_sbdh
-from EPCPyYes.core.SBDH import sbdh
+from EPCPyYes.core.tests.helpers import create_epcs, create_object_event, \
+    create_object_event_template, create_aggregation_event, \
+    create_transaction_event, create_transformation_event, create_sbdh
 from EPCPyYes.core.v1_2.json_decoders import AggregationEventDecoder, \
     ObjectEventDecoder, TransactionEventDecoder
 
@@ -84,10 +74,10 @@ class CoreEventTests(unittest.TestCase):
         :return: String with the rendered event.
         '''
 
-        epcs = self.create_epcs(1000, 1010)
+        epcs = create_epcs(1000, 1010)
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
         # get the current time and tz
-        ae = self.create_aggregation_event(epcs, parent_id)
+        ae = create_aggregation_event(epcs, parent_id)
         print(ae.render())
         print(ae.render_json())
         print(ae.render_pretty_json())
@@ -102,17 +92,17 @@ class CoreEventTests(unittest.TestCase):
         :return: String with the rendered event.
         '''
 
-        epcs = self.create_epcs(1000, 1010)
+        epcs = create_epcs(1000, 1010)
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
         # get the current time and tz
-        ae = self.create_aggregation_event(epcs, parent_id)
+        ae = create_aggregation_event(epcs, parent_id)
         decoded = AggregationEventDecoder(ae.render_pretty_json()).get_event()
         self.assertEqual(ae.child_epcs, decoded.child_epcs)
         self.assertEqual(ae.parent_id, decoded.parent_id)
         self.assertEqual(ae.action, decoded.action)
 
     def test_object_event_json_decode(self):
-        oe = self.create_object_event_template()
+        oe = create_object_event_template()
         # render the event using it's default template
         data = oe.render_pretty_json()
         decoded = ObjectEventDecoder(data).get_event()
@@ -122,9 +112,9 @@ class CoreEventTests(unittest.TestCase):
         print(decoded.render_pretty_json())
 
     def test_transaction_event_json_decode(self):
-        epcs = self.create_epcs(1000, 1010)
+        epcs = create_epcs(1000, 1010)
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
-        te = self.create_transaction_event(epcs, parent_id)
+        te = create_transaction_event(epcs, parent_id)
         # render the event using it's default template
         decoded = TransactionEventDecoder(
             te.render_pretty_json()
@@ -133,6 +123,28 @@ class CoreEventTests(unittest.TestCase):
         self.assertEqual(te.biz_step, decoded.biz_step)
         self.assertEqual(te.disposition, decoded.disposition)
 
+    def test_quantity_and_error_declaration_decode(self):
+        epcs = create_epcs(1000, 1010)
+        parent_id = gtin_to_urn('305555', '1', '555551', 1000)
+        ae = create_aggregation_event(epcs, parent_id)
+        decoded = AggregationEventDecoder(ae.render_json()).get_event()
+        self.assertEqual(
+            [(q.epc_class, q.quantity, q.uom)
+             for q in decoded.child_quantity_list],
+            [(q.epc_class, q.quantity, q.uom) for q in ae.child_quantity_list])
+        declaration = decoded.error_declaration
+        self.assertEqual(declaration.reason, ae.error_declaration.reason)
+        self.assertEqual(declaration.corrective_event_ids,
+                         ae.error_declaration.corrective_event_ids)
+        # optional keys may be left out
+        decoder = AggregationEventDecoder({'aggregationEvent': {}})
+        quantities = decoder.decode_child_quantity_list([{'epcClass': 'a'}])
+        self.assertEqual((quantities[0].quantity, quantities[0].uom),
+                         (None, None))
+        declaration = decoder.decode_error_declaration(
+            {'declarationTime': '2018-01-01T00:00:00'})
+        self.assertEqual(declaration.corrective_event_ids, [])
+
     def test_bad_aggregation_event(self):
         '''
         Creates an aggregation event and renders it using the
@@ -141,15 +153,15 @@ class CoreEventTests(unittest.TestCase):
         :return: String with the rendered event.
         '''
 
-        epcs = self.create_epcs(1000, 1010)
+        epcs = create_epcs(1000, 1010)
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
         # get the current time and tz
-        ae = self.create_aggregation_event(epcs, parent_id)
+        ae = create_aggregation_event(epcs, parent_id)
         ae.clean()  # should be good...
         ae.child_epcs = None
         ae.child_quantity_list = None
         self.assertRaises(ValidationError, ae.clean)
-        ae = self.create_aggregation_event(epcs, None)
+        ae = create_aggregation_event(epcs, None)
         ae.action = Action.add.value
         self.assertRaises(ValidationError, ae.clean)
 
@@ -159,113 +171,20 @@ class CoreEventTests(unittest.TestCase):
 
         :return:
         '''
-        te = self.create_transformation_event()
+        te = create_transformation_event()
         print(te.render())
         print(te.render_json())
         print(te.render_pretty_json())
 
-    def create_aggregation_event(self, epcs, parent_id):
-        business_transaction_list = self.create_business_transaction_list()
-        biz_location, read_point, source_list = self.create_source_list()
-        destination_list = self.create_destination_list()
-        trade_item = helpers.make_trade_item_master_data_urn('305555', '0',
-                                                             '555551')
-        child_quantity_list = [
-            QuantityElement(epc_class=trade_item, quantity=100),
-            QuantityElement(epc_class=trade_item, quantity=94.3,
-                            uom='LB')]
-        event_id = str(uuid.uuid4())
-        error_declaration = self.create_error_declaration()
-        ae = AggregationEvent(
-            action=Action.add.value,
-            parent_id=parent_id, child_epcs=epcs,
-            business_transaction_list=business_transaction_list,
-            biz_location=biz_location, read_point=read_point,
-            source_list=source_list,
-            destination_list=destination_list,
-            child_quantity_list=child_quantity_list,
-            error_declaration=error_declaration,
-            event_id=event_id,
-            biz_step=BusinessSteps.packing.value,
-            record_time=datetime.now()
-        )
-        return ae
-
-    def create_transaction_event(self, epcs, parent_id):
-        now, tzoffset = get_current_utc_time_and_offset()
-        business_transaction_list = self.create_business_transaction_list()
-        biz_location, read_point, source_list = self.create_source_list()
-        destination_list = self.create_destination_list()
-        trade_item = helpers.make_trade_item_master_data_urn('305555', '0',
-                                                             '555551')
-        disposition = Disposition.in_transit.value
-        biz_step = BusinessSteps.shipping.value
-        quantity_list = [
-            QuantityElement(epc_class=trade_item, quantity=100),
-            QuantityElement(epc_class=trade_item, quantity=94.3,
-                            uom='LB')]
-
-        event_id = str(uuid.uuid4())
-        error_declaration = self.create_error_declaration()
-
-        te = TransactionEvent(
-            now,
-            tzoffset,
-            now,
-            action=Action.add.value,
-            parent_id=parent_id,
-            epc_list=epcs,
-            business_transaction_list=business_transaction_list,
-            biz_location=biz_location,
-            read_point=read_point,
-            source_list=source_list,
-            destination_list=destination_list,
-            biz_step=biz_step,
-            disposition=disposition,
-            event_id=event_id,
-            error_declaration=error_declaration)
-        te.quantity_list = quantity_list
-        return te
-
-    def create_sbdh(self):
-        sender_partner_id = sbdh.PartnerIdentification(
-            authority='SGLN',
-            value='urn:epc:id:sgln:039999.999999.0'
-        )
-        receiver_partner_id = sbdh.PartnerIdentification(
-            authority='SGLN',
-            value='urn:epc:id:sgln:039999.111111.0'
-        )
-        sender = sbdh.Partner(
-            partner_type=sbdh.PartnerType.SENDER,
-            partner_id=sender_partner_id,
-            contact='John Smith',
-            telephone_number='555-555-5555',
-            email_address='john.smith@pharma.local',
-            contact_type_identifier='Seller'
-        )
-        receiver = sbdh.Partner(
-            partner_type=sbdh.PartnerType.RECEIVER,
-            partner_id=receiver_partner_id,
-            contact='Joe Blow',
-            telephone_number='555-555-2222',
-            email_address='joe.blow@distributor.local',
-            contact_type_identifier='Buyer'
-        )
-        document_identification = sbdh.DocumentIdentification(
-            creation_date_and_time=datetime.now().isoformat(sep="T"),
-            document_type=sbdh.DocumentType.EVENTS
-        )
-        header = template_sbdh.StandardBusinessDocumentHeader(
-            document_identification=document_identification,
-            partners=[sender, receiver]
-        )
-        self.assertEqual(sender_partner_id.value,
+    def test_sbdh_template(self):
+        header = create_sbdh()
+        sender, receiver = header.partners
+        self.assertEqual(sender.partner_id.value,
                          'urn:epc:id:sgln:039999.999999.0')
-        self.assertEqual(sender_partner_id.authority, 'SGLN')
-        self.assertEqual(receiver_partner_id.authority, 'SGLN')
+        self.assertEqual(sender.partner_id.authority, 'SGLN')
+        self.assertEqual(receiver.partner_id.authority, 'SGLN')
         self.assertEqual(
-            receiver_partner_id.value, 'urn:epc:id:sgln:039999.111111.0'
+            receiver.partner_id.value, 'urn:epc:id:sgln:039999.111111.0'
         )
         self.assertEqual(sender.partner_type, 'Sender')
         self.assertEqual(sender.contact, 'John Smith')
@@ -275,10 +194,9 @@ class CoreEventTests(unittest.TestCase):
         print(header.render())
         print(header.render_json())
         print(header.render_pretty_json())
-        return header
 
     def test_object_event_template(self):
-        oe = self.create_object_event_template()
+        oe = create_object_event_template()
         # render the event using it's default template
         data = oe.render()
         print(oe.render_json())
@@ -298,9 +216,9 @@ class CoreEventTests(unittest.TestCase):
                       'Disposition not present')
 
     def test_transaction_event_template(self):
-        epcs = self.create_epcs(1000, 1010)
+        epcs = create_epcs(1000, 1010)
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
-        te = self.create_transaction_event(epcs, parent_id)
+        te = create_transaction_event(epcs, parent_id)
         # render the event using it's default template
         data = te.render()
         print(te.render_json())
@@ -322,21 +240,21 @@ class CoreEventTests(unittest.TestCase):
                       'Disposition not present')
 
     def test_epcis_base_template(self):
-        oe1 = self.create_object_event_template()
-        oe2 = self.create_object_event_template()
+        oe1 = create_object_event_template()
+        oe2 = create_object_event_template()
 
         object_events = [oe1, oe2]
-        ag1 = self.create_aggregation_event(self.create_epcs(1000, 1009),
-                                            gtin_to_urn('305555', '2',
-                                                        '555555', '235'))
-        ag2 = self.create_aggregation_event(self.create_epcs(1010, 1019),
-                                            gtin_to_urn('305555', '2',
-                                                        '555555', '216'))
+        ag1 = create_aggregation_event(create_epcs(1000, 1009),
+                                       gtin_to_urn('305555', '2',
+                                                   '555555', '235'))
+        ag2 = create_aggregation_event(create_epcs(1010, 1019),
+                                       gtin_to_urn('305555', '2',
+                                                   '555555', '216'))
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
-        epcs = self.create_epcs(1000, 1010)
-        transaction_event = self.create_transaction_event(epcs, parent_id)
-        txe = self.create_transformation_event()
-        header = self.create_sbdh()
+        epcs = create_epcs(1000, 1010)
+        transaction_event = create_transaction_event(epcs, parent_id)
+        txe = create_transformation_event()
+        header = create_sbdh()
         epcis_document = EPCISDocument(
             header=header,
             object_events=object_events,
@@ -351,20 +269,20 @@ class CoreEventTests(unittest.TestCase):
         return epcis_document
 
     def test_epcis_event_list_template(self):
-        oe1 = self.create_object_event_template()
-        oe2 = self.create_object_event_template()
-        ag1 = self.create_aggregation_event(self.create_epcs(1000, 1009),
-                                            gtin_to_urn('305555', '2',
-                                                        '555555', '235'))
-        ag2 = self.create_aggregation_event(self.create_epcs(1010, 1019),
-                                            gtin_to_urn('305555', '2',
-                                                        '555555', '216'))
+        oe1 = create_object_event_template()
+        oe2 = create_object_event_template()
+        ag1 = create_aggregation_event(create_epcs(1000, 1009),
+                                       gtin_to_urn('305555', '2',
+                                                   '555555', '235'))
+        ag2 = create_aggregation_event(create_epcs(1010, 1019),
+                                       gtin_to_urn('305555', '2',
+                                                   '555555', '216'))
         parent_id = gtin_to_urn('305555', '1', '555551', 1000)
-        epcs = self.create_epcs(1000, 1010)
-        transaction_event = self.create_transaction_event(epcs, parent_id)
-        txe = self.create_transformation_event()
+        epcs = create_epcs(1000, 1010)
+        transaction_event = create_transaction_event(epcs, parent_id)
+        txe = create_transformation_event()
         template_events = [oe1, oe2, ag1, ag2, transaction_event, txe]
-        header = self.create_sbdh()
+        header = create_sbdh()
         epcis_document = EPCISEventListDocument(
             header=header,
             template_events=template_events
@@ -376,95 +294,11 @@ class CoreEventTests(unittest.TestCase):
         return epcis_document
 
     def test_transformation_doc(self):
-        txe = self.create_transformation_event()
+        txe = create_transformation_event()
         epcis_document = EPCISDocument(transformation_events=[txe])
         print(epcis_document.render(render_xml_declaration=False))
         validate_epcis_doc(epcis_document.render().encode('utf-8'))
 
-    def create_error_declaration(self):
-        return ErrorDeclaration(
-            reason=error_reasons.ErrorReason.incorrect_data.value,
-            corrective_event_ids=[str(uuid.uuid4()), str(uuid.uuid4())]
-        )
-
-    def create_transformation_event(self):
-        now, tzoffset = get_current_utc_time_and_offset()
-        event_id = str(uuid.uuid4())
-        error_declaration = self.create_error_declaration()
-        input_epcs = self.create_epcs(1000, 1010)
-        output_epcs = self.create_epcs(2000, 2010)
-        business_transaction_list = self.create_business_transaction_list()
-        biz_location, read_point, source_list = self.create_source_list()
-        destination_list = self.create_destination_list()
-
-        ilmd = [
-            InstanceLotMasterDataAttribute(
-                name=LotLevelAttributeName.itemExpirationDate.value,
-                value='2015-12-31'),
-            InstanceLotMasterDataAttribute(
-                name=ItemLevelAttributeName.lotNumber.value,
-                value='DL232')
-        ]
-
-        trade_item = helpers.make_trade_item_master_data_urn('305555', '0',
-                                                             '555551')
-        output_quantity_list = [
-            QuantityElement(epc_class=trade_item, quantity=10, uom='EA'),
-            QuantityElement(epc_class=trade_item, quantity=94.3,
-                            uom='LB')]
-        input_quantity_list = [
-            QuantityElement(epc_class=trade_item, quantity=100, uom='EA'),
-            QuantityElement(epc_class=trade_item, quantity=94.3,
-                            uom='LB')]
-
-        te = TransformationEvent(
-            now, tzoffset, now, event_id, input_epcs,
-            input_quantity_list=input_quantity_list,
-            output_epc_list=output_epcs,
-            output_quantity_list=output_quantity_list,
-            transformation_id=str(uuid.uuid4()),
-            biz_step=BusinessSteps.repackaging.value,
-            disposition=Disposition.returned.value,
-            read_point=read_point,
-            biz_location=biz_location,
-            business_transaction_list=business_transaction_list,
-            source_list=source_list,
-            destination_list=destination_list,
-            error_declaration=error_declaration,
-            ilmd=ilmd)
-        return te
-
-    def create_object_event_template(self):
-        epcs = self.create_epcs()
-        # get the current time and tz
-        now, tzoffset = get_current_utc_time_and_offset()
-        business_transaction_list = self.create_business_transaction_list()
-        biz_location, read_point, source_list = self.create_source_list()
-        destination_list = self.create_destination_list()
-        ilmd = [
-            InstanceLotMasterDataAttribute(
-                name=LotLevelAttributeName.itemExpirationDate.value,
-                value='2015-12-31'),
-            InstanceLotMasterDataAttribute(
-                name=ItemLevelAttributeName.lotNumber.value,
-                value='DL232')
-        ]
-        oe = self.create_object_event(biz_location, business_transaction_list,
-                                      destination_list, epcs, now, read_point,
-                                      source_list, tzoffset,
-                                      action=Action.add.value,
-                                      ilmd=ilmd)
-        oe.clean()
-        return oe
-
-    def create_epcs(self, start=1000, end=1002):
-        # create a range for the number generation
-        # (we can use SerialBox as well)
-        nums = range(start, end)
-        # generate some URNS
-        epcs = gtin_urn_generator('305555', '1', '555555', nums)
-        return list(epcs)
-
     def test_create_illegal_object_event(self):
         # create a range for the number generation
         # (we can use SerialBox as well)
@@ -479,80 +313,19 @@ class CoreEventTests(unittest.TestCase):
         action = Action.observe.value
         ilmd = "<ilmd></ilmd>"
 
-        oe = self.create_object_event(None, None,
-                                      None, epcs, '01/dfg/2322', None,
-                                      None, tzoffset,
-                                      action=Action.observe.value,
-                                      ilmd=ilmd)
+        oe = create_object_event(None, None,
+                                 None, epcs, '01/dfg/2322', None,
+                                 None, tzoffset,
+                                 action=Action.observe.value,
+                                 ilmd=ilmd)
         self.assertRaises(ValidationError, oe.clean)
 
-        oe = self.create_object_event(None, None,
-                                      None, epcs, now, None,
-                                      None, tzoffset,
-                                      action=Action.observe.value,
-                                      ilmd=ilmd)
+        oe = create_object_event(None, None,
+                                 None, epcs, now, None,
+                                 None, tzoffset,
+                                 action=Action.observe.value,
+                                 ilmd=ilmd)
         self.assertRaises(ValidationError, oe.clean)
 
-    def create_object_event(self, biz_location, business_transaction_list,
-                            destination_list, epcs, now, read_point,
-                            source_list, tzoffset, action=None, ilmd=None):
-        # create the event
-        event_id = str(uuid.uuid4())
-        error_declaration = self.create_error_declaration()
-        oe = ObjectEvent(now, tzoffset,
-                         record_time=now,
-                         action=action,
-                         epc_list=epcs,
-                         biz_step=BusinessSteps.commissioning.value,
-                         disposition=Disposition.encoded.value,
-                         business_transaction_list=business_transaction_list,
-                         biz_location=biz_location,
-                         read_point=read_point,
-                         source_list=source_list,
-                         destination_list=destination_list,
-                         ilmd=ilmd, error_declaration=error_declaration,
-                         event_id=event_id)
-        return oe
-
-    def create_business_transaction_list(self):
-        business_transaction_list = [
-            BusinessTransaction('urn:epcglobal:cbv:bt:0555555555555.DE45_111',
-                                BusinessTransactionType.Despatch_Advice),
-            BusinessTransaction('urn:epcglobal:cbv:bt:0555555555555.00001',
-                                BusinessTransactionType.Bill_Of_Lading)
-        ]
-        return business_transaction_list
-
-    def create_source_list(self):
-        # send in the GLN info
-        biz_location = gln13_data_to_sgln_urn(company_prefix='305555',
-                                              location_reference='123456')
-        read_point = gln13_data_to_sgln_urn(company_prefix='305555',
-                                            location_reference='123456',
-                                            extension='12')
-        # create a source list
-        source_list = [
-            Source(SourceDestinationTypes.possessing_party.value,
-                   biz_location),
-            Source(SourceDestinationTypes.location.value, read_point)
-        ]
-        return biz_location, read_point, source_list
-
-    def create_destination_list(self):
-        # create a destination and a destination list
-        destination_party = gln13_data_to_sgln_urn(company_prefix='0614141',
-                                                   location_reference='00001')
-        destination_location = gln13_data_to_sgln_urn(company_prefix='0614141',
-                                                      location_reference='00001',
-                                                      extension='23')
-        destination_list = [
-            Destination(SourceDestinationTypes.owning_party.value,
-                        destination_party),
-            Destination(SourceDestinationTypes.location.value,
-                        destination_location)
-        ]
-        return destination_list
-
-
 if __name__ == '__main__':
     unittest.main()
@@ -13,14 +13,27 @@
 #
 # Copyright 2018 Rob Magee, All rights reserved.
 
+from functools import lru_cache
 from os.path import abspath, join, dirname
 from lxml import etree
 
-def validate_epcis_doc(epcis_doc: str):
-    schema_file = abspath(join(dirname(__file__),
-                               'schemas/EPCglobal-epcis-1_2.xsd'))
-    with open(schema_file, 'r') as f:
-        schema_root = etree.XML(f.read().encode('utf-8'))
+SCHEMA_FILE = abspath(join(dirname(__file__),
+                           'schemas/EPCglobal-epcis-1_2.xsd'))
+# the schema imports its dependencies from ./schemas/
+SCHEMA_BASE_URL = abspath(join(dirname(__file__),
+                               'EPCglobal-epcis-1_2.xsd'))
+
+
+@lru_cache(maxsize=None)
+def get_epcis_parser():
+    # the base url resolves the schema imports relative to this directory
+    # rather than the working directory.  Parsing the schema is expensive
+    # so the parser is created once.
+    with open(SCHEMA_FILE, 'rb') as f:
+        schema_root = etree.XML(f.read(), base_url=SCHEMA_BASE_URL)
     schema = etree.XMLSchema(schema_root)
-    xml_parser = etree.XMLParser(schema=schema)
-    etree.fromstring(epcis_doc, xml_parser)
+    return etree.XMLParser(schema=schema)
+
+
+def validate_epcis_doc(epcis_doc: str):
+    etree.fromstring(epcis_doc, get_epcis_parser())
@@ -0,0 +1,119 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+
+import io
+import unittest
+
+from lxml import etree
+
+from EPCPyYes.core.v1_2 import backends
+from EPCPyYes.core.v1_2.template_events import EPCISDocument, \
+    EPCISEventListDocument, ObjectEvent, AggregationEvent
+from EPCPyYes.core.v1_2.xml_serializer import serializer, epc_list
+from EPCPyYes.core.tests import helpers
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc
+
+
+def normalize(data: str):
+    '''
+    Parses an XML string and drops the whitespace between elements so
+    the output of different backends can be compared.
+    '''
+    if '<epcis:EPCISDocument' not in data:
+        # events use the cbvmd prefix declared by the document element
+        data = '<event xmlns:cbvmd="urn:epcglobal:cbv:mda">%s</event>' % data
+    root = etree.fromstring(data.encode('utf-8'))
+    for element in root.iter():
+        element.text = (element.text or '').strip() or None
+        element.tail = None
+    return etree.tostring(root, method='c14n')
+
+
+def create_events():
+    events = helpers.create_events()
+    # two transformation events in a row
+    events[-1] = helpers.create_transformation_event()
+    return events
+
+
+class XMLSerializerTests(unittest.TestCase):
+    '''
+    Tests the fast XML serializer backend.
+    '''
+
+    def assertBackendsMatch(self, obj):
+        data = obj.render(backend='fast')
+        self.assertEqual(normalize(data), normalize(obj.render()))
+        stream = io.BytesIO()
+        obj.render_to(stream, backend='fast')
+        self.assertEqual(stream.getvalue(), data.encode('utf-8'))
+        return data
+
+    def test_events(self):
+        for event in create_events():
+            self.assertBackendsMatch(event)
+
+    def test_event_list_document(self):
+        doc = EPCISEventListDocument(create_events(),
+                                     header=helpers.create_sbdh())
+        doc.render_xml_declaration = True
+        data = self.assertBackendsMatch(doc)
+        self.assertTrue(data.startswith('<?xml'))
+        validate_epcis_doc(data.encode('utf-8'))
+        chunks = list(doc.iter_render(backend='fast'))
+        # the document start, one chunk per event and the document end
+        self.assertEqual(len(chunks), 7)
+
+    def test_document(self):
+        events = create_events()
+        doc = EPCISDocument(header=helpers.create_sbdh(),
+                            object_events=[events[0]],
+                            aggregation_events=[events[1]],
+                            transaction_events=[events[2]],
+                            transformation_events=events[3:])
+        validate_epcis_doc(self.assertBackendsMatch(doc).encode('utf-8'))
+
+    def test_escaping(self):
+        event = ObjectEvent(
+            event_time='2018-01-01T00:00:00+00:00',
+            epc_list=['urn:epc:id:sgtin:305555.1555555.1&2'],
+            biz_location='urn:epc:id:sgln:305555.123456.<0>')
+        doc = EPCISEventListDocument([event])
+        validate_epcis_doc(doc.render(backend='fast').encode('utf-8'))
+        self.assertIn('.1&amp;2<', event.render(backend='fast'))
+        self.assertEqual(epc_list('epcList', []), '<epcList/>\n')
+
+    def test_empty_epc_lists_are_valid(self):
+        doc = EPCISEventListDocument([
+            ObjectEvent(event_time='2018-01-01T00:00:00+00:00',
+                        epc_list=[]),
+            AggregationEvent(event_time='2018-01-01T00:00:00+00:00',
+                             parent_id='urn:epc:id:sscc:305555.0000000001',
+                             child_epcs=[])])
+        validate_epcis_doc(doc.render(backend='fast').encode('utf-8'))
+
+    def test_backends(self):
+        event = helpers.create_object_event_template()
+        self.assertEqual(event.render(backend='template'), event.render())
+        self.assertRaises(ValueError, event.render, backend='missing')
+        self.assertRaises(ValueError, backends.register_backend,
+                          backends.TEMPLATE_BACKEND, serializer)
+        self.assertIn('fast', backends.available_backends())
+        self.assertIs(backends.get_backend('fast'), serializer)
+        self.assertRaises(TypeError, serializer.serialize, object())
+
+
+if __name__ == '__main__':
+    unittest.main()
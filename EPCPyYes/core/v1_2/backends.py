@@ -0,0 +1,84 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The serializer backends available to `TemplateMixin.render`,
+`iter_render` and `render_to`.
+
+The default backend, `template`, renders the Jinja2 templates and honors
+any custom templates or environments.  Other backends are objects with an
+`iter_serialize(obj)` method returning an iterable of string chunks.
+They are registered by name- either as an instance or as an
+`'module.path:attribute'` string which is imported on first use so
+backends with optional dependencies cost nothing until they are picked.
+
+.. code-block:: python
+
+    document.render(backend='fast')
+'''
+import importlib
+import threading
+
+TEMPLATE_BACKEND = 'template'
+'''
+The name of the default Jinja2 template backend.
+'''
+
+_backends = {
+    'fast': 'EPCPyYes.core.v1_2.xml_serializer:serializer',
+    'lxml': 'EPCPyYes.core.v1_2.lxml_writer:writer',
+}
+_lock = threading.Lock()
+
+
+def register_backend(name: str, backend):
+    '''
+    Registers a serializer backend under the given name.
+    :param name: The name passed to the `backend` parameter of the render
+        methods.
+    :param backend: An object with an `iter_serialize(obj)` method or an
+        `'module.path:attribute'` string naming one.
+    '''
+    if name == TEMPLATE_BACKEND:
+        raise ValueError('The %s backend can not be replaced.' % name)
+    with _lock:
+        _backends[name] = backend
+
+
+def get_backend(name: str):
+    '''
+    Returns the backend registered under the given name, importing it if
+    it was registered by path.
+    :param name: The backend name.
+    :return: An object with an `iter_serialize(obj)` method.
+    '''
+    try:
+        backend = _backends[name]
+    except KeyError:
+        raise ValueError('Unknown serializer backend %r.  Available backends '
+                         'are: %s' % (name, ', '.join(available_backends())))
+    if isinstance(backend, str):
+        module_name, _, attribute = backend.partition(':')
+        backend = getattr(importlib.import_module(module_name), attribute)
+        with _lock:
+            _backends[name] = backend
+    return backend
+
+
+def available_backends():
+    '''
+    :return: The names of the registered backends, the template backend
+        first.
+    '''
+    return [TEMPLATE_BACKEND] + sorted(_backends)
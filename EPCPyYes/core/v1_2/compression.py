@@ -0,0 +1,85 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compression for the streaming render methods.  Rendered output is
+compressed as it is produced so a document can be written straight to a
+gzip file or HTTP response without ever holding the uncompressed (or
+compressed) document in memory:
+
+.. code-block:: python
+
+    with open('events.xml.gz', 'wb') as f:
+        document.render_to(f, compression='gzip', compression_level=6)
+
+The gzip output can be read with the `gzip` module or any gzip tool,
+the zlib output with `zlib.decompress`.
+'''
+import zlib
+
+GZIP = 'gzip'
+ZLIB = 'zlib'
+
+DEFAULT_COMPRESSION_LEVEL = 6
+'''
+The compression level used when none is given- zlib's default trade-off
+between speed and size.  Levels go from 1 (fastest) to 9 (smallest).
+'''
+
+_WBITS = {
+    GZIP: 16 + zlib.MAX_WBITS,
+    ZLIB: zlib.MAX_WBITS,
+}
+
+
+def compressor(compression: str, level: int = DEFAULT_COMPRESSION_LEVEL):
+    '''
+    Returns a new incremental compressor.
+    :param compression: `gzip` or `zlib`.
+    :param level: The compression level from 0 (none) to 9 (smallest).
+    :return: A `zlib` compression object with `compress` and `flush`
+        methods.
+    '''
+    try:
+        wbits = _WBITS[compression]
+    except KeyError:
+        raise ValueError('Unknown compression %r.  Use one of: %s' % (
+            compression, ', '.join(sorted(_WBITS))))
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVEL
+    if not 0 <= level <= 9:
+        raise ValueError('The compression level must be between 0 and 9.')
+    return zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+
+def iter_compress(chunks, compression: str = GZIP,
+                  level: int = DEFAULT_COMPRESSION_LEVEL, encoding='utf-8'):
+    '''
+    Compresses an iterable of string chunks, such as the result of
+    `TemplateMixin.iter_render`, for a streaming HTTP response or
+    similar.
+    :param chunks: An iterable of strings.
+    :param compression: `gzip` or `zlib`.
+    :param level: The compression level.
+    :param encoding: The encoding of the text before compression.
+    :return: A generator of compressed bytes.  Chunks the compressor
+        buffers internally are skipped, so there are usually far fewer
+        compressed chunks than input chunks.
+    '''
+    compress = compressor(compression, level)
+    for chunk in chunks:
+        data = compress.compress(chunk.encode(encoding))
+        if data:
+            yield data
+    yield compress.flush()
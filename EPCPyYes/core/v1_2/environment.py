@@ -0,0 +1,555 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The environment module keeps a process-wide registry of Jinja2
+environments.  Environments are keyed by their loader configuration and
+options so that every template event, document and header built against
+the same templates shares one environment and, with it, one cache of
+compiled templates.
+
+.. code-block:: python
+
+    from EPCPyYes.core.v1_2.environment import get_environment
+    from jinja2 import FileSystemLoader
+
+    # the default EPCPyYes package environment
+    env = get_environment()
+    # an environment for your own template overrides- calling this again
+    # with the same path returns the very same environment
+    custom = get_environment(FileSystemLoader('/path/to/templates'))
+
+Short-lived processes can skip parsing and compiling the packaged
+templates altogether by loading them from a precompiled bundle.  Build
+the bundle once, for example while building a container image:
+
+.. code-block:: text
+
+    python -m EPCPyYes.core.v1_2.environment compile
+
+This writes the bundle to `EPCPyYes.COMPILED_TEMPLATES_PATH` (override
+with the `EPCPYYES_COMPILED_TEMPLATES` environment variable) where the
+default environment picks it up automatically.  Alternatively, set
+`EPCPYYES_TEMPLATE_CACHE` to a directory and the default environment will
+keep a Jinja2 bytecode cache there.
+
+Templates are split into many small includes- event times, business
+data, extensions and so on- that Jinja2 looks up and renders one at a
+time for every event.  Environments created with `inline_includes=True`
+(or every registry environment when `EPCPyYes.INLINE_INCLUDES` is set)
+splice the included templates into the including template when it is
+compiled, so each event type renders from a single compiled template.
+The includes are still looked up through the environment's loader, so
+overridden templates are inlined just the same.  Precompiled bundles can
+be built with inlined templates too:
+
+.. code-block:: text
+
+    python -m EPCPyYes.core.v1_2.environment compile --inline
+
+Every environment has a *compact* twin (see `compact_environment`) that
+renders the same templates without the indentation and line breaks
+between elements.  The template classes use it when rendering with
+`compact=True`.
+'''
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import warnings
+import weakref
+import zipfile
+
+import jinja2
+import EPCPyYes
+from jinja2 import Environment, PackageLoader, FileSystemLoader, \
+    ChoiceLoader, PrefixLoader, ModuleLoader, BaseLoader, \
+    FileSystemBytecodeCache
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.lexer import Token
+from jinja2.parser import Parser
+from jinja2.visitor import NodeTransformer
+
+DEFAULT_PACKAGE_NAME = 'EPCPyYes'
+DEFAULT_PACKAGE_PATH = 'templates'
+
+DEFAULT_OPTIONS = {
+    'extensions': ('jinja2.ext.with_',),
+    'trim_blocks': True,
+    'lstrip_blocks': True,
+}
+'''
+The Jinja2 environment options used by the default EPCPyYes environment.
+'''
+
+COMPACT_EXTENSION = 'EPCPyYes.core.v1_2.environment.CompactExtension'
+'''
+The import path of the `CompactExtension` added to compact environments.
+'''
+
+DEFAULT_LOADER_SPEC = ('package', DEFAULT_PACKAGE_NAME, DEFAULT_PACKAGE_PATH,
+                       'utf-8')
+
+BUNDLE_MANIFEST = 'epcpyyes_bundle.json'
+'''
+The name of the file written into a precompiled template bundle that
+records the Jinja2 version and the checksum of the template sources the
+bundle was compiled from.
+'''
+
+
+_TAG_SPACE = re.compile(r'>\s+<')
+_LEADING_SPACE = re.compile(r'^\s+(?=<)')
+_TRAILING_SPACE = re.compile(r'(?<=>)\s+$')
+_INDENTATION = re.compile(r'\s*\n\s*|\s{2,}')
+
+
+def compact_markup(data: str) -> str:
+    '''
+    Removes the insignificant whitespace from a piece of template markup:
+    whitespace between elements and at the start or end of the markup
+    next to a tag is dropped and any other line break or indentation
+    (between the attributes of a tag, for example) becomes a single
+    space.
+    '''
+    if not data.strip():
+        return data if data == ' ' else ''
+    data = _TAG_SPACE.sub('><', data)
+    data = _LEADING_SPACE.sub('', data)
+    data = _TRAILING_SPACE.sub('', data)
+    return _INDENTATION.sub(' ', data)
+
+
+class CompactExtension(Extension):
+    '''
+    A Jinja2 extension that strips the indentation and line breaks from
+    the markup of the templates when they are compiled.  Values rendered
+    into the templates are left untouched, so there is no cost at render
+    time.
+    '''
+
+    def filter_stream(self, stream):
+        for token in stream:
+            if token.type == 'data':
+                value = compact_markup(token.value)
+                if value:
+                    yield Token(token.lineno, 'data', value)
+            else:
+                yield token
+
+
+class _IncludeInliner(NodeTransformer):
+    '''
+    Replaces the include nodes of a parsed template with the body of the
+    included templates.
+    '''
+
+    def __init__(self, environment, name):
+        self.environment = environment
+        self.names = [name]
+
+    def visit_Include(self, node):
+        template = node.template
+        if node.ignore_missing or not node.with_context or \
+                not isinstance(template, nodes.Const) or \
+                not isinstance(template.value, str):
+            return node
+        name = self.environment.join_path(template.value, self.names[-1])
+        if name in self.names:
+            return node
+        source, filename, _ = self.environment.loader.get_source(
+            self.environment, name)
+        included = Parser(self.environment, source, name, filename).parse()
+        # blocks, inheritance and top-level assignments behave differently
+        # when they are part of the including template.
+        for node_type in (nodes.Extends, nodes.Block, nodes.Assign,
+                          nodes.AssignBlock):
+            if included.find(node_type) is not None:
+                return node
+        self.names.append(name)
+        try:
+            return self.visit(included).body
+        finally:
+            self.names.pop()
+
+
+class EPCPyYesEnvironment(Environment):
+    '''
+    The Jinja2 environment class of the registry environments.  It adds
+    nothing to `jinja2.Environment`; it only tells the environments
+    EPCPyYes created apart from everybody else's so that, for example,
+    the profiler can hook into them without touching other Jinja2 users
+    in the same process.
+    '''
+
+
+class InliningEnvironment(EPCPyYesEnvironment):
+    '''
+    A Jinja2 environment that inlines `{% include "name" %}` tags with a
+    constant template name into the including template when it is
+    compiled.  The output is identical to the output of a regular
+    environment.  Includes of dynamic template names and included
+    templates using blocks, inheritance or top-level `{% set %}` tags
+    are left as they are.  Error line numbers in inlined parts refer to
+    the included template.  With `auto_reload` only changes to the
+    including template itself are noticed.
+    '''
+
+    def _parse(self, source, name, filename):
+        template = super()._parse(source, name, filename)
+        return _IncludeInliner(self, name).visit(template)
+
+
+def loader_spec(loader):
+    '''
+    Returns a hashable description of a Jinja2 loader that can be used to
+    key environments.  Package, file system, choice and prefix loaders
+    are described by their configuration- so two loaders pointing at the
+    same templates map to the same environment.  Any other loader is
+    described by its identity.
+
+    :param loader: A Jinja2 loader instance, a loader spec tuple or None
+        for the default EPCPyYes package loader.
+    :return: A tuple describing the loader.
+    '''
+    if loader is None:
+        return DEFAULT_LOADER_SPEC
+    if isinstance(loader, tuple):
+        return loader
+    if isinstance(loader, PackageLoader):
+        return ('package', loader.package_name, loader.package_path,
+                loader.encoding)
+    if isinstance(loader, FileSystemLoader):
+        return ('filesystem', tuple(loader.searchpath), loader.encoding,
+                getattr(loader, 'followlinks', False))
+    if isinstance(loader, ChoiceLoader):
+        return ('choice', tuple(loader_spec(l) for l in loader.loaders))
+    if isinstance(loader, PrefixLoader):
+        return ('prefix', loader.delimiter,
+                tuple(sorted((prefix, loader_spec(l)) for prefix, l in
+                             loader.mapping.items())))
+    return ('instance', id(loader))
+
+
+def make_loader(spec):
+    '''
+    Builds a new Jinja2 loader from a spec returned by `loader_spec`.
+
+    :param spec: A loader spec tuple.
+    :return: A Jinja2 loader.
+    :raises ValueError: If the spec describes a loader instance that
+        can not be re-created from its configuration.
+    '''
+    kind = spec[0]
+    if kind == 'package':
+        return PackageLoader(spec[1], spec[2], encoding=spec[3])
+    elif kind == 'filesystem':
+        return FileSystemLoader(list(spec[1]), encoding=spec[2],
+                                followlinks=spec[3])
+    elif kind == 'choice':
+        return ChoiceLoader([make_loader(s) for s in spec[1]])
+    elif kind == 'prefix':
+        return PrefixLoader({prefix: make_loader(s) for prefix, s in spec[2]},
+                            delimiter=spec[1])
+    raise ValueError('The loader spec %r can not be used to create a new '
+                     'loader.' % (spec,))
+
+
+def _options_key(options: dict):
+    ret = []
+    for name, value in sorted(options.items()):
+        if isinstance(value, list):
+            value = tuple(value)
+        try:
+            hash(value)
+        except TypeError:
+            raise TypeError('The Jinja2 environment option %s must be '
+                            'hashable to be used with the environment '
+                            'registry.' % name)
+        ret.append((name, value))
+    return tuple(ret)
+
+
+class EnvironmentRegistry(object):
+    '''
+    A thread-safe registry of Jinja2 environments keyed by loader
+    configuration and environment options.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._environments = {}
+        self._keys = {}
+
+    def get_environment(self, loader=None, **options) -> Environment:
+        '''
+        Returns the shared environment for the loader and options,
+        creating it on first use.
+
+        :param loader: A Jinja2 loader, a loader spec or None for the
+            default EPCPyYes package templates.
+        :param options: Jinja2 `Environment` keyword arguments.  These
+            are applied on top of the `DEFAULT_OPTIONS`.  Pass
+            `inline_includes` to override `EPCPyYes.INLINE_INCLUDES`
+            for this environment.
+        :return: A Jinja2 Environment.
+        '''
+        spec = loader_spec(loader)
+        options = dict(DEFAULT_OPTIONS, **options)
+        options.setdefault('inline_includes', EPCPyYes.INLINE_INCLUDES)
+        key = (spec, _options_key(options))
+        env = self._environments.get(key)
+        if env is None:
+            with self._lock:
+                env = self._environments.get(key)
+                if env is None:
+                    if loader is None or isinstance(loader, tuple):
+                        loader = make_loader(spec)
+                    env = self._create_environment(spec, loader, options)
+                    self._environments[key] = env
+                    self._keys[id(env)] = key
+        return env
+
+    def _create_environment(self, spec, loader: BaseLoader, options: dict,
+                            use_bundle=True):
+        options = dict(options)
+        inline = options.pop('inline_includes', False)
+        if 'extensions' in options:
+            options['extensions'] = list(options['extensions'])
+        if spec == DEFAULT_LOADER_SPEC:
+            # the packaged templates do not change while the process runs
+            # so there is no need to stat them on every template lookup.
+            options.setdefault('auto_reload', False)
+            if EPCPyYes.TEMPLATE_BYTECODE_CACHE and \
+                    'bytecode_cache' not in options:
+                options['bytecode_cache'] = FileSystemBytecodeCache(
+                    EPCPyYes.TEMPLATE_BYTECODE_CACHE)
+            bundle = EPCPyYes.COMPILED_TEMPLATES_PATH
+            # the bundle is compiled with the default options, compact
+            # environments and other options need their own templates.
+            if use_bundle and options['extensions'] == \
+                    list(DEFAULT_OPTIONS['extensions']) and \
+                    bundle_is_current(bundle, inline):
+                loader = ChoiceLoader([ModuleLoader(bundle), loader])
+        environment_class = InliningEnvironment if inline else \
+            EPCPyYesEnvironment
+        return environment_class(loader=loader, **options)
+
+    def key_for(self, env: Environment):
+        '''
+        Returns the registry key for an environment or None if the
+        environment was not created by this registry.
+        '''
+        key = self._keys.get(id(env))
+        if key is not None and self._environments.get(key) is env:
+            return key
+        return None
+
+    def environments(self):
+        '''
+        :return: A list of the registered environments.
+        '''
+        with self._lock:
+            return list(self._environments.values())
+
+    def clear(self):
+        '''
+        Drops every registered environment.  Existing template instances
+        keep working but new lookups will create new environments.
+        '''
+        with self._lock:
+            self._environments.clear()
+            self._keys.clear()
+
+    def __len__(self):
+        return len(self._environments)
+
+    def __contains__(self, env: Environment):
+        return self.key_for(env) is not None
+
+
+registry = EnvironmentRegistry()
+'''
+The process-wide environment registry.
+'''
+
+
+def get_environment(loader=None, **options) -> Environment:
+    '''
+    Returns a shared Jinja2 environment from the process-wide registry.
+    See `EnvironmentRegistry.get_environment`.
+    '''
+    return registry.get_environment(loader, **options)
+
+
+_compact_twins = weakref.WeakKeyDictionary()
+
+
+def compact_environment(env: Environment) -> Environment:
+    '''
+    Returns the compact twin of an environment- an environment loading
+    the same templates with the same options plus the `CompactExtension`.
+    Twins of registry environments with file or package based loaders
+    come from the registry so they are shared process-wide and can be
+    recreated in worker processes; other environments get an overlay.
+    Twins are kept for as long as the environment is alive.
+
+    :param env: A Jinja2 environment.
+    :return: The compact Jinja2 environment.
+    '''
+    compact = _compact_twins.get(env)
+    if compact is not None:
+        return compact
+    if CompactExtension in [type(ext) for ext in env.extensions.values()]:
+        return env
+    key = registry.key_for(env)
+    if key is not None and key[0][0] != 'instance':
+        spec, options = key
+        options = dict(options)
+        options['extensions'] = tuple(options.get('extensions', ())) + \
+            (COMPACT_EXTENSION,)
+        compact = registry.get_environment(spec, **options)
+    else:
+        # a new cache so the overlay does not copy the templates the
+        # environment has already compiled without the extension.
+        cache_size = 0 if env.cache is None else \
+            getattr(env.cache, 'capacity', -1)
+        compact = env.overlay(extensions=[CompactExtension],
+                              cache_size=cache_size)
+    with registry._lock:
+        return _compact_twins.setdefault(env, compact)
+
+
+_checksums = {}
+_manifests = {}
+
+
+def templates_checksum():
+    '''
+    Returns a checksum of the packaged template sources.  The sources do
+    not change while the process runs, so they are only hashed once.
+    '''
+    path = EPCPyYes.TEMPLATES_PATH
+    checksum = _checksums.get(path)
+    if checksum is None:
+        digest = hashlib.sha1()
+        for root, dirs, files in sorted(os.walk(path)):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path)
+                              .encode('utf-8'))
+                with open(file_path, 'rb') as f:
+                    digest.update(f.read())
+        checksum = _checksums[path] = digest.hexdigest()
+    return checksum
+
+
+def _read_manifest(bundle: str):
+    if os.path.isdir(bundle):
+        with open(os.path.join(bundle, BUNDLE_MANIFEST)) as f:
+            return json.load(f)
+    with zipfile.ZipFile(bundle) as zf:
+        return json.loads(zf.read(BUNDLE_MANIFEST).decode('utf-8'))
+
+
+def bundle_is_current(bundle: str, inline=False):
+    '''
+    Checks whether a precompiled template bundle exists and was compiled
+    from the current template sources with the installed Jinja2 version.
+    A bundle that exists but is out of date is ignored with a warning.
+    The manifest of each bundle is only checked once per process.
+
+    :param bundle: The path to the bundle zip file or directory.
+    :param inline: Whether the bundle must have been compiled with
+        inlined includes.
+    :return: True if the bundle can be used.
+    '''
+    if not bundle or not os.path.exists(bundle):
+        return False
+    key = (bundle, EPCPyYes.TEMPLATES_PATH)
+    manifest = _manifests.get(key)
+    if manifest is None:
+        try:
+            manifest = _read_manifest(bundle)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            manifest = {}
+        if manifest.get('jinja2') != jinja2.__version__ or \
+                manifest.get('checksum') != templates_checksum():
+            warnings.warn('The precompiled template bundle at %s is out of '
+                          'date and will be ignored.  Re-create it with '
+                          'EPCPyYes.core.v1_2.environment.compile_templates.'
+                          % bundle)
+            # remembered as out of date
+            manifest = {}
+        _manifests[key] = manifest
+    if not manifest:
+        return False
+    return manifest.get('inline', False) == bool(inline)
+
+
+def compile_templates(target: str = None, zip: str = 'deflated',
+                      inline: bool = None):
+    '''
+    Compiles the packaged EPCPyYes templates into a bundle of Python
+    modules that the default environment loads instead of the template
+    sources.
+
+    :param target: The zip file or directory to write.  Defaults to
+        `EPCPyYes.COMPILED_TEMPLATES_PATH`.
+    :param zip: The zip compression to use ('deflated' or 'stored') or
+        None to write a directory of modules instead of a zip file.
+    :param inline: Whether to inline the includes of the templates.
+        Defaults to `EPCPyYes.INLINE_INCLUDES`.  The bundle is only used
+        by environments with the same `inline_includes` setting.
+    :return: The path to the bundle.
+    '''
+    target = target or EPCPyYes.COMPILED_TEMPLATES_PATH
+    inline = EPCPyYes.INLINE_INCLUDES if inline is None else bool(inline)
+    env = registry._create_environment(
+        DEFAULT_LOADER_SPEC, make_loader(DEFAULT_LOADER_SPEC),
+        dict(DEFAULT_OPTIONS, inline_includes=inline), use_bundle=False)
+    env.compile_templates(target, zip=zip, ignore_errors=False)
+    manifest = json.dumps({'jinja2': jinja2.__version__,
+                           'checksum': templates_checksum(),
+                           'inline': inline})
+    if zip:
+        with zipfile.ZipFile(target, 'a') as zf:
+            zf.writestr(BUNDLE_MANIFEST, manifest)
+    else:
+        with open(os.path.join(target, BUNDLE_MANIFEST), 'w') as f:
+            f.write(manifest)
+    _manifests.pop((target, EPCPyYes.TEMPLATES_PATH), None)
+    return target
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Precompiles the EPCPyYes templates.')
+    parser.add_argument('command', choices=['compile'])
+    parser.add_argument('target', nargs='?', default=None,
+                        help='The bundle to write.  Defaults to %s' %
+                             EPCPyYes.COMPILED_TEMPLATES_PATH)
+    parser.add_argument('--directory', action='store_true',
+                        help='Write a directory of modules instead of a '
+                             'zip file.')
+    parser.add_argument('--inline', action='store_true', default=None,
+                        help='Inline the includes of the templates.')
+    args = parser.parse_args()
+    print(compile_templates(args.target,
+                            zip=None if args.directory else 'deflated',
+                            inline=args.inline))
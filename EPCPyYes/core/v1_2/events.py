@@ -34,6 +34,7 @@ from datetime import datetime
 from enum import Enum
 
 from EPCPyYes.core.errors import ValidationError
+from EPCPyYes.core.ids import LAZY_ID, new_id
 from EPCPyYes.core.v1_2.helpers import get_iso_8601_regex
 from EPCPyYes.core.SBDH.sbdh import StandardBusinessDocumentHeader as sbdh
 
@@ -247,7 +248,8 @@ class EPCISEvent(object):
         :param id: If present is used to store a reference to a database
             primary key.  This will NOT be rendered in the XML EPCIS documents.
             Use the id parameter and class property according to development
-            needs.
+            needs.  Set the property to `EPCPyYes.core.ids.LAZY_ID` to have
+            an id generated when it is first read.
         '''
         self._id = id,
         self._event_time = event_time or datetime.utcnow().isoformat(sep='T')
@@ -259,10 +261,13 @@ class EPCISEvent(object):
 
     @property
     def id(self):
+        if self._id is LAZY_ID:
+            self._id = new_id()
         return self._id
 
     @id.setter
     def id(self, value):
+        self.clear_cache()
         self._id = value
 
     @property
@@ -272,6 +277,7 @@ class EPCISEvent(object):
 
     @event_time.setter
     def event_time(self, value):
+        self.clear_cache()
         self._event_time = value if isinstance(
             value, str
         ) else value.isoformat(sep='T')
@@ -282,6 +288,7 @@ class EPCISEvent(object):
 
     @event_timezone_offset.setter
     def event_timezone_offset(self, value):
+        self.clear_cache()
         self._event_timezone_offset = value
 
     @property
@@ -291,6 +298,7 @@ class EPCISEvent(object):
 
     @record_time.setter
     def record_time(self, value):
+        self.clear_cache()
         self._record_time = value
 
     @property
@@ -299,6 +307,7 @@ class EPCISEvent(object):
 
     @event_id.setter
     def event_id(self, value):
+        self.clear_cache()
         self._event_id = value
 
     @property
@@ -307,8 +316,19 @@ class EPCISEvent(object):
 
     @error_declaration.setter
     def error_declaration(self, value):
+        self.clear_cache()
         self._error_declaration = value
 
+    def clear_cache(self):
+        '''
+        Discards anything cached from the values of the event- the
+        rendered XML and JSON fragments kept by the template events, for
+        example.  Called by every property setter.  Changing a list or
+        other mutable value in place is not noticed, so call this method
+        after doing so.
+        '''
+        self.__dict__.pop('_fragments', None)
+
     def clean(self):
         '''
         Implement this function to Validate an event based on rules defined
@@ -395,6 +415,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @action.setter
     def action(self, value):
+        self.clear_cache()
         self._action = value
 
     @property
@@ -403,6 +424,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @biz_step.setter
     def biz_step(self, value):
+        self.clear_cache()
         self._biz_step = value
 
     @property
@@ -411,6 +433,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @disposition.setter
     def disposition(self, value):
+        self.clear_cache()
         self._disposition = value
 
     @property
@@ -419,6 +442,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @read_point.setter
     def read_point(self, value):
+        self.clear_cache()
         self._read_point = value
 
     @property
@@ -427,6 +451,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @biz_location.setter
     def biz_location(self, value):
+        self.clear_cache()
         self._biz_location = value
 
     @property
@@ -435,6 +460,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @source_list.setter
     def source_list(self, value):
+        self.clear_cache()
         self._source_list = value
 
     @property
@@ -443,6 +469,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @destination_list.setter
     def destination_list(self, value):
+        self.clear_cache()
         self._destination_list = value
 
     @property
@@ -451,6 +478,7 @@ class EPCISBusinessEvent(EPCISEvent):
 
     @business_transaction_list.setter
     def business_transaction_list(self, value):
+        self.clear_cache()
         self._business_transaction_list = value
 
 
@@ -459,6 +487,7 @@ class ObjectEvent(EPCISBusinessEvent):
     A python implementation of the EPCIS Object event as outlined in
     section 7.4.2 of the standard.
     '''
+    event_type = EventType.Object
 
     def __init__(self, event_time: datetime, event_timezone_offset: str,
                  record_time: datetime, action: str = Action.add.value,
@@ -528,6 +557,7 @@ class ObjectEvent(EPCISBusinessEvent):
 
     @epc_list.setter
     def epc_list(self, value):
+        self.clear_cache()
         self._epc_list = value
 
     @property
@@ -536,6 +566,7 @@ class ObjectEvent(EPCISBusinessEvent):
 
     @quantity_list.setter
     def quantity_list(self, value):
+        self.clear_cache()
         self._quantity_list = value
 
     @property
@@ -544,6 +575,7 @@ class ObjectEvent(EPCISBusinessEvent):
 
     @ilmd.setter
     def ilmd(self, value):
+        self.clear_cache()
         self._ilmd = value
 
 
@@ -554,6 +586,7 @@ class AggregationEvent(EPCISBusinessEvent):
     set of “contained” objects that have been aggregated within a “containing”
     entity that’s meant to identify the aggregation itself.
     '''
+    event_type = EventType.Aggregation
 
     def __init__(self, event_time: datetime, event_timezone_offset: str,
                  record_time: datetime, action: str = Action.add.value,
@@ -617,6 +650,7 @@ class AggregationEvent(EPCISBusinessEvent):
 
     @parent_id.setter
     def parent_id(self, value):
+        self.clear_cache()
         self._parent_id = value
 
     @property
@@ -629,6 +663,7 @@ class AggregationEvent(EPCISBusinessEvent):
 
     @child_epcs.setter
     def child_epcs(self, value):
+        self.clear_cache()
         self._child_epcs = value
 
     @property
@@ -641,6 +676,7 @@ class AggregationEvent(EPCISBusinessEvent):
 
     @child_quantity_list.setter
     def child_quantity_list(self, value):
+        self.clear_cache()
         self._child_quantity_list = value
 
 
@@ -648,6 +684,7 @@ class TransactionEvent(EPCISBusinessEvent):
     '''
     A python implementation of and EPCIS TransactionEvent.
     '''
+    event_type = EventType.Transaction
 
     def __init__(self, event_time: datetime, event_timezone_offset: str,
                  record_time: datetime, action: Action = Action.add.value,
@@ -694,6 +731,7 @@ class TransactionEvent(EPCISBusinessEvent):
 
     @parent_id.setter
     def parent_id(self, value: str):
+        self.clear_cache()
         self._parent_id = value
 
     @property
@@ -702,6 +740,7 @@ class TransactionEvent(EPCISBusinessEvent):
 
     @epc_list.setter
     def epc_list(self, value):
+        self.clear_cache()
         self._epc_list = value
 
     @property
@@ -710,6 +749,7 @@ class TransactionEvent(EPCISBusinessEvent):
 
     @quantity_list.setter
     def quantity_list(self, value: list):
+        self.clear_cache()
         self._quantity_list = value
 
 
@@ -718,6 +758,7 @@ class TransformationEvent(EPCISEvent):
     A python implementation for the EPCIS TransformationEvent from
     section 7.4.6 of the GS1 standard.
     '''
+    event_type = EventType.Transformation
 
     def __init__(self, event_time: datetime, event_timezone_offset: str,
                  record_time: datetime, event_id: str = None,
@@ -796,6 +837,7 @@ class TransformationEvent(EPCISEvent):
 
     @input_epc_list.setter
     def input_epc_list(self, value):
+        self.clear_cache()
         self._input_epc_list = value
 
     @property
@@ -804,6 +846,7 @@ class TransformationEvent(EPCISEvent):
 
     @input_quantity_list.setter
     def input_quantity_list(self, value):
+        self.clear_cache()
         self._input_quantity_list = value
 
     @property
@@ -812,6 +855,7 @@ class TransformationEvent(EPCISEvent):
 
     @output_epc_list.setter
     def output_epc_list(self, value):
+        self.clear_cache()
         self._output_epc_list = value
 
     @property
@@ -820,6 +864,7 @@ class TransformationEvent(EPCISEvent):
 
     @output_quantity_list.setter
     def output_quantity_list(self, value):
+        self.clear_cache()
         self._output_quantity_list = value
 
     @property
@@ -828,6 +873,7 @@ class TransformationEvent(EPCISEvent):
 
     @transformation_id.setter
     def transformation_id(self, value):
+        self.clear_cache()
         self._transformation_id = value
 
     @property
@@ -836,6 +882,7 @@ class TransformationEvent(EPCISEvent):
 
     @biz_step.setter
     def biz_step(self, value):
+        self.clear_cache()
         self._biz_step = value
 
     @property
@@ -844,6 +891,7 @@ class TransformationEvent(EPCISEvent):
 
     @disposition.setter
     def disposition(self, value):
+        self.clear_cache()
         self._disposition = value
 
     @property
@@ -852,6 +900,7 @@ class TransformationEvent(EPCISEvent):
 
     @read_point.setter
     def read_point(self, value):
+        self.clear_cache()
         self._read_point = value
 
     @property
@@ -860,6 +909,7 @@ class TransformationEvent(EPCISEvent):
 
     @biz_location.setter
     def biz_location(self, value):
+        self.clear_cache()
         self._biz_location = value
 
     @property
@@ -868,6 +918,7 @@ class TransformationEvent(EPCISEvent):
 
     @business_transaction_list.setter
     def business_transaction_list(self, value):
+        self.clear_cache()
         self._business_transaction_list = value
 
     @property
@@ -876,6 +927,7 @@ class TransformationEvent(EPCISEvent):
 
     @source_list.setter
     def source_list(self, value):
+        self.clear_cache()
         self._source_list = value
 
     @property
@@ -884,6 +936,7 @@ class TransformationEvent(EPCISEvent):
 
     @destination_list.setter
     def destination_list(self, value):
+        self.clear_cache()
         self._destination_list = value
 
     @property
@@ -892,6 +945,7 @@ class TransformationEvent(EPCISEvent):
 
     @ilmd.setter
     def ilmd(self, value):
+        self.clear_cache()
         self._ilmd = value
 
 
@@ -0,0 +1,240 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The JSON serializer backends used by `TemplateMixin.render_json`,
+`render_pretty_json`, `iter_render_json` and `render_json_to`.
+
+Two backends ship with EPCPyYes:
+
+* `json`- the standard library encoders (see `json_encoders`).
+* `orjson`- the `orjson` package, several times faster at serializing
+  the encoded dictionaries.  Only available when `orjson` is installed.
+
+`EPCPyYes.JSON_BACKEND` picks the default- `json`, the default, so the
+output does not depend on what is installed.  `auto` uses `orjson` when
+it can be imported and the standard library otherwise.  Pass `backend`
+to the render methods to pick one per call:
+
+.. code-block:: python
+
+    document.render_json(backend='json')
+
+Both backends encode the same dictionaries so they produce the same
+JSON documents, but not the same text:
+
+* `orjson` writes no whitespace at all (`{"a":1,"b":[1,2]}`) where the
+  standard library writes a space after each `,` and `:`
+  (`{"a": 1, "b": [1, 2]}`).
+* `orjson` writes non-ASCII characters as UTF-8 instead of `\\uXXXX`
+  escapes.
+* `orjson` only pretty prints with an indent of 2; other indents are
+  pretty printed by the standard library.
+* Values the encoders pass through unconverted- datetimes or UUIDs in
+  the ILMD, say- are written by `orjson` and rejected by the standard
+  library.
+
+Other backends are objects with the attributes and methods of
+`StdlibJSONBackend`- usually subclasses of it- registered with
+`register_json_backend`.
+'''
+import json
+import threading
+
+import EPCPyYes
+from EPCPyYes.core.v1_2 import json_encoders
+
+AUTO = 'auto'
+'''
+The backend name that picks the fastest installed backend.
+'''
+
+
+class StdlibJSONBackend(object):
+    '''
+    Serializes with the `json` module and the encoders of the objects.
+    '''
+    name = 'json'
+
+    def dumps(self, obj):
+        '''
+        :return: The JSON of a dictionary, list or value.
+        '''
+        return json.dumps(obj)
+
+    def encode(self, obj):
+        '''
+        :return: The JSON of an EPCPyYes object, encoded by its `encoder`.
+        '''
+        if self._by_function(obj):
+            # the encoder only writes the dictionary; values json can not
+            # serialize are still handed to its `default`
+            return obj.encoder.encode(json_encoders.encode(obj))
+        return obj.encoder.encode(obj)
+
+    def iter_encode(self, obj):
+        '''
+        :return: An iterable of string chunks that join to `encode(obj)`.
+        '''
+        if self._by_function(obj):
+            return iter((self.encode(obj),))
+        return obj.encoder.iterencode(obj)
+
+    def _by_function(self, obj):
+        # the document encoder is left to encode documents one event at a
+        # time, re-using the cached JSON of the events
+        return obj.encoder is not json_encoders.document_encoder and \
+            json_encoders.has_shared_encoder(obj)
+
+    def dumps_pretty(self, obj, indent=4, sort_keys=False):
+        '''
+        :return: The indented JSON of a dictionary, list or value.
+        '''
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+    def loads(self, text):
+        '''
+        :return: The value of a JSON string or bytes.
+        '''
+        return json.loads(text)
+
+    def iter_encoded_events(self, obj):
+        '''
+        Yields the JSON of each event of a document in the order the
+        document encoders list them.  The cached JSON of template events
+        is re-used.
+        '''
+        dumps = self.dumps
+        for event, function in json_encoders.iter_document_events(obj):
+            if function is json_encoders.encode_template_event and \
+                    hasattr(event, 'fragment_dict'):
+                yield event._json_fragment(self.name, False)
+            else:
+                yield dumps(function(event))
+
+    def iter_encode_lines(self, obj):
+        '''
+        :return: A generator of the JSON of each event of a document, one
+            event per line (NDJSON).
+        '''
+        for event in self.iter_encoded_events(obj):
+            yield event + '\n'
+
+
+class OrjsonBackend(StdlibJSONBackend):
+    '''
+    Serializes the dictionaries of the encoders with `orjson`.  Raises an
+    ImportError when `orjson` is not installed.
+    '''
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self.loads = orjson.loads
+        self._option = orjson.OPT_NON_STR_KEYS
+        self._indent = orjson.OPT_INDENT_2
+        self._sort_keys = orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj):
+        return self._dumps(obj, option=self._option).decode('utf-8')
+
+    def encode(self, obj):
+        return self.dumps(json_encoders.encode_object(obj))
+
+    def iter_encode(self, obj):
+        if obj.encoder is not json_encoders.document_encoder:
+            return iter((self.encode(obj),))
+        return json_encoders.iter_encode_document(
+            obj, self.dumps, ',', ':', self.iter_encoded_events(obj))
+
+    def dumps_pretty(self, obj, indent=4, sort_keys=False):
+        if indent != 2:
+            return super().dumps_pretty(obj, indent, sort_keys)
+        option = self._option | self._indent
+        if sort_keys:
+            option |= self._sort_keys
+        return self._dumps(obj, option=option).decode('utf-8')
+
+
+_backends = {
+    'json': StdlibJSONBackend,
+    'orjson': OrjsonBackend,
+}
+_instances = {}
+_lock = threading.Lock()
+
+
+def register_json_backend(name: str, backend):
+    '''
+    Registers a JSON backend under the given name.
+    :param name: The name passed to the `backend` parameter of the JSON
+        render methods or set as `EPCPyYes.JSON_BACKEND`.
+    :param backend: A backend instance or a class creating one on first
+        use- a class may raise an ImportError when its dependencies are
+        missing.
+    '''
+    if name == AUTO:
+        raise ValueError('The %s backend can not be replaced.' % name)
+    with _lock:
+        _backends[name] = backend
+        _instances.pop(name, None)
+        _instances.pop(AUTO, None)
+
+
+def _create(name):
+    try:
+        backend = _backends[name]
+    except KeyError:
+        raise ValueError('Unknown JSON backend %r.  Available backends '
+                         'are: %s' % (name, ', '.join(
+                             [AUTO] + sorted(_backends))))
+    return backend() if isinstance(backend, type) else backend
+
+
+def get_json_backend(name: str = None):
+    '''
+    Returns the backend registered under the given name.
+    :param name: The backend name.  The default is `EPCPyYes.JSON_BACKEND`.
+    :return: A backend instance.
+    '''
+    name = name or EPCPyYes.JSON_BACKEND
+    try:
+        return _instances[name]
+    except KeyError:
+        pass
+    if name == AUTO:
+        try:
+            backend = _create('orjson')
+        except ImportError:
+            backend = _create('json')
+    else:
+        backend = _create(name)
+    with _lock:
+        return _instances.setdefault(name, backend)
+
+
+def available_json_backends():
+    '''
+    :return: The names of the registered backends that can be used- the
+        backends whose dependencies are installed.
+    '''
+    names = []
+    for name in sorted(_backends):
+        try:
+            get_json_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
@@ -12,14 +12,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # Copyright 2019 SerialLab Corp.  All rights reserved.
-from uuid import uuid4
+import codecs
 from EPCPyYes.core.v1_2.events import QuantityElement, ErrorDeclaration, \
     Source, SourceDest, Destination, BusinessTransaction, \
     InstanceLotMasterDataAttribute
 from EPCPyYes.core.v1_2.template_events import AggregationEvent, ObjectEvent, \
-    TransactionEvent, TransformationEvent
+    TransactionEvent, TransformationEvent, EPCISEventListDocument
+from EPCPyYes.core.SBDH import sbdh
+from EPCPyYes.core.ids import LAZY_ID
 from json import JSONDecoder, decoder, loads
-from collections import namedtuple
+from EPCPyYes.core.v1_2 import json_backends, parallel
 
 
 class ChildQuantityMixin:
@@ -28,20 +30,17 @@ class ChildQuantityMixin:
     types.
     """
     def decode_child_quantity_list(self, child_quantity_list):
-        ret = []
-        if child_quantity_list:
-            for child_quantity in child_quantity_list:
-                child_quantity = namedtuple('Quantity', child_quantity.keys())(
-                    *child_quantity.values()
-                )
-                ret.append(
-                    QuantityElement(
-                        epc_class=getattr(child_quantity, 'epcClass'),
-                        quantity=getattr(child_quantity, 'quantity'),
-                        uom=getattr(child_quantity, 'uom')
-                    )
-                )
-        return ret
+        if not child_quantity_list:
+            return []
+        # the known keys are mapped straight onto the QuantityElements
+        return [
+            QuantityElement(
+                epc_class=child_quantity['epcClass'],
+                quantity=child_quantity.get('quantity'),
+                uom=child_quantity.get('uom')
+            )
+            for child_quantity in child_quantity_list
+        ]
 
 
 class ErrorDeclarationMixin:
@@ -50,14 +49,11 @@ class ErrorDeclarationMixin:
     """
     def decode_error_declaration(self, error_declaration):
         if error_declaration:
-            error_declaration = namedtuple(
-                'ErrorDeclaration', error_declaration.keys()) \
-                (*error_declaration.values())
             return ErrorDeclaration(
-                declaration_time=error_declaration.declarationTime,
-                reason=error_declaration.reason,
-                corrective_event_ids=getattr(error_declaration,
-                                             'correctiveEventIDs'),
+                declaration_time=error_declaration['declarationTime'],
+                reason=error_declaration.get('reason'),
+                corrective_event_ids=error_declaration.get(
+                    'correctiveEventIDs') or [],
             )
 
 
@@ -127,7 +123,35 @@ class ILMDMixin:
             return ret
 
 
+class EventDecoderMixin:
+    """
+    Holds the payload of the event decoders.  The payload is optional so
+    a single decoder instance can decode any number of events with the
+    `decode` method of each decoder, which creates the event of the
+    values under the top-level key of a payload and keeps no state
+    between calls.
+    """
+    key = None
+    """
+    The top-level key of the JSON of the decoded event type.
+    """
+
+    def __init__(self, payload=None) -> None:
+        if payload is None:
+            return
+        if isinstance(payload, str):
+            self.__dict__ = loads(payload)[self.key]
+        elif isinstance(payload, dict):
+            self.__dict__ = payload[self.key]
+        else:
+            raise TypeError('Input payload must be a string or a dictionary.')
+
+    def get_event(self):
+        return self.decode(self.__dict__)
+
+
 class ObjectEventDecoder(
+    EventDecoderMixin,
     ChildQuantityMixin,
     ErrorDeclarationMixin,
     SourceListMixin,
@@ -149,50 +173,46 @@ class ObjectEventDecoder(
         objevent = ObjectEventDecoder(data).get_event()
 
     """
-    def __init__(self, payload: dict) -> None:
-        if isinstance(payload, str):
-            self.__dict__ = loads(payload)['objectEvent']
-        elif isinstance(payload, dict):
-            self.__dict__ = payload['objectEvent']
-        else:
-            raise TypeError('Input payload must be a string or a dictionary.')
+    key = 'objectEvent'
 
-    def get_event(self):
+    def decode(self, values: dict):
+        get = values.get
         obj_event = ObjectEvent(
-            self.eventTime,
-            getattr(self, 'eventTimezoneOffset'),
-            getattr(self, 'recordTime', None),
-            self.action,
-            epc_list=getattr(self, 'epcList', []),
+            values['eventTime'],
+            get('eventTimezoneOffset'),
+            get('recordTime'),
+            values['action'],
+            epc_list=get('epcList', []),
             quantity_list=self.decode_child_quantity_list(
-                getattr(self, 'quantityList')
+                get('quantityList')
             ),
-            biz_step=getattr(self, 'bizStep'),
-            disposition=getattr(self, 'disposition'),
-            read_point=getattr(self, 'readPoint'),
-            biz_location=getattr(self, 'bizLocation'),
-            event_id=getattr(self, 'eventID'),
+            biz_step=get('bizStep'),
+            disposition=get('disposition'),
+            read_point=get('readPoint'),
+            biz_location=get('bizLocation'),
+            event_id=get('eventID'),
             error_declaration=self.decode_error_declaration(
-                getattr(self, 'errorDeclaration')
+                get('errorDeclaration')
             ),
             source_list=self.decode_source_list(
-                getattr(self, 'sourceList')
+                get('sourceList')
             ),
             destination_list=self.decode_destination_list(
-                getattr(self, 'destinationList')
+                get('destinationList')
             ),
             business_transaction_list=self.decode_business_transaction_list(
-                getattr(self, 'bizTransactionList')
+                get('bizTransactionList')
             ),
             ilmd=self.decode_ilmd(
-                getattr(self, 'ilmd')
+                get('ilmd')
             )
         )
-        obj_event.id = str(uuid4())
+        obj_event.id = LAZY_ID
         return obj_event
 
 
 class AggregationEventDecoder(
+    EventDecoderMixin,
     ChildQuantityMixin,
     ErrorDeclarationMixin,
     SourceListMixin,
@@ -213,48 +233,44 @@ class AggregationEventDecoder(
         aggevent = AggregationEventDecoder(data).get_event()
 
     """
-    def __init__(self, payload: dict) -> None:
-        if isinstance(payload, str):
-            self.__dict__ = loads(payload)['aggregationEvent']
-        elif isinstance(payload, dict):
-            self.__dict__ = payload['aggregationEvent']
-        else:
-            raise TypeError('Input payload must be a string or a dictionary.')
+    key = 'aggregationEvent'
 
-    def get_event(self):
+    def decode(self, values: dict):
+        get = values.get
         agg_event = AggregationEvent(
-            self.eventTime,
-            getattr(self, 'eventTimezoneOffset'),
-            getattr(self, 'recordTime', None),
-            self.action,
-            parent_id=getattr(self, 'parentID', None),
-            child_epcs=getattr(self, 'childEPCs', []),
+            values['eventTime'],
+            get('eventTimezoneOffset'),
+            get('recordTime'),
+            values['action'],
+            parent_id=get('parentID'),
+            child_epcs=get('childEPCs', []),
             child_quantity_list=self.decode_child_quantity_list(
-                getattr(self, 'childQuantityList')
+                get('childQuantityList')
             ),
-            biz_step=getattr(self, 'bizStep'),
-            disposition=getattr(self, 'disposition'),
-            read_point=getattr(self, 'readPoint'),
-            biz_location=getattr(self, 'bizLocation'),
-            event_id=getattr(self, 'eventID'),
+            biz_step=get('bizStep'),
+            disposition=get('disposition'),
+            read_point=get('readPoint'),
+            biz_location=get('bizLocation'),
+            event_id=get('eventID'),
             error_declaration=self.decode_error_declaration(
-                getattr(self, 'errorDeclaration')
+                get('errorDeclaration')
             ),
             source_list=self.decode_source_list(
-                getattr(self, 'sourceList')
+                get('sourceList')
             ),
             destination_list=self.decode_destination_list(
-                getattr(self, 'destinationList')
+                get('destinationList')
             ),
             business_transaction_list=self.decode_business_transaction_list(
-                getattr(self, 'bizTransactionList')
+                get('bizTransactionList')
             ),
         )
-        agg_event.id = str(uuid4())
+        agg_event.id = LAZY_ID
         return agg_event
 
 
 class TransactionEventDecoder(
+    EventDecoderMixin,
     ChildQuantityMixin,
     ErrorDeclarationMixin,
     SourceListMixin,
@@ -275,42 +291,513 @@ class TransactionEventDecoder(
         tevent = TransactionEventDecoder(data).get_event()
 
     """
-    def __init__(self, payload) -> None:
-        if isinstance(payload, str):
-            self.__dict__ = loads(payload)['transactionEvent']
-        elif isinstance(payload, dict):
-            self.__dict__ = payload['transactionEvent']
-        else:
-            raise TypeError('Input payload must be a string or a dictionary.')
+    key = 'transactionEvent'
 
-    def get_event(self):
+    def decode(self, values: dict):
+        get = values.get
         xact_event = TransactionEvent(
-            self.eventTime,
-            getattr(self, 'eventTimezoneOffset'),
-            getattr(self, 'recordTime', None),
-            self.action,
-            parent_id=getattr(self, 'parentID', None),
-            epc_list=getattr(self, 'epcList', []),
+            values['eventTime'],
+            get('eventTimezoneOffset'),
+            get('recordTime'),
+            values['action'],
+            parent_id=get('parentID'),
+            epc_list=get('epcList', []),
             quantity_list=self.decode_child_quantity_list(
-                getattr(self, 'quantityList')
+                get('quantityList')
             ),
-            biz_step=getattr(self, 'bizStep'),
-            disposition=getattr(self, 'disposition'),
-            read_point=getattr(self, 'readPoint'),
-            biz_location=getattr(self, 'bizLocation'),
-            event_id=getattr(self, 'eventID'),
+            biz_step=get('bizStep'),
+            disposition=get('disposition'),
+            read_point=get('readPoint'),
+            biz_location=get('bizLocation'),
+            event_id=get('eventID'),
             error_declaration=self.decode_error_declaration(
-                getattr(self, 'errorDeclaration')
+                get('errorDeclaration')
             ),
             source_list=self.decode_source_list(
-                getattr(self, 'sourceList')
+                get('sourceList')
             ),
             destination_list=self.decode_destination_list(
-                getattr(self, 'destinationList')
+                get('destinationList')
             ),
             business_transaction_list=self.decode_business_transaction_list(
-                getattr(self, 'bizTransactionList')
+                get('bizTransactionList')
             )
         )
-        xact_event.id = str(uuid4())
-        return xact_event
\ No newline at end of file
+        xact_event.id = LAZY_ID
+        return xact_event
+
+
+class TransformationEventDecoder(
+    EventDecoderMixin,
+    ChildQuantityMixin,
+    ErrorDeclarationMixin,
+    SourceListMixin,
+    DestinationListMixin,
+    BusinessTransactionListMixin,
+    ILMDMixin
+):
+    """
+    Will deserialize JSON structures generated by the EPCPyYes
+    render_json and render_pretty_json functions on the template_event
+    class.
+
+    Usage.
+
+    .. code-block: python
+
+        # returns an EPCPyYes.core.v1_2.template_events.TransformationEvent
+        tevent = TransformationEventDecoder(data).get_event()
+
+    """
+    key = 'transformationEvent'
+
+    def decode_cbv_value(self, value):
+        # the encoders write missing business steps and dispositions as
+        # the string None
+        return None if value == 'None' else value
+
+    def decode(self, values: dict):
+        get = values.get
+        xform_event = TransformationEvent(
+            values['eventTime'],
+            get('eventTimezoneOffset'),
+            get('recordTime'),
+            event_id=get('eventID'),
+            input_epc_list=get('inputEPCList', []),
+            input_quantity_list=self.decode_child_quantity_list(
+                get('inputQuantityList')
+            ),
+            output_epc_list=get('outputEPCList', []),
+            output_quantity_list=self.decode_child_quantity_list(
+                get('outputQuantityList')
+            ),
+            transformation_id=get('transformationID'),
+            biz_step=self.decode_cbv_value(get('bizStep')),
+            disposition=self.decode_cbv_value(get('disposition')),
+            read_point=get('readPoint'),
+            biz_location=get('bizLocation'),
+            business_transaction_list=self.decode_business_transaction_list(
+                get('bizTransactionList')
+            ),
+            source_list=self.decode_source_list(
+                get('sourceList')
+            ),
+            destination_list=self.decode_destination_list(
+                get('destinationList')
+            ),
+            ilmd=self.decode_ilmd(
+                get('ilmd')
+            ),
+            error_declaration=self.decode_error_declaration(
+                get('errorDeclaration')
+            )
+        )
+        xform_event.id = LAZY_ID
+        return xform_event
+
+
+EVENT_DECODERS = {
+    'objectEvent': ObjectEventDecoder,
+    'aggregationEvent': AggregationEventDecoder,
+    'transactionEvent': TransactionEventDecoder,
+    'transformationEvent': TransformationEventDecoder,
+}
+'''
+The decoder of each event by the top-level key of its JSON.
+'''
+
+
+def iter_decode_ndjson(lines, backend: str = None, decoders: dict = None):
+    '''
+    Decodes JSON Lines (NDJSON)- one event per line, as written by
+    `render_ndjson`- to template events.  Each line is parsed and decoded
+    as it is pulled, so files of any size are read in constant memory:
+
+    .. code-block:: python
+
+        with open('events.ndjson', 'rb') as f:
+            for event in iter_decode_ndjson(f):
+                ...
+
+    :param lines: A file opened in binary or text mode (a `gzip.open`
+        file, say) or any iterable of lines.  Blank lines are skipped.
+    :param backend: The name of the JSON backend parsing the lines (see
+        `EPCPyYes.core.v1_2.json_backends`).
+    :param decoders: A dictionary of top-level keys and decoder classes.
+        The default is `EVENT_DECODERS`.
+    :return: A generator of template events.
+    '''
+    loads = json_backends.get_json_backend(backend).loads
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        yield decode_event(loads(line), decoders, 'Line %d' % number)
+
+
+def decode_event(payload: dict, decoders: dict = None, where='The payload'):
+    '''
+    Decodes an event dictionary with the decoder of its top-level key.
+    :param payload: A dictionary with a single key- `objectEvent`, say.
+    :param decoders: A dictionary of top-level keys and decoder classes.
+        The default is `EVENT_DECODERS`.
+    :param where: Names the payload in the error message.
+    :return: A template event.
+    '''
+    decoders = EVENT_DECODERS if decoders is None else decoders
+    decoder = None
+    if isinstance(payload, dict) and len(payload) == 1:
+        key, = payload
+        decoder = decoders.get(key)
+    if decoder is None:
+        raise ValueError('%s is not a single event with one of the keys '
+                         '%s.' % (where, ', '.join(decoders)))
+    return _shared_decoder(decoder).decode(payload[key])
+
+
+_shared_decoders = {}
+
+
+def _shared_decoder(cls):
+    # decoders keep no state between calls to decode, so one instance of
+    # each class decodes every event of its type
+    try:
+        return _shared_decoders[cls]
+    except KeyError:
+        decoder = _shared_decoders[cls] = cls()
+        return decoder
+
+
+DEFAULT_BATCH_SIZE = 256
+'''
+The number of payloads `decode_events` sends to a worker at a time.
+'''
+
+
+def _decode_batch(payloads, decoders=None, backend=None, offset=0):
+    '''
+    Decodes a batch of payloads to a list of template events.  Runs in the
+    worker processes of `decode_events`.
+    '''
+    loads = None
+    events = []
+    for number, payload in enumerate(payloads, offset + 1):
+        if isinstance(payload, (str, bytes, bytearray)):
+            if loads is None:
+                loads = json_backends.get_json_backend(backend).loads
+            payload = loads(payload)
+        events.append(decode_event(payload, decoders,
+                                   'Payload %d' % number))
+    return events
+
+
+def decode_events(payloads, decoders: dict = None, workers=None,
+                  backend: str = None, batch_size=DEFAULT_BATCH_SIZE,
+                  window: int = None):
+    '''
+    Decodes any mix of object, aggregation, transaction and
+    transformation event payloads to template events.  Every payload is
+    dispatched on its top-level key to one shared decoder per event type:
+
+    .. code-block:: python
+
+        events = list(decode_events(payloads))
+        # decoded in four worker processes
+        events = list(decode_events(payloads, workers=4))
+
+    :param payloads: An iterable of event dictionaries or of their JSON as
+        strings or bytes- `{"objectEvent": {...}}`, say.
+    :param decoders: A dictionary of top-level keys and decoder classes.
+        The default is `EVENT_DECODERS`.  Classes passed with `workers`
+        must be importable by the worker processes.
+    :param workers: The number of worker processes or a
+        `concurrent.futures.Executor` to submit batches of payloads to.
+        The default decodes in this process.  Only a bounded window of
+        batches is in flight at any time and the events keep the order of
+        the payloads.
+    :param backend: The name of the JSON backend parsing string payloads
+        (see `EPCPyYes.core.v1_2.json_backends`).
+    :param batch_size: The number of payloads sent to a worker at a time.
+    :param window: The number of batches in flight.  The default is twice
+        `workers` (see `EPCPyYes.core.v1_2.parallel.iter_in_pool`).
+    :return: A generator of template events.
+    '''
+    if workers is None:
+        loads = json_backends.get_json_backend(backend).loads
+        for number, payload in enumerate(payloads, 1):
+            if isinstance(payload, (str, bytes, bytearray)):
+                payload = loads(payload)
+            yield decode_event(payload, decoders, 'Payload %d' % number)
+        return
+
+    def arguments():
+        offset = 0
+        for batch in parallel.batches(payloads, batch_size):
+            yield batch, decoders, backend, offset
+            offset += len(batch)
+
+    for events in parallel.iter_in_pool(_decode_batch, arguments(), workers,
+                                        window):
+        yield from events
+
+
+class StandardBusinessDocumentHeaderDecoder:
+    """
+    Deserializes the JSON of an SBDH header, as written by the
+    `StandardBusinessDocumentHeaderEncoder`, to an
+    `EPCPyYes.core.SBDH.sbdh.StandardBusinessDocumentHeader`.
+
+    .. code-block: python
+
+        header = StandardBusinessDocumentHeaderDecoder(data).get_header()
+
+    """
+    def __init__(self, payload) -> None:
+        if isinstance(payload, str):
+            payload = loads(payload)
+        elif not isinstance(payload, dict):
+            raise TypeError('Input payload must be a string or a dictionary.')
+        self.__dict__ = payload
+
+    def decode_partner(self, partner):
+        partner_id = partner.get('partnerID')
+        return sbdh.Partner(
+            sbdh.PartnerType(partner.get('partnerType')),
+            sbdh.PartnerIdentification(
+                partner_id.get('authority'), partner_id.get('value')
+            ) if partner_id else None,
+            contact=partner.get('contact'),
+            email_address=partner.get('emailAddress'),
+            fax_number=partner.get('faxNumber'),
+            telephone_number=partner.get('telephoneNumber'),
+            contact_type_identifier=partner.get('contactTypeIdentifier')
+        )
+
+    def decode_document_identification(self, identification):
+        if not identification:
+            return None
+        document_type = identification.get('documentType')
+        try:
+            document_type = sbdh.DocumentType(document_type)
+        except ValueError:
+            pass
+        # the encoders write the multiple type under this spelling
+        multiple_type = identification.get('mutlipleType',
+                                           identification.get('multipleType'))
+        if isinstance(multiple_type, str):
+            multiple_type = multiple_type.lower() == 'true'
+        return sbdh.DocumentIdentification(
+            standard=identification.get('standard'),
+            type_version=identification.get('typeVersion'),
+            instance_identifier=identification.get('instanceIdentifier'),
+            document_type=document_type,
+            multiple_type=multiple_type,
+            creation_date_and_time=identification.get('creationDateAndTime')
+        )
+
+    def get_header(self):
+        return sbdh.StandardBusinessDocumentHeader(
+            namespace=getattr(self, 'namespace', 'sbdh'),
+            schema_location=getattr(self, 'schemaLocation', None),
+            document_identification=self.decode_document_identification(
+                getattr(self, 'documentIdentification', None)
+            ),
+            partners=[self.decode_partner(partner) for partner in
+                      getattr(self, 'partners', None) or []]
+        )
+
+
+DEFAULT_CHUNK_SIZE = 2 ** 16
+'''
+The number of characters (or bytes) read from the stream at a time.
+'''
+
+
+class EPCISDocumentDecoder:
+    """
+    Decodes the JSON of a whole EPCIS document- as written by
+    `render_json` or `render_json_to`- from a file-like object one event
+    at a time.  The stream is read in chunks into a sliding buffer and
+    each event is parsed from it as it is pulled, so only the current
+    event is ever held as a dictionary:
+
+    .. code-block: python
+
+        with open('document.json', 'rb') as f:
+            decoder = EPCISDocumentDecoder(f)
+            header = decoder.read_header()
+            for event in decoder:
+                ...
+        print(decoder.created_date)
+
+    The events are dispatched to `EVENT_DECODERS` by their top-level key.
+    The header is available once the parser has passed it- it is written
+    before the events, so `read_header` parses up to the first event-
+    and the created date once the events have been read.  A decoder can
+    be iterated once.
+    """
+    def __init__(self, stream, decoders: dict = None,
+                 chunk_size=DEFAULT_CHUNK_SIZE) -> None:
+        '''
+        :param stream: A file opened in binary (UTF-8) or text mode.
+        :param decoders: A dictionary of top-level keys and decoder
+            classes.  The default is `EVENT_DECODERS`.
+        :param chunk_size: The amount read from the stream at a time.
+        '''
+        self.header = None
+        self.created_date = None
+        self._stream = stream
+        self._decoders = decoders
+        self._chunk_size = chunk_size
+        self._text = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._raw_decode = JSONDecoder().raw_decode
+        self._events = self._iter_events()
+        self._first = None
+
+    def _read(self, size=None):
+        '''
+        Appends the next chunk of the stream to the buffer, dropping what
+        has been parsed.  Returns False at the end of the stream.
+        :param size: The amount to read.  The default is the chunk size.
+        '''
+        if self._eof:
+            return False
+        data = self._stream.read(size or self._chunk_size)
+        if self._text is None:
+            self._text = isinstance(data, str) or \
+                codecs.getincrementaldecoder('utf-8')()
+        if self._text is not True:
+            data = self._text.decode(data, final=not data)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _next_char(self):
+        '''
+        Skips whitespace and returns the next character without consuming
+        it- an empty string at the end of the stream.
+        '''
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in ' \t\n\r':
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buffer[pos]
+            if not self._read():
+                return ''
+
+    def _expect(self, characters):
+        char = self._next_char()
+        if char not in characters or not char:
+            raise decoder.JSONDecodeError(
+                'Expecting %s' % ' or '.join(repr(c) for c in characters),
+                self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _value(self):
+        '''
+        Parses the next JSON value, reading more of the stream until the
+        buffer holds all of it.  Each read at least doubles the unparsed
+        part of the buffer, so a value larger than the chunk size is
+        parsed a logarithmic number of times rather than once per chunk.
+        '''
+        self._next_char()
+        while True:
+            try:
+                value, end = self._raw_decode(self._buffer, self._pos)
+            except decoder.JSONDecodeError:
+                if not self._read(self._grow_size()):
+                    raise
+                continue
+            # a number may continue in the next chunk
+            if end < len(self._buffer) or not self._read():
+                self._pos = end
+                return value
+
+    def _grow_size(self):
+        return max(self._chunk_size, len(self._buffer) - self._pos)
+
+    def _iter_events(self):
+        self._expect('{')
+        if self._next_char() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise decoder.JSONDecodeError('Expecting a property name',
+                                              self._buffer, self._pos)
+            self._expect(':')
+            if key == 'events':
+                yield from self._iter_event_list()
+            elif key == 'header':
+                header = self._value()
+                self.header = StandardBusinessDocumentHeaderDecoder(
+                    header).get_header() if header else None
+            elif key == 'createdDate':
+                self.created_date = self._value()
+            else:
+                self._value()
+            if self._expect(',}') == '}':
+                return
+
+    def _iter_event_list(self):
+        self._expect('[')
+        if self._next_char() == ']':
+            self._pos += 1
+            return
+        decoders = self._decoders
+        number = 0
+        while True:
+            number += 1
+            yield decode_event(self._value(), decoders,
+                               'Event %d' % number)
+            if self._expect(',]') == ']':
+                return
+
+    def read_header(self):
+        '''
+        Parses the document up to its first event.
+        :return: The SBDH header or None if the document has none.
+        '''
+        if self._first is None:
+            self._first = next(self._events, False)
+        return self.header
+
+    def __iter__(self):
+        if self._first is None:
+            self._first = next(self._events, False)
+        if self._first is not False:
+            first, self._first = self._first, False
+            yield first
+        yield from self._events
+
+    def document(self, **kwargs):
+        '''
+        :param kwargs: Passed to the `EPCISEventListDocument` constructor.
+        :return: An `EPCISEventListDocument` with the header and the events
+            of the decoder.  The events are decoded as the document is
+            rendered, so it can be rendered once.  The created date is
+            set when the events have been read, in time for the JSON
+            encoders which write it last.
+        '''
+        self.read_header()
+        kwargs.setdefault('header', self.header)
+        document = EPCISEventListDocument(None, **kwargs)
+
+        def events():
+            yield from self
+            if self.created_date:
+                document.created_date = self.created_date
+
+        document.template_events = events()
+        return document
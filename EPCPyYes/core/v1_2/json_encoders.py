@@ -38,7 +38,7 @@ class JSONFormatMixin:
         :param sort_keys: Default of False.
         :return: A formatted JSON string indented and (potentially) sorted.
         '''
-        return json.dumps(self.encoder.default(self), indent=indent,
+        return json.dumps(self.render_dict(), indent=indent,
                           sort_keys=sort_keys)
 
     def render_json(self):
@@ -53,7 +53,7 @@ class JSONFormatMixin:
         Will return the python dictionary rendered by the JSON encoder.
         :return: A dictionary.
         '''
-        return self.encoder.default(self)
+        return encode_object(self)
 
 
 class SourceListJSONEncoder(JSONEncoder):
@@ -63,16 +63,316 @@ class SourceListJSONEncoder(JSONEncoder):
         }
 
 
+# The encoding functions below are stateless and shared by every encoder
+# instance, event and document.  The encoder classes further down wrap
+# them for `json.JSONEncoder` compatibility.
+
+def encode_date(value):
+    '''
+    If a datetime object is supplied will convert to iso 8601 string,
+    if not will just use the string
+    '''
+    return value.isoformat().replace(' ', 'Z') \
+        if isinstance(value, datetime) else value
+
+
+def encode_quantity_list(quantity_list: QList):
+    if quantity_list:
+        return [{"epcClass": item.epc_class,
+                 "quantity": item.quantity,
+                 "uom": item.uom}
+                for item in quantity_list]
+    return {}
+
+
+def encode_error_declaration(error_declaration: events.ErrorDeclaration):
+    if error_declaration:
+        return {
+            "declarationTime": error_declaration.declaration_time,
+            "reason": error_declaration.reason,
+            "correctiveEventIDs": [id for id in
+                                   error_declaration.corrective_event_ids]
+        }
+
+
+def encode_source_list(o):
+    if o.source_list:
+        return {item.type: item.source for item in o.source_list}
+    return {}
+
+
+def encode_destination_list(o):
+    if o.destination_list:
+        return {item.type: item.destination for item in o.destination_list}
+    return {}
+
+
+def encode_business_transaction_list(o):
+    if o.business_transaction_list:
+        return {str(bt.biz_transaction): str(bt.type) for bt in
+                o.business_transaction_list}
+    return {}
+
+
+def encode_ilmd_list(o):
+    if o.ilmd:
+        return {str(item.name): item.value for item in o.ilmd}
+    return {}
+
+
+def encode_event_fields(o: events.EPCISEvent, id=None):
+    '''
+    :return: The fields all EPCIS events share.
+    '''
+    return {
+        'id': o.id if id is None else id,
+        'eventID': o.event_id,
+        'eventTime': o.event_time,
+        'eventTimezoneOffset': o.event_timezone_offset,
+        'recordTime': encode_date(o.record_time) if o.record_time else None,
+        'errorDeclaration': encode_error_declaration(o.error_declaration),
+    }
+
+
+def encode_business_event_fields(o: events.EPCISBusinessEvent, id=None):
+    '''
+    :return: The fields shared by object, aggregation and transaction
+        events.
+    '''
+    ret = encode_event_fields(o, id)
+    ret['action'] = o.action
+    ret['disposition'] = o.disposition
+    ret['bizStep'] = o.biz_step
+    ret['readPoint'] = o.read_point
+    ret['bizLocation'] = o.biz_location
+    ret['sourceList'] = encode_source_list(o)
+    ret['destinationList'] = encode_destination_list(o)
+    ret['bizTransactionList'] = encode_business_transaction_list(o)
+    return ret
+
+
+def encode_object_event(o: events.ObjectEvent):
+    ret = encode_business_event_fields(o, str(o.id))
+    ret['epcList'] = [epc for epc in o.epc_list]
+    ret['ilmd'] = encode_ilmd_list(o)
+    ret['quantityList'] = encode_quantity_list(o.quantity_list)
+    return {'objectEvent': ret}
+
+
+def encode_aggregation_event(o: events.AggregationEvent):
+    ret = encode_business_event_fields(o)
+    ret['parentID'] = o.parent_id
+    ret['childEPCs'] = [epc for epc in o.child_epcs]
+    ret['childQuantityList'] = encode_quantity_list(o.child_quantity_list)
+    return {'aggregationEvent': ret}
+
+
+def encode_transaction_event(o: events.TransactionEvent):
+    ret = encode_business_event_fields(o)
+    ret['parentID'] = o.parent_id
+    ret['epcList'] = [epc for epc in o.epc_list]
+    ret['quantityList'] = encode_quantity_list(o.quantity_list)
+    return {'transactionEvent': ret}
+
+
+def encode_transformation_event(o: events.TransformationEvent):
+    ret = encode_event_fields(o)
+    ret['inputEPCList'] = [epc for epc in o.input_epc_list]
+    ret['inputQuantityList'] = encode_quantity_list(o.input_quantity_list)
+    ret['outputEPCList'] = [epc for epc in o.output_epc_list]
+    ret['outputQuantityList'] = encode_quantity_list(o.output_quantity_list)
+    ret['transformationID'] = o.transformation_id
+    ret['bizStep'] = str(o.biz_step)
+    ret['bizLocation'] = o.biz_location
+    ret['disposition'] = str(o.disposition)
+    ret['readPoint'] = o.read_point
+    ret['bizTransactionList'] = encode_business_transaction_list(o)
+    ret['sourceList'] = encode_source_list(o)
+    ret['destinationList'] = encode_destination_list(o)
+    ret['ilmd'] = encode_ilmd_list(o)
+    return {'transformationEvent': ret}
+
+
+def encode_partner_identification(o: sbdh.PartnerIdentification):
+    if o:
+        return {
+            "authority": o.authority,
+            "value": o.value
+        }
+    return {}
+
+
+def encode_partner(o: sbdh.Partner):
+    return {
+        "partnerType": str(o.partner_type),
+        "partnerID": encode_partner_identification(o.partner_id),
+        "contact": o.contact,
+        "emailAddress": o.email_address,
+        "faxNumber": o.fax_number,
+        "telephoneNumber": o.telephone_number,
+        "contactTypeIdentifier": o.contact_type_identifier
+    }
+
+
+def encode_document_identification(o: sbdh.DocumentIdentification):
+    return {
+        "standard": o.standard,
+        "typeVersion": o.type_version,
+        "instanceIdentifier": o.instance_identifier,
+        "documentType": str(o.document_type),
+        "mutlipleType": str(
+            o.multiple_type).lower() if o.multiple_type else None,
+        "creationDateAndTime": encode_date(o.creation_date_and_time)
+        if o.creation_date_and_time else None
+    }
+
+
+def encode_sbdh(o: sbdh.StandardBusinessDocumentHeader):
+    return {
+        "namespace": o.namespace,
+        "schemaLocation": o.schema_location,
+        "documentIdentification": encode_document_identification(
+            o.document_identification),
+        "partners": [encode_partner(partner) for partner in o.partners]
+    }
+
+
+def encode_template_event(event):
+    '''
+    Encodes an event of an event list document with its own encoder,
+    re-using the dictionary template events already cached (see
+    `TemplateMixin.fragment_dict`).
+    '''
+    if hasattr(event, 'fragment_dict'):
+        return event.fragment_dict(False)
+    return encode(event)
+
+
+def iter_document_events(o: events.EPCISDocument):
+    '''
+    Yields the events of a document in the order they are encoded along
+    with their encoding functions.
+    '''
+    for event_list, function in (
+            (o.object_events, encode_object_event),
+            (o.aggregation_events, encode_aggregation_event),
+            (o.transaction_events, encode_transaction_event),
+            (o.transformation_events, encode_transformation_event)):
+        for event in event_list or ():
+            yield event, function
+    if hasattr(o, 'template_events'):
+        for event in o.template_events:
+            yield event, encode_template_event
+
+
+def encode_document(o: events.EPCISDocument):
+    ret = {}
+    if o.header:
+        ret["header"] = encode_sbdh(o.header)
+    ret["events"] = [function(event) for event, function in
+                     iter_document_events(o)]
+    ret["createdDate"] = encode_date(o.created_date) \
+        if o.created_date else None
+    return ret
+
+
+def iter_encode_document(o: events.EPCISDocument, dumps,
+                         item_separator=', ', key_separator=': ',
+                         encoded_events=None):
+    '''
+    Encodes an EPCIS document piece by piece: the header, then each event
+    as it is pulled from the document and then the created date.  The
+    joined chunks are identical to `dumps(encode_document(o))` for
+    serializers writing the given separators.
+    :param o: The document.
+    :param dumps: The function serializing the dictionaries to strings.
+    :param item_separator: The separator written between items.
+    :param key_separator: The separator written between keys and values.
+    :param encoded_events: An iterable of the JSON of each event.  The
+        default serializes the dictionaries of `iter_document_events`.
+    :return: A generator of string chunks.
+    '''
+    if encoded_events is None:
+        encoded_events = (dumps(function(event))
+                          for event, function in iter_document_events(o))
+    yield '{'
+    if o.header:
+        yield '"header"' + key_separator
+        yield dumps(encode_sbdh(o.header))
+        yield item_separator
+    yield '"events"' + key_separator + '['
+    first = True
+    for event in encoded_events:
+        if first:
+            first = False
+            yield event
+        else:
+            yield item_separator + event
+    yield ']' + item_separator + '"createdDate"' + key_separator
+    yield dumps(encode_date(o.created_date) if o.created_date else None)
+    yield '}'
+
+
+ENCODERS = {
+    events.ObjectEvent: encode_object_event,
+    events.AggregationEvent: encode_aggregation_event,
+    events.TransactionEvent: encode_transaction_event,
+    events.TransformationEvent: encode_transformation_event,
+    events.EPCISDocument: encode_document,
+    sbdh.StandardBusinessDocumentHeader: encode_sbdh,
+    sbdh.DocumentIdentification: encode_document_identification,
+    sbdh.Partner: encode_partner,
+    sbdh.PartnerIdentification: encode_partner_identification,
+}
+'''
+The encoding function of each EPCPyYes type.  Subclasses- the template
+events, for example- use the function of their closest registered base
+class.  Use `register_encoder` to add or replace functions.
+'''
+
+_dispatch = {}
+
+
+def register_encoder(cls: type, function):
+    '''
+    Registers the function that encodes instances of a class (and its
+    subclasses) to a JSON-serializable dictionary.
+    '''
+    ENCODERS[cls] = function
+    _dispatch.clear()
+
+
+def encoder_for(cls: type):
+    '''
+    :return: The encoding function for a class.
+    :raises TypeError: If no function is registered for the class or its
+        bases.
+    '''
+    function = _dispatch.get(cls)
+    if function is None:
+        for base in cls.__mro__:
+            function = ENCODERS.get(base)
+            if function is not None:
+                break
+        else:
+            raise TypeError('Object of type %s is not JSON serializable'
+                            % cls.__name__)
+        _dispatch[cls] = function
+    return function
+
+
+def encode(o):
+    '''
+    Encodes any registered EPCPyYes object to a JSON-serializable
+    dictionary.
+    '''
+    function = _dispatch.get(type(o)) or encoder_for(type(o))
+    return function(o)
+
+
 class QuantityMixin:
     def get_quantity_list(self, list: QList):
-        if list:
-            ret = [{"epcClass": item.epc_class,
-                    "quantity": item.quantity,
-                    "uom": item.uom}
-                   for item in list]
-        else:
-            ret = {}
-        return ret
+        return encode_quantity_list(list)
 
 
 class DateHelperMixin:
@@ -82,8 +382,7 @@ class DateHelperMixin:
     '''
 
     def get_date(self, value):
-        return value.isoformat().replace(' ', 'Z') \
-            if isinstance(value, datetime) else value
+        return encode_date(value)
 
 
 class ErrorDeclarationMixin:
@@ -93,13 +392,7 @@ class ErrorDeclarationMixin:
 
     def get_error_declaration(self,
                               error_declaration: events.ErrorDeclaration):
-        if error_declaration:
-            return {
-                "declarationTime": error_declaration.declaration_time,
-                "reason": error_declaration.reason,
-                "correctiveEventIDs": [id for id in
-                                       error_declaration.corrective_event_ids]
-            }
+        return encode_error_declaration(error_declaration)
 
 
 class ListMixin:
@@ -114,11 +407,7 @@ class ListMixin:
         :param o:
         :return: A dictionary of source values.
         '''
-        if o.source_list:
-            ret = {item.type: item.source for item in o.source_list}
-        else:
-            ret = {}
-        return ret
+        return encode_source_list(o)
 
     def get_destination_list(self, o):
         '''
@@ -126,11 +415,7 @@ class ListMixin:
         :param o:
         :return: A dictionary of destination values.
         '''
-        if o.destination_list:
-            ret = {item.type: item.destination for item in o.destination_list}
-        else:
-            ret = {}
-        return ret
+        return encode_destination_list(o)
 
     def get_business_transaction_list(self, o):
         '''
@@ -138,12 +423,7 @@ class ListMixin:
         :param o:
         :return: A dictionary of BT values.
         '''
-        if o.business_transaction_list:
-            ret = {str(bt.biz_transaction): str(bt.type) for bt in
-                   o.business_transaction_list}
-        else:
-            ret = {}
-        return ret
+        return encode_business_transaction_list(o)
 
     def get_ilmd_list(self, o):
         '''
@@ -151,11 +431,7 @@ class ListMixin:
         :param o:
         :return: A dictionary of ILMD values.
         '''
-        if o.ilmd:
-            ret = {str(item.name): item.value for item in o.ilmd}
-        else:
-            ret = {}
-        return ret
+        return encode_ilmd_list(o)
 
 
 class EPCISEventEncoder(JSONEncoder, ErrorDeclarationMixin,
@@ -166,17 +442,7 @@ class EPCISEventEncoder(JSONEncoder, ErrorDeclarationMixin,
     '''
 
     def default(self, o: events.EPCISEvent):
-        record_time = self.get_date(o.record_time) if o.record_time else None
-        ret = {
-            'id': o.id,
-            'eventID': o.event_id,
-            'eventTime': o.event_time,
-            'eventTimezoneOffset': o.event_timezone_offset,
-            'recordTime': record_time,
-            'errorDeclaration': self.get_error_declaration(
-                o.error_declaration),
-        }
-        return ret
+        return encode_event_fields(o)
 
 
 class EPCISBusinessEventEncoder(EPCISEventEncoder, ListMixin):
@@ -193,22 +459,7 @@ class EPCISBusinessEventEncoder(EPCISEventEncoder, ListMixin):
         :return: An EPCPyYes.core.v1_2.events.EPCISBusinessEvent instance.
         '''
         if isinstance(o, events.EPCISBusinessEvent):
-            ret = super(EPCISBusinessEventEncoder, self).default(o)
-            ret.update(
-                {
-
-                    'action': o.action,
-                    'disposition': o.disposition,
-                    'bizStep': o.biz_step,
-                    'readPoint': o.read_point,
-                    'bizLocation': o.biz_location,
-                    'sourceList': self.get_source_list(o),
-                    'destinationList': self.get_destination_list(o),
-                    'bizTransactionList': \
-                        self.get_business_transaction_list(o)
-                }
-            )
-            return ret
+            return encode_business_event_fields(o)
 
 
 class ObjectEventEncoder(EPCISBusinessEventEncoder, ListMixin):
@@ -218,18 +469,9 @@ class ObjectEventEncoder(EPCISBusinessEventEncoder, ListMixin):
     '''
 
     def default(self, o):
+        # other values json can not serialize are written as null
         if isinstance(o, events.ObjectEvent):
-            ret = super(ObjectEventEncoder,
-                        self).default(o)
-            ret.update(
-                {
-                    'epcList': [epc for epc in o.epc_list],
-                    'ilmd': self.get_ilmd_list(o),
-                    'quantityList': self.get_quantity_list(o.quantity_list),
-                    'id': str(o.id)
-                }
-            )
-            return {'objectEvent': ret}
+            return encode_object_event(o)
 
 
 class AggregationEventEncoder(EPCISBusinessEventEncoder):
@@ -239,16 +481,7 @@ class AggregationEventEncoder(EPCISBusinessEventEncoder):
     '''
 
     def default(self, o: events.AggregationEvent):
-        ret = super().default(o)
-        ret.update(
-            {
-                "parentID": o.parent_id,
-                "childEPCs": [epc for epc in o.child_epcs],
-                "childQuantityList": self.get_quantity_list(
-                    o.child_quantity_list)
-            }
-        )
-        return {'aggregationEvent': ret}
+        return encode_aggregation_event(o)
 
 
 class TransactionEventEncoder(EPCISBusinessEventEncoder):
@@ -258,15 +491,7 @@ class TransactionEventEncoder(EPCISBusinessEventEncoder):
     '''
 
     def default(self, o: events.TransactionEvent):
-        ret = super().default(o)
-        ret.update(
-            {
-                "parentID": o.parent_id,
-                "epcList": [epc for epc in o.epc_list],
-                "quantityList": self.get_quantity_list(o.quantity_list)
-            }
-        )
-        return {"transactionEvent": ret}
+        return encode_transaction_event(o)
 
 
 class TransformationEventEncoder(EPCISEventEncoder, ListMixin):
@@ -277,28 +502,7 @@ class TransformationEventEncoder(EPCISEventEncoder, ListMixin):
     '''
 
     def default(self, o: events.TransformationEvent):
-        ret = super(TransformationEventEncoder, self).default(o)
-        ret.update(
-            {
-                "inputEPCList": [epc for epc in o.input_epc_list],
-                "inputQuantityList": self.get_quantity_list(
-                    o.input_quantity_list),
-                "outputEPCList": [epc for epc in o.output_epc_list],
-                "outputQuantityList": self.get_quantity_list(
-                    o.output_quantity_list),
-                "transformationID": o.transformation_id,
-                "bizStep": str(o.biz_step),
-                "bizLocation": o.biz_location,
-                "disposition": str(o.disposition),
-                "readPoint": o.read_point,
-                "bizLocation": o.biz_location,
-                "bizTransactionList": self.get_business_transaction_list(o),
-                "sourceList": self.get_source_list(o),
-                "destinationList": self.get_destination_list(o),
-                "ilmd": self.get_ilmd_list(o)
-            }
-        )
-        return {"transformationEvent": ret}
+        return encode_transformation_event(o)
 
 
 class PartnerIdentificationEncoder(JSONEncoder):
@@ -307,89 +511,107 @@ class PartnerIdentificationEncoder(JSONEncoder):
     '''
 
     def default(self, o: sbdh.PartnerIdentification):
-        if o:
-            ret = {
-                "authority": o.authority,
-                "value": o.value
-            }
-        else:
-            ret = {}
-        return ret
+        return encode_partner_identification(o)
 
 
 class PartnerEncoder(JSONEncoder):
     def default(self, o: sbdh.Partner):
-        pije = PartnerIdentificationEncoder()
-        ret = {
-            "partnerType": str(o.partner_type),
-            "partnerID": pije.default(o.partner_id),
-            "contact": o.contact,
-            "emailAddress": o.email_address,
-            "faxNumber": o.fax_number,
-            "telephoneNumber": o.telephone_number,
-            "contactTypeIdentifier": o.contact_type_identifier
-        }
-        return ret
+        return encode_partner(o)
 
 
 class DocumentIdentificationEncoder(JSONEncoder, DateHelperMixin):
     def default(self, o: sbdh.DocumentIdentification):
-        if o.creation_date_and_time:
-            creation_date_and_time = self.get_date(o.creation_date_and_time)
-        else:
-            creation_date_and_time = None
-        ret = {
-            "standard": o.standard,
-            "typeVersion": o.type_version,
-            "instanceIdentifier": o.instance_identifier,
-            "documentType": str(o.document_type),
-            "mutlipleType": str(
-                o.multiple_type).lower() if o.multiple_type else None,
-            "creationDateAndTime": creation_date_and_time
-        }
-        return ret
+        return encode_document_identification(o)
 
 
 class StandardBusinessDocumentHeaderEncoder(JSONEncoder):
     def default(self, o: sbdh.StandardBusinessDocumentHeader):
-        dije = DocumentIdentificationEncoder()
-        pe = PartnerEncoder()
-        ret = {
-            "namespace": o.namespace,
-            "schemaLocation": o.schema_location,
-            "documentIdentification": dije.default(o.document_identification),
-            "partners": [pe.default(partner) for partner in o.partners]
-        }
-        return ret
+        return encode_sbdh(o)
 
 
 class EPCISDocumentEncoder(JSONEncoder, DateHelperMixin):
     def default(self, o: events.EPCISDocument):
-        if o.created_date:
-            created_date = self.get_date(o.created_date)
-        else:
-            created_date = None
-        sbdh = StandardBusinessDocumentHeaderEncoder()
-        obj = ObjectEventEncoder()
-        agg = AggregationEventEncoder()
-        trans = TransformationEventEncoder()
-        xact = TransactionEventEncoder()
-        ret = {}
-        if o.header:
-            ret["header"] = sbdh.default(o.header)
-        ret["events"] = self.list_events(o.object_events, obj) + \
-                        self.list_events(o.aggregation_events, agg) + \
-                        self.list_events(o.transaction_events, xact) + \
-                        self.list_events(o.transformation_events, trans)
-        if hasattr(o,'template_events'):
-            ret["events"] += self.list_template_events(o.template_events)
-
-        ret["createdDate"] = created_date
-        return ret
+        return encode_document(o)
+
+    def iterencode(self, o, _one_shot=False):
+        '''
+        Encodes EPCIS documents piece by piece: the header, then each
+        event as it is pulled from the document and then the created
+        date, so the events of a large document are never all held in
+        memory as dictionaries.  The joined chunks are identical to
+        `json.dumps(self.default(o))`.  Encoders configured with an
+        `indent` or `sort_keys` encode the whole document at once.
+        '''
+        if not isinstance(o, events.EPCISDocument) or \
+                self.indent is not None or self.sort_keys:
+            return super().iterencode(o, _one_shot)
+        return self._iterencode_document(o)
+
+    def _iterencode_document(self, o):
+        return iter_encode_document(o, self.encode, self.item_separator,
+                                    self.key_separator,
+                                    self.iter_encoded_events(o))
+
+    def iter_encoded_events(self, o: events.EPCISDocument):
+        '''
+        Yields the JSON of each event of a document in the order `default`
+        lists them.  The cached JSON of template events is re-used when
+        this encoder writes the same format as their own encoders.
+        '''
+        cached = self.item_separator == ', ' and \
+            self.key_separator == ': ' and self.ensure_ascii and \
+            self.allow_nan and not self.skipkeys
+        encode = self.encode
+        for event, function in iter_document_events(o):
+            if cached and function is encode_template_event and \
+                    hasattr(event, 'fragment_dict'):
+                yield event._json_fragment('json', False)
+            else:
+                yield encode(function(event))
 
     def list_events(self, event_list, encoder):
         return [encoder.default(event) for event in event_list] or []
 
     def list_template_events(self, template_events):
-        return [event.encoder.default(event) for event in template_events]
+        '''
+        Encodes the events of an event list document.  The cached
+        dictionaries of template events are re-used when they have them
+        (see `TemplateMixin.fragment_dict`).
+        '''
+        return [encode_template_event(event) for event in template_events]
 
+
+object_event_encoder = ObjectEventEncoder()
+aggregation_event_encoder = AggregationEventEncoder()
+transaction_event_encoder = TransactionEventEncoder()
+transformation_event_encoder = TransformationEventEncoder()
+sbdh_encoder = StandardBusinessDocumentHeaderEncoder()
+document_encoder = EPCISDocumentEncoder()
+'''
+Shared encoder instances.  The encoders keep no state between calls so
+every template event and document of a type uses the same instance.
+'''
+
+_shared_encoders = {id(encoder) for encoder in (
+    object_event_encoder, aggregation_event_encoder,
+    transaction_event_encoder, transformation_event_encoder, sbdh_encoder,
+    document_encoder)}
+
+
+def has_shared_encoder(o):
+    '''
+    :return: True if the object uses one of the shared encoder instances,
+        which encode just like the functions of `ENCODERS`.
+    '''
+    return id(o.encoder) in _shared_encoders
+
+
+def encode_object(o):
+    '''
+    Encodes an object of the template classes to a JSON-serializable
+    dictionary.  Objects using a shared encoder are encoded by `encode`;
+    the encoder of an object that was given its own is respected.
+    '''
+    if id(o.encoder) in _shared_encoders:
+        return encode(o)
+    return o.encoder.default(o)
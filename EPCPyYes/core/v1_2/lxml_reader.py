@@ -0,0 +1,364 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Reads EPCIS 1.2 XML documents back into template events.  The document
+is parsed with `lxml.etree.iterparse` and every event element is turned
+into an `ObjectEvent`, `AggregationEvent`, `TransactionEvent` or
+`TransformationEvent` and cleared as soon as it has been read, so files
+of any size are read in constant memory:
+
+.. code-block:: python
+
+    from EPCPyYes.core.v1_2.lxml_reader import EPCISReader
+
+    with open('shipment.xml', 'rb') as f:
+        reader = EPCISReader(f)
+        for event in reader:
+            ...
+    print(reader.header, reader.created_date)
+
+TransformationEvents wrapped in `<extension>` elements are read in
+place.  The SBDH header becomes an
+`EPCPyYes.core.SBDH.sbdh.StandardBusinessDocumentHeader`; it is set once
+the parser has passed it, which `read_header` forces.  `document()`
+wraps the reader in an `EPCISEventListDocument` whose events are pulled
+from the file as it is rendered, which converts XML to JSON (or back to
+XML) without ever holding the events in memory.
+'''
+import inspect
+
+from lxml import etree
+
+from EPCPyYes.core.v1_2 import events
+from EPCPyYes.core.v1_2 import template_events
+from EPCPyYes.core.v1_2.CBV import instance_lot_master_data
+from EPCPyYes.core.v1_2.lxml_writer import CBVMD_NAMESPACE
+from EPCPyYes.core.SBDH import sbdh
+
+SBDH_NAMESPACE = ('http://www.unece.org/cefact/namespaces/'
+                  'StandardBusinessDocumentHeader')
+SBDH_TAG = '{%s}StandardBusinessDocumentHeader' % SBDH_NAMESPACE
+
+EVENT_CLASSES = {
+    'ObjectEvent': template_events.ObjectEvent,
+    'AggregationEvent': template_events.AggregationEvent,
+    'TransactionEvent': template_events.TransactionEvent,
+    'TransformationEvent': template_events.TransformationEvent,
+}
+'''
+The template event class created for each event element.
+'''
+
+
+def _text(element):
+    text = element.text
+    return text.strip() if text else text
+
+
+def _number(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except (TypeError, ValueError):
+            pass
+    return text
+
+
+def _id(element):
+    for child in element:
+        if child.tag == 'id':
+            return _text(child)
+    return None
+
+
+def _epcs(element):
+    return [_text(epc) for epc in element if epc.tag == 'epc']
+
+
+def _quantities(element):
+    ret = []
+    for quantity_element in element:
+        values = {child.tag: _text(child) for child in quantity_element}
+        ret.append(events.QuantityElement(
+            values.get('epcClass'), _number(values.get('quantity')),
+            values.get('uom')))
+    return ret
+
+
+def _sources(element):
+    return [events.Source(child.get('type'), _text(child))
+            for child in element]
+
+
+def _destinations(element):
+    return [events.Destination(child.get('type'), _text(child))
+            for child in element]
+
+
+def _business_transactions(element):
+    return [events.BusinessTransaction(_text(child), child.get('type'))
+            for child in element]
+
+
+def _ilmd(element):
+    ret = []
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        qname = etree.QName(child)
+        if qname.namespace == CBVMD_NAMESPACE:
+            ret.append(instance_lot_master_data.InstanceLotMasterDataAttribute(
+                qname.localname, _text(child)))
+        else:
+            ret.append(events.InstanceLotMasterDataAttribute(
+                child.tag, _text(child)))
+    return ret
+
+
+def _error_declaration(element):
+    values = {}
+    corrective_event_ids = []
+    for child in element:
+        if child.tag == 'correctiveEventIDs':
+            corrective_event_ids = [_text(event_id) for event_id in child]
+        else:
+            values[child.tag] = _text(child)
+    return events.ErrorDeclaration(values.get('declarationTime'),
+                                   values.get('reason'),
+                                   corrective_event_ids)
+
+
+FIELDS = {
+    'eventTime': ('event_time', _text),
+    'recordTime': ('record_time', _text),
+    'eventTimeZoneOffset': ('event_timezone_offset', _text),
+    'eventID': ('event_id', _text),
+    'errorDeclaration': ('error_declaration', _error_declaration),
+    'action': ('action', _text),
+    'parentID': ('parent_id', _text),
+    'epcList': ('epc_list', _epcs),
+    'childEPCs': ('child_epcs', _epcs),
+    'inputEPCList': ('input_epc_list', _epcs),
+    'outputEPCList': ('output_epc_list', _epcs),
+    'quantityList': ('quantity_list', _quantities),
+    'childQuantityList': ('child_quantity_list', _quantities),
+    'inputQuantityList': ('input_quantity_list', _quantities),
+    'outputQuantityList': ('output_quantity_list', _quantities),
+    'transformationID': ('transformation_id', _text),
+    'bizStep': ('biz_step', _text),
+    'disposition': ('disposition', _text),
+    'readPoint': ('read_point', _id),
+    'bizLocation': ('biz_location', _id),
+    'bizTransactionList': ('business_transaction_list',
+                           _business_transactions),
+    'sourceList': ('source_list', _sources),
+    'destinationList': ('destination_list', _destinations),
+    'ilmd': ('ilmd', _ilmd),
+}
+'''
+The constructor argument and the reading function of each element of
+an event.  The children of `baseExtension` and `extension` elements are
+read as if they were children of the event.
+'''
+
+WRAPPERS = ('baseExtension', 'extension')
+
+_parameters = {}
+
+
+def _accepted(cls):
+    try:
+        return _parameters[cls]
+    except KeyError:
+        accepted = _parameters[cls] = frozenset(
+            inspect.signature(cls.__init__).parameters)
+        return accepted
+
+
+def _read_fields(element, kwargs):
+    for child in element:
+        tag = child.tag
+        field = FIELDS.get(tag)
+        if field is not None:
+            kwargs[field[0]] = field[1](child)
+        elif tag in WRAPPERS:
+            _read_fields(child, kwargs)
+
+
+def read_event(element):
+    '''
+    Creates the template event of an event element.  Elements the event
+    class has no argument for are skipped.
+    :param element: An `ObjectEvent`, `AggregationEvent`,
+        `TransactionEvent` or `TransformationEvent` element.
+    :return: A template event.
+    '''
+    cls = EVENT_CLASSES[element.tag]
+    kwargs = {}
+    _read_fields(element, kwargs)
+    accepted = _accepted(cls)
+    return cls(**{name: value for name, value in kwargs.items()
+                  if name in accepted})
+
+
+def _partner(element, ns):
+    partner_id = None
+    contact = {}
+    for child in element:
+        if child.tag == ns + 'Identifier':
+            partner_id = sbdh.PartnerIdentification(child.get('Authority'),
+                                                    _text(child))
+        elif child.tag == ns + 'ContactInformation':
+            contact = {etree.QName(info).localname: _text(info)
+                       for info in child}
+    return sbdh.Partner(
+        sbdh.PartnerType(etree.QName(element).localname), partner_id,
+        contact.get('Contact'), contact.get('EmailAddress'),
+        contact.get('FaxNumber'), contact.get('TelephoneNumber'),
+        contact.get('ContactTypeIdentifier'))
+
+
+def _document_type(value):
+    try:
+        return sbdh.DocumentType(value)
+    except ValueError:
+        return value
+
+
+def read_header(element):
+    '''
+    Creates the header of a `StandardBusinessDocumentHeader` element.
+    :return: An `EPCPyYes.core.SBDH.sbdh.StandardBusinessDocumentHeader`.
+    '''
+    namespace = etree.QName(element).namespace
+    ns = '{%s}' % namespace
+    header_version = None
+    partners = []
+    identification = None
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        tag = etree.QName(child).localname
+        if tag == 'HeaderVersion':
+            header_version = _text(child)
+        elif tag in ('Sender', 'Receiver'):
+            partners.append(_partner(child, ns))
+        elif tag == 'DocumentIdentification':
+            values = {etree.QName(value).localname: _text(value)
+                      for value in child}
+            multiple_type = values.get('MultipleType')
+            if multiple_type is not None:
+                multiple_type = multiple_type.lower() == 'true'
+            identification = sbdh.DocumentIdentification(
+                values.get('Standard'), values.get('TypeVersion'),
+                values.get('InstanceIdentifier'),
+                _document_type(values.get('Type')), multiple_type,
+                values.get('CreationDateAndTime'))
+    return sbdh.StandardBusinessDocumentHeader(
+        element.prefix or 'sbdh', namespace, identification, partners,
+        header_version)
+
+
+class EPCISReader(object):
+    '''
+    Iterates over the events of an EPCIS 1.2 XML document.  A reader can
+    be iterated once.
+    '''
+
+    def __init__(self, source, huge_tree=True):
+        '''
+        :param source: A file name or a file opened in binary mode.
+        :param huge_tree: Allow text nodes and trees beyond libxml2's
+            default safety limits- partner files with millions of EPCs
+            need it.
+        '''
+        self.header = None
+        '''
+        The SBDH header once the parser has passed it.
+        '''
+        self.created_date = None
+        '''
+        The `creationDate` of the document element.
+        '''
+        self.schema_version = None
+        '''
+        The `schemaVersion` of the document element.
+        '''
+        self._source = source
+        self._huge_tree = huge_tree
+        self._events = self._iter_events()
+        self._first = None
+
+    def _iter_events(self):
+        context = etree.iterparse(
+            self._source, events=('end',),
+            tag=[SBDH_TAG] + list(EVENT_CLASSES),
+            remove_blank_text=True, remove_comments=True,
+            resolve_entities=False, no_network=True,
+            huge_tree=self._huge_tree)
+        root = None
+        for _, element in context:
+            if root is None:
+                root = element.getroottree().getroot()
+                self.created_date = root.get('creationDate')
+                self.schema_version = root.get('schemaVersion')
+            if element.tag == SBDH_TAG:
+                self.header = read_header(element)
+            else:
+                yield read_event(element)
+            # drop the element and everything read before it
+            element.clear()
+            node = element
+            while node is not root:
+                while node.getprevious() is not None:
+                    del node.getparent()[0]
+                node = node.getparent()
+
+    def read_header(self):
+        '''
+        Parses the document up to its first event.
+        :return: The SBDH header or None if the document has none.
+        '''
+        if self._first is None:
+            self._first = next(self._events, False)
+        return self.header
+
+    def __iter__(self):
+        if self._first is None:
+            self._first = next(self._events, False)
+        if self._first is not False:
+            first, self._first = self._first, False
+            yield first
+        yield from self._events
+
+    def document(self, **kwargs):
+        '''
+        :param kwargs: Passed to the `EPCISEventListDocument` constructor.
+        :return: An `EPCISEventListDocument` with the header, created date
+            and the events of the reader.  The events are read as the
+            document is rendered, so it can be rendered once.
+        '''
+        self.read_header()
+        kwargs.setdefault('header', self.header)
+        kwargs.setdefault('created_date', self.created_date)
+        return template_events.EPCISEventListDocument(self, **kwargs)
+
+
+def iter_events(source, huge_tree=True):
+    '''
+    :param source: A file name or a file opened in binary mode.
+    :return: A generator of the template events of an EPCIS document.
+    '''
+    return iter(EPCISReader(source, huge_tree))
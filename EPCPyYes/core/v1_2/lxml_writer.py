@@ -0,0 +1,391 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The `lxml` serializer backend.  Streams EPCIS 1.2 XML element by element
+with `lxml.etree.xmlfile` so a document of any size is written in
+constant memory and every value- including partner supplied ILMD data-
+is escaped by lxml.  Values that can not be represented in XML (control
+characters, for example) raise a `ValueError` instead of producing a
+broken document.
+
+Write a document straight to a file, socket file or file name:
+
+.. code-block:: python
+
+    from EPCPyYes.core.v1_2.lxml_writer import writer
+
+    with open('shipment.xml', 'wb') as f:
+        writer.write(document, f)
+
+or use it through the render methods with `backend='lxml'`.  The output
+is compact (no whitespace between elements).  ILMD attributes that are
+not CBV attributes are written with their `name` as given, so names in
+other namespaces must use the `{namespace}name` form.
+'''
+import codecs
+
+from lxml import etree
+
+from EPCPyYes.core.v1_2 import events
+from EPCPyYes.core.v1_2.xml_serializer import enum_value
+from EPCPyYes.core.SBDH import sbdh
+
+EPCIS_NAMESPACE = 'urn:epcglobal:epcis:xsd:1'
+CBVMD_NAMESPACE = 'urn:epcglobal:cbv:mda'
+DOCUMENT_TAG = '{%s}EPCISDocument' % EPCIS_NAMESPACE
+
+
+def leaf(xf, tag: str, value, attrib: dict = None):
+    # xf.element picks up the prefixes declared by the enclosing elements
+    with xf.element(tag, attrib):
+        xf.write(str(value))
+
+
+def epc_list(xf, tag: str, epcs):
+    with xf.element(tag):
+        # a single element is re-used so long lists cost no allocations
+        epc = etree.Element('epc')
+        for value in epcs or []:
+            epc.text = value
+            xf.write(epc)
+
+
+def quantity_list(xf, tag: str, quantity_elements):
+    with xf.element(tag):
+        for quantity_element in quantity_elements or []:
+            with xf.element('quantityElement'):
+                leaf(xf, 'epcClass', quantity_element.epc_class)
+                leaf(xf, 'quantity', quantity_element.quantity)
+                if quantity_element.uom:
+                    leaf(xf, 'uom', quantity_element.uom)
+
+
+def source_list(xf, sources):
+    with xf.element('sourceList'):
+        for source in sources:
+            leaf(xf, 'source', source.source, {'type': str(source.type)})
+
+
+def destination_list(xf, destinations):
+    with xf.element('destinationList'):
+        for destination in destinations:
+            leaf(xf, 'destination', destination.destination,
+                 {'type': str(destination.type)})
+
+
+def business_transaction_list(xf, business_transactions):
+    with xf.element('bizTransactionList'):
+        for bt in business_transactions:
+            attrib = {'type': str(enum_value(bt.type))} if bt.type else None
+            leaf(xf, 'bizTransaction', bt.biz_transaction, attrib)
+
+
+def ilmd(xf, attributes):
+    with xf.element('ilmd'):
+        for item in attributes:
+            if 'CBV' in item.__module__:
+                tag = '{%s}%s' % (CBVMD_NAMESPACE, enum_value(item.name))
+            else:
+                tag = str(item.name)
+            leaf(xf, tag, item.value)
+
+
+def event_times(xf, event: events.EPCISEvent):
+    leaf(xf, 'eventTime', event.event_time)
+    if event.record_time:
+        leaf(xf, 'recordTime', event.record_time)
+    if event.event_timezone_offset:
+        leaf(xf, 'eventTimeZoneOffset', event.event_timezone_offset)
+    if event.event_id or event.error_declaration:
+        with xf.element('baseExtension'):
+            if event.event_id:
+                leaf(xf, 'eventID', event.event_id)
+            declaration = event.error_declaration
+            if declaration:
+                with xf.element('errorDeclaration'):
+                    leaf(xf, 'declarationTime', declaration.declaration_time)
+                    if declaration.reason:
+                        leaf(xf, 'reason', declaration.reason)
+                    with xf.element('correctiveEventIDs'):
+                        for event_id in declaration.corrective_event_ids or []:
+                            leaf(xf, 'correctiveEventID', event_id)
+
+
+def business_data(xf, event: events.EPCISBusinessEvent, transactions=True):
+    action = getattr(event, 'action', None)
+    if action:
+        leaf(xf, 'action', enum_value(action))
+    if event.biz_step:
+        leaf(xf, 'bizStep', event.biz_step)
+    if event.disposition:
+        leaf(xf, 'disposition', event.disposition)
+    if event.read_point:
+        with xf.element('readPoint'):
+            leaf(xf, 'id', event.read_point)
+    if event.biz_location:
+        with xf.element('bizLocation'):
+            leaf(xf, 'id', event.biz_location)
+    if transactions and event.business_transaction_list:
+        business_transaction_list(xf, event.business_transaction_list)
+
+
+def extension(xf, quantities_tag=None, quantities=None, sources=None,
+              destinations=None, attributes=None):
+    if not (quantities or sources or destinations or attributes):
+        return
+    with xf.element('extension'):
+        if quantities:
+            quantity_list(xf, quantities_tag, quantities)
+        if sources:
+            source_list(xf, sources)
+        if destinations:
+            destination_list(xf, destinations)
+        if attributes:
+            ilmd(xf, attributes)
+
+
+def object_event(xf, event: events.ObjectEvent,
+                 nsmap: dict = None):
+    with xf.element('ObjectEvent', nsmap=nsmap):
+        event_times(xf, event)
+        epc_list(xf, 'epcList', event.epc_list)
+        business_data(xf, event)
+        extension(xf, 'quantityList', event.quantity_list, event.source_list,
+                  event.destination_list, event.ilmd)
+
+
+def aggregation_event(xf, event: events.AggregationEvent,
+                      nsmap: dict = None):
+    with xf.element('AggregationEvent', nsmap=nsmap):
+        event_times(xf, event)
+        if event.parent_id:
+            leaf(xf, 'parentID', event.parent_id)
+        epc_list(xf, 'childEPCs', event.child_epcs)
+        business_data(xf, event)
+        extension(xf, 'childQuantityList', event.child_quantity_list,
+                  event.source_list, event.destination_list)
+
+
+def transaction_event(xf, event: events.TransactionEvent,
+                      nsmap: dict = None):
+    with xf.element('TransactionEvent', nsmap=nsmap):
+        event_times(xf, event)
+        if event.business_transaction_list:
+            business_transaction_list(xf, event.business_transaction_list)
+        if event.parent_id:
+            leaf(xf, 'parentID', event.parent_id)
+        epc_list(xf, 'epcList', event.epc_list)
+        business_data(xf, event, transactions=False)
+        extension(xf, 'quantityList', event.quantity_list, event.source_list,
+                  event.destination_list)
+
+
+def transformation_event(xf, event: events.TransformationEvent,
+                         nsmap: dict = None):
+    with xf.element('TransformationEvent', nsmap=nsmap):
+        event_times(xf, event)
+        if event.input_epc_list:
+            epc_list(xf, 'inputEPCList', event.input_epc_list)
+        quantity_list(xf, 'inputQuantityList', event.input_quantity_list)
+        if event.output_epc_list:
+            epc_list(xf, 'outputEPCList', event.output_epc_list)
+        quantity_list(xf, 'outputQuantityList', event.output_quantity_list)
+        if event.transformation_id:
+            leaf(xf, 'transformationID', event.transformation_id)
+        business_data(xf, event)
+        if event.source_list:
+            source_list(xf, event.source_list)
+        if event.destination_list:
+            destination_list(xf, event.destination_list)
+        if event.ilmd:
+            ilmd(xf, event.ilmd)
+
+
+def header(xf, sbd_header: sbdh.StandardBusinessDocumentHeader,
+           nsmap: dict = None):
+    ns = '{%s}' % sbd_header.schema_location
+    with xf.element(ns + 'StandardBusinessDocumentHeader', nsmap=nsmap):
+        leaf(xf, ns + 'HeaderVersion', sbd_header.header_version)
+        for partner in sbd_header.partners or []:
+            with xf.element(ns + str(partner.partner_type)):
+                if partner.partner_id:
+                    leaf(xf, ns + 'Identifier', partner.partner_id.value,
+                         {'Authority': str(partner.partner_id.authority)})
+                if partner.has_contact_info:
+                    with xf.element(ns + 'ContactInformation'):
+                        for tag, value in (
+                                ('Contact', partner.contact),
+                                ('EmailAddress', partner.email_address),
+                                ('FaxNumber', partner.fax_number),
+                                ('TelephoneNumber',
+                                 partner.telephone_number),
+                                ('ContactTypeIdentifier',
+                                 partner.contact_type_identifier)):
+                            if value:
+                                leaf(xf, ns + tag, value)
+        identification = sbd_header.document_identification
+        with xf.element(ns + 'DocumentIdentification'):
+            for tag, value, required in (
+                    ('Standard', identification.standard, True),
+                    ('TypeVersion', identification.type_version, True),
+                    ('InstanceIdentifier',
+                     identification.instance_identifier, False),
+                    ('Type', identification.document_type, True),
+                    ('MultipleType', identification.multiple_type, False),
+                    ('CreationDateAndTime',
+                     identification.creation_date_and_time, False)):
+                if required or value:
+                    leaf(xf, ns + tag, value)
+
+
+class _Sink(object):
+    '''
+    A writable that collects what lxml writes until it is drained.
+    '''
+
+    def __init__(self):
+        self.data = []
+
+    def write(self, data):
+        self.data.append(data)
+
+    def drain(self):
+        data = b''.join(self.data)
+        self.data = []
+        return data
+
+
+class LXMLWriter(object):
+    '''
+    Writes events, SBDH headers and EPCIS documents with
+    `lxml.etree.xmlfile`.  Instances hold no state and can be shared
+    between threads.
+    '''
+
+    def __init__(self):
+        self.event_writers = {
+            events.EventType.Object: object_event,
+            events.EventType.Aggregation: aggregation_event,
+            events.EventType.Transaction: transaction_event,
+            events.EventType.Transformation: transformation_event,
+        }
+
+    def write(self, obj, output, encoding='utf-8'):
+        '''
+        Writes `obj` to `output` in constant memory.
+        :param obj: An event, SBDH header or EPCIS document.
+        :param output: A file name or a binary writable such as an open
+            file or socket file.
+        :param encoding: The output encoding.  Default is utf-8.
+        '''
+        with etree.xmlfile(output, encoding=encoding) as xf:
+            for _ in self.iter_write(xf, obj):
+                pass
+
+    def iter_serialize(self, obj):
+        '''
+        :param obj: An event, SBDH header or EPCIS document.
+        :return: A generator of string chunks- one per event for
+            documents.
+        '''
+        sink = _Sink()
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with etree.xmlfile(sink, encoding='utf-8') as xf:
+            for _ in self.iter_write(xf, obj):
+                xf.flush()
+                chunk = decoder.decode(sink.drain())
+                if chunk:
+                    yield chunk
+        chunk = decoder.decode(sink.drain(), final=True)
+        if chunk:
+            yield chunk
+
+    def iter_write(self, xf, obj):
+        '''
+        Writes `obj` to an open `xmlfile`, yielding after each event so
+        callers can flush the output as it is produced.
+        '''
+        if isinstance(obj, events.EPCISDocument):
+            yield from self.iter_document(xf, obj)
+        elif isinstance(obj, sbdh.StandardBusinessDocumentHeader):
+            header(xf, obj, {obj.namespace: obj.schema_location})
+            yield
+        else:
+            self.write_event(xf, obj, {'cbvmd': CBVMD_NAMESPACE})
+            yield
+
+    def write_event(self, xf, event, nsmap: dict = None):
+        '''
+        Writes a single event element.
+        :param nsmap: Namespace declarations for the event element; only
+            needed when the event is not written inside a document.
+        '''
+        try:
+            func = self.event_writers[event.event_type]
+        except (KeyError, AttributeError):
+            raise TypeError('Can not serialize %r to XML.' % event)
+        func(xf, event, nsmap)
+
+    def iter_events(self, xf, event_iterable, extension=False):
+        write_event = self.write_event
+        for event in event_iterable:
+            if extension or getattr(event, 'event_type', None) == \
+                    events.EventType.Transformation:
+                with xf.element('extension'):
+                    write_event(xf, event)
+            else:
+                write_event(xf, event)
+            yield
+
+    def iter_document(self, xf, document: events.EPCISDocument):
+        '''
+        Writes an `EPCISDocument` or `EPCISEventListDocument`.
+        TransformationEvents are each wrapped in an `extension` element.
+        '''
+        sbd_header = document.header
+        if document.render_xml_declaration:
+            xf.write_declaration(standalone=False)
+        nsmap = {'epcis': EPCIS_NAMESPACE, 'cbvmd': CBVMD_NAMESPACE}
+        if sbd_header:
+            nsmap[sbd_header.namespace] = sbd_header.schema_location
+        with xf.element(DOCUMENT_TAG, {'schemaVersion': '1.2',
+                                       'creationDate':
+                                           str(document.created_date)},
+                        nsmap=nsmap):
+            if sbd_header:
+                with xf.element('EPCISHeader'):
+                    header(xf, sbd_header)
+            with xf.element('EPCISBody'), xf.element('EventList'):
+                yield
+                template_events = getattr(document, 'template_events', None)
+                if template_events is not None:
+                    yield from self.iter_events(xf, template_events)
+                else:
+                    yield from self.iter_events(
+                        xf, document.object_events or [])
+                    yield from self.iter_events(
+                        xf, document.aggregation_events or [])
+                    yield from self.iter_events(
+                        xf, document.transaction_events or [])
+                yield from self.iter_events(
+                    xf, document.transformation_events or [],
+                    extension=True)
+        yield
+
+
+writer = LXMLWriter()
+'''
+The shared instance registered as the `lxml` backend.
+'''
@@ -0,0 +1,186 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Renders the events of an `EPCISEventListDocument` in a pool of worker
+processes.  Events are sent to the workers in batches, rendered there
+and the fragments are stitched between the document start and end in
+the original order.  Only a bounded window of batches is in flight at
+any time so documents built from generators are still rendered in
+constant memory.
+
+Use it through the document class:
+
+.. code-block:: python
+
+    xml = document.render(parallel=4)
+    document.render_to(f, workers=4)
+
+With the template backend each event is rendered with the
+`epcis/event_list_entry.xml` template, so document templates that
+override the `events` block are not used for the event list when
+rendering in parallel.
+'''
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+
+from EPCPyYes.core.v1_2 import backends
+from EPCPyYes.core.v1_2.environment import registry, compact_environment
+from EPCPyYes.core.v1_2.xml_serializer import serializer
+
+EVENT_LIST_ENTRY = 'epcis/event_list_entry.xml'
+'''
+The template that renders one event of the event list document.
+'''
+
+DEFAULT_BATCH_SIZE = 64
+'''
+The number of events sent to a worker at a time.
+'''
+
+_MARKER = '<!-- EPCPyYes parallel event list -->'
+
+
+class _Placeholder(object):
+    '''
+    Stands in for the event list while the document start and end are
+    rendered.
+    '''
+    event_type = None
+
+    def __init__(self, env):
+        self.template = env.from_string(_MARKER)
+
+
+def _render_batch(backend, env_key, events, compact=False):
+    '''
+    Renders a batch of events to the XML that goes between the document
+    start and end.  Runs in the worker processes.
+    '''
+    if backend == backends.TEMPLATE_BACKEND:
+        spec, options = env_key
+        template = registry.get_environment(
+            spec, **dict(options)).get_template(EVENT_LIST_ENTRY)
+        return ''.join([template.render(event=event, compact=compact)
+                        for event in events])
+    return ''.join(serializer.iter_events(events))
+
+
+def _template_document_ends(document, compact=False):
+    context = dict(document._template_context(compact),
+                   template_events=[_Placeholder(document._env)])
+    template = document.get_template(compact)
+    start, _, end = template.render(**context).partition(_MARKER)
+    return start, end
+
+
+def batches(items, batch_size):
+    '''
+    :return: A generator of lists of up to `batch_size` items.
+    '''
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+DEFAULT_WINDOW = 8
+'''
+The number of batches in flight when the work is submitted to an
+executor and no window is given.
+'''
+
+
+def iter_in_pool(function, arguments, workers, window: int = None):
+    '''
+    Calls `function` with each tuple of `arguments` in a pool of workers
+    and yields the results in the order of the arguments.  Only `window`
+    calls are in flight at any time, so the arguments may come from a
+    generator of any length.
+    :param function: A picklable (module level) function.
+    :param arguments: An iterable of argument tuples.
+    :param workers: The number of worker processes or a
+        `concurrent.futures.Executor` to submit the calls to.  A pool
+        created for a number of workers is shut down when done.
+    :param window: The number of calls in flight.  The default is twice
+        the number of workers, or `DEFAULT_WINDOW` for an executor.
+    :return: A generator of the results.
+    '''
+    own_executor = not isinstance(workers, Executor)
+    if window is None:
+        window = 2 * workers if own_executor else DEFAULT_WINDOW
+    executor = ProcessPoolExecutor(workers) if own_executor else workers
+    pending = deque()
+    try:
+        for args in arguments:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
+
+
+def iter_render_parallel(document, workers, backend: str = None,
+                         batch_size=DEFAULT_BATCH_SIZE, compact=False,
+                         window: int = None):
+    '''
+    Renders an `EPCISEventListDocument` with its events rendered in
+    worker processes.  The joined chunks are identical to the output of
+    `document.render(backend=backend)`.
+
+    :param document: An `EPCISEventListDocument`.  Its events must be
+        picklable (see `TemplateMixin.__getstate__`).
+    :param workers: The number of worker processes or a
+        `concurrent.futures.Executor` to submit the batches to.
+    :param backend: `template` (the default) or `fast`.
+    :param batch_size: The number of events sent to a worker at a time.
+    :param compact: Leave out the whitespace between elements.  Only
+        supported by the template backend.
+    :param window: The number of batches in flight (see `iter_in_pool`).
+    :return: A generator of string chunks.
+    '''
+    backend = backend or backends.TEMPLATE_BACKEND
+    if backend == backends.TEMPLATE_BACKEND:
+        env = compact_environment(document._env) if compact \
+            else document._env
+        env_key = registry.key_for(env)
+        if env_key is None:
+            raise ValueError('Parallel rendering needs a Jinja2 environment '
+                             'from the environment registry.')
+        start, end = _template_document_ends(document, compact)
+        end = [end]
+    elif compact:
+        raise ValueError('Compact output is only supported by the %s '
+                         'backend.' % backends.TEMPLATE_BACKEND)
+    elif backend == 'fast':
+        env_key = None
+        start = serializer.document_start(document)
+        end = serializer.iter_document_end(document)
+    else:
+        raise ValueError('The %s backend does not support parallel '
+                         'rendering.' % backend)
+    yield start
+    yield from iter_in_pool(
+        _render_batch, ((backend, env_key, batch, compact) for batch in
+                        batches(document.template_events, batch_size)),
+        workers, window)
+    yield from end
@@ -0,0 +1,467 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Opt-in profiling of the template rendering, the JSON encoders and the
+JSON decoders.  While the profiler is enabled it records the number of
+calls, the time spent, the characters produced and the number of EPCs
+handled for every event type, template and encoder/decoder part:
+
+.. code-block:: python
+
+    from EPCPyYes.core.v1_2 import profiling
+
+    with profiling.profile() as profiler:
+        document.render_to(f)
+    print(profiler.as_dict())
+    print(profiler.to_prometheus())
+
+The profiler works by swapping timed wrappers in for the profiled
+methods when it is enabled and putting the original methods back when
+it is disabled, so there is no cost at all while it is off.  The
+recorded operations are:
+
+* `render`- `TemplateMixin.render` and `iter_render`, and with it
+  `render_to`, by class name.
+* `render_json`- `TemplateMixin.render_json`, `render_pretty_json` and
+  `iter_render_json`, and with it `render_json_to`, by class name.
+* `event`- every event rendered by the template or `fast` backend, on
+  its own or inside a document, by class name.  Events a document takes
+  from the fragment cache are counted as well.
+* `template`- every template of the EPCPyYes environments (see
+  `EPCPyYes.core.v1_2.environment.EPCPyYesEnvironment`) and of the
+  template events rendered, by template name.  Included templates are
+  recorded on their own, so the time spent in the SBDH or the ILMD of a
+  document shows up under `epcis/sbdh.xml` and `epcis/ilmd.xml`.
+  Inlined includes (see
+  `EPCPyYes.core.v1_2.environment.InliningEnvironment`) are part of the
+  including template.
+* `encode`- the JSON encoding functions (see `json_encoders.ENCODERS`)
+  by the class of the encoded object.
+* `encode_part`- the list, quantity, error declaration and ILMD encoding
+  functions.
+* `parse` and `decode`- the JSON decoder constructors (which parse the
+  JSON) and their `decode` by decoder class.
+* `decode_part`- the `decode_*` helpers of the JSON decoders.
+
+Times are inclusive: the time of a document contains the time of its
+events and the time of a template contains that of its includes.  Cached
+fragments (see `EPCPyYes.CACHE_FRAGMENTS`) are counted as calls too.
+'''
+import functools
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+EPC_ATTRIBUTES = ('epc_list', 'child_epcs', 'input_epc_list',
+                  'output_epc_list')
+'''
+The event attributes holding EPCs that are counted by the profiler.
+'''
+
+
+PART_ENCODERS = ('encode_quantity_list', 'encode_error_declaration',
+                 'encode_source_list', 'encode_destination_list',
+                 'encode_business_transaction_list', 'encode_ilmd_list')
+'''
+The `json_encoders` functions recorded as `encode_part`.
+'''
+
+
+def _epc_count(obj):
+    count = 0
+    for attribute in EPC_ATTRIBUTES:
+        try:
+            count += len(getattr(obj, attribute, None) or ())
+        except TypeError:
+            pass
+    return count
+
+
+def _size(value):
+    return len(value) if isinstance(value, (str, bytes)) else 0
+
+
+def _timed_chunks(chunks, finished, elapsed=0.0):
+    '''
+    Yields the chunks of an iterable and calls `finished` with the time
+    spent producing them and their total size once it is exhausted or
+    closed.
+    '''
+    clock = time.perf_counter
+    chunks = iter(chunks)
+    size = 0
+    try:
+        while True:
+            start = clock()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                elapsed += clock() - start
+            size += len(chunk)
+            yield chunk
+    finally:
+        finished(elapsed, size)
+
+
+class RenderProfiler(object):
+    '''
+    Records the calls of the profiled methods while it is enabled.  Use
+    the module-level `profiler` instance.
+    '''
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._patches = []
+        self._templates = weakref.WeakKeyDictionary()
+        # the objects each thread is recording a `render` call for
+        self._local = threading.local()
+
+    def record(self, operation: str, name: str, seconds: float,
+               size: int = 0, epcs: int = 0):
+        '''
+        Adds a call to the statistics.
+
+        :param operation: The kind of call- `render`, `template`, ...
+        :param name: The class or template name.
+        :param seconds: The time the call took.
+        :param size: The number of characters produced.
+        :param epcs: The number of EPCs handled.
+        '''
+        key = (operation, name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0.0, 0, 0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += size
+            stats[3] += epcs
+
+    def reset(self):
+        '''
+        Drops the recorded statistics.
+        '''
+        with self._lock:
+            self._stats.clear()
+
+    def as_dict(self):
+        '''
+        :return: A dictionary of operations, each mapping the class or
+            template names to a dictionary with the `count`, `seconds`,
+            `bytes` (characters) and `epcs` recorded for them.
+        '''
+        ret = {}
+        with self._lock:
+            for (operation, name), stats in sorted(self._stats.items()):
+                ret.setdefault(operation, {})[name] = {
+                    'count': stats[0], 'seconds': stats[1],
+                    'bytes': stats[2], 'epcs': stats[3]}
+        return ret
+
+    def to_prometheus(self, prefix: str = 'epcpyyes'):
+        '''
+        :param prefix: The prefix of the metric names.
+        :return: The statistics in the Prometheus text exposition format.
+        '''
+        metrics = (
+            ('calls_total', 'count', 'Number of profiled calls.'),
+            ('seconds_total', 'seconds', 'Time spent in profiled calls.'),
+            ('bytes_total', 'bytes', 'Characters produced.'),
+            ('epcs_total', 'epcs', 'EPCs handled.'),
+        )
+        stats = self.as_dict()
+        lines = []
+        for metric, field, description in metrics:
+            metric = '%s_%s' % (prefix, metric)
+            lines.append('# HELP %s %s' % (metric, description))
+            lines.append('# TYPE %s counter' % metric)
+            for operation, names in stats.items():
+                for name, values in names.items():
+                    lines.append('%s{operation="%s",name="%s"} %r' % (
+                        metric, operation,
+                        name.replace('\\', '\\\\').replace('"', '\\"'),
+                        values[field]))
+        return '\n'.join(lines) + '\n'
+
+    def _timed(self, operation, function, name_of, result_size=True,
+               epcs_of=None):
+        record = self.record
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            result = function(*args, **kwargs)
+            elapsed = clock() - start
+            record(operation, name_of(args, result), elapsed,
+                   _size(result) if result_size else 0,
+                   _epc_count(epcs_of(args, result)) if epcs_of else 0)
+            return result
+        return timed
+
+    def _timed_template(self, template):
+        '''
+        Replaces the render function of a Jinja2 template with one that
+        records the time spent producing each chunk.  The template of an
+        event is recorded as an `event` too.
+        '''
+        if template in self._templates:
+            return
+        original = template.root_render_func
+        name = template.name or '<string>'
+        record = self.record
+
+        def finished(context, elapsed, size):
+            record('template', name, elapsed, size)
+            event = context.get('event')
+            event_template = getattr(event, '_template', None)
+            if event_template is template or (
+                    template.name is not None and
+                    getattr(event_template, 'name', None) == template.name):
+                record('event', type(event).__name__, elapsed, size,
+                       _epc_count(event))
+
+        def root_render_func(context):
+            return _timed_chunks(original(context),
+                                 functools.partial(finished, context))
+
+        self._templates[template] = original
+        template.root_render_func = root_render_func
+
+    def _active(self):
+        active = getattr(self._local, 'active', None)
+        if active is None:
+            active = self._local.active = set()
+        return active
+
+    def _timed_render(self, operation, render, chunked=False):
+        '''
+        Times the render methods of the template classes.  Templates
+        loaded before the profiler was enabled, or from other
+        environments, are timed from here on.  The calls a render method
+        makes on the same object- `render` iterating `iter_render`, say-
+        are not recorded again.
+        :param chunked: The method returns an iterable of chunks.
+        '''
+        timed_template = self._timed_template
+        record = self.record
+        active = self._active
+        clock = time.perf_counter
+
+        def finished(obj, elapsed, size):
+            record(operation, type(obj).__name__, elapsed, size,
+                   _epc_count(obj))
+
+        @functools.wraps(render)
+        def timed_render(obj, *args, **kwargs):
+            template = getattr(obj, '_template', None)
+            if template is not None:
+                timed_template(template)
+            key = (operation, id(obj))
+            rendering = active()
+            if key in rendering:
+                return render(obj, *args, **kwargs)
+            start = clock()
+            if chunked:
+                return _timed_chunks(render(obj, *args, **kwargs),
+                                     functools.partial(finished, obj),
+                                     clock() - start)
+            rendering.add(key)
+            try:
+                result = render(obj, *args, **kwargs)
+            finally:
+                rendering.discard(key)
+            finished(obj, clock() - start, _size(result))
+            return result
+        return timed_render
+
+    def _timed_cached_xml(self, cached_xml):
+        '''
+        Records the events documents take from the fragment cache and
+        times the templates of the others before they are included.
+        '''
+        timed_template = self._timed_template
+        record = self.record
+        clock = time.perf_counter
+
+        @functools.wraps(cached_xml)
+        def timed_cached_xml(obj, *args, **kwargs):
+            if obj._template is not None:
+                timed_template(obj._template)
+            start = clock()
+            xml = cached_xml(obj, *args, **kwargs)
+            if xml is not None:
+                record('event', type(obj).__name__, clock() - start,
+                       len(xml), _epc_count(obj))
+            return xml
+        return timed_cached_xml
+
+    def _patch(self, owner, attribute, replacement):
+        if attribute in owner.__dict__:
+            self._patches.append((
+                functools.partial(setattr, owner, attribute),
+                owner.__dict__[attribute]))
+        else:
+            # inherited- deleting the wrapper uncovers the base class's
+            self._patches.append((
+                lambda original: delattr(owner, attribute), None))
+        setattr(owner, attribute, replacement)
+
+    def _patch_item(self, mapping, key, replacement):
+        self._patches.append((functools.partial(mapping.__setitem__, key),
+                              mapping[key]))
+        mapping[key] = replacement
+
+    def _install(self):
+        from EPCPyYes.core.v1_2 import json_encoders, json_decoders
+        from EPCPyYes.core.v1_2.template_events import TemplateMixin
+        from EPCPyYes.core.v1_2.environment import EPCPyYesEnvironment, \
+            registry
+        from EPCPyYes.core.v1_2.xml_serializer import serializer
+
+        def class_name(args, result):
+            return type(args[0]).__name__
+
+        def first(args, result):
+            return args[0]
+
+        timed_template = self._timed_template
+        # only the EPCPyYes environments- other Jinja2 users in the
+        # process are left alone
+        get_template = EPCPyYesEnvironment.get_template
+
+        @functools.wraps(get_template)
+        def get_template_timed(*args, **kwargs):
+            template = get_template(*args, **kwargs)
+            timed_template(template)
+            return template
+
+        self._patch(EPCPyYesEnvironment, 'get_template',
+                    get_template_timed)
+        # the templates loaded before- documents include the templates of
+        # their events without looking them up
+        for env in registry.environments():
+            if env.cache is not None:
+                for template in list(env.cache.values()):
+                    timed_template(template)
+
+        for attribute, operation, chunked in (
+                ('render', 'render', False),
+                ('iter_render', 'render', True),
+                ('render_json', 'render_json', False),
+                ('render_pretty_json', 'render_json', False),
+                ('iter_render_json', 'render_json', True)):
+            self._patch(TemplateMixin, attribute, self._timed_render(
+                operation, TemplateMixin.__dict__[attribute], chunked))
+        self._patch(TemplateMixin, 'cached_xml', self._timed_cached_xml(
+            TemplateMixin.__dict__['cached_xml']))
+        self._patch(serializer, 'serialize_event', self._timed(
+            'event', serializer.serialize_event, class_name, epcs_of=first))
+
+        # the encoding functions are called through the dispatch table and
+        # by name from the other encoding functions.
+        for cls, function in list(json_encoders.ENCODERS.items()):
+            timed = self._timed('encode', function,
+                                lambda args, result: type(args[0]).__name__,
+                                result_size=False, epcs_of=first)
+            self._patch_item(json_encoders.ENCODERS, cls, timed)
+            if vars(json_encoders).get(function.__name__) is function:
+                self._patch(json_encoders, function.__name__, timed)
+        json_encoders._dispatch.clear()
+
+        for part in PART_ENCODERS:
+            self._patch(json_encoders, part, self._timed(
+                'encode_part', vars(json_encoders)[part],
+                functools.partial(lambda name, *_: name,
+                                  part[len('encode_'):]),
+                result_size=False))
+
+        for decoder in vars(json_decoders).values():
+            if not isinstance(decoder, type) or \
+                    decoder.__module__ != json_decoders.__name__:
+                continue
+            if 'get_event' in decoder.__dict__:
+                self._patch(decoder, '__init__', self._timed(
+                    'parse', decoder.__dict__['__init__'], class_name,
+                    result_size=False))
+            if 'decode' in decoder.__dict__ and \
+                    getattr(decoder, 'key', None) is not None:
+                self._patch(decoder, 'decode', self._timed(
+                    'decode', decoder.__dict__['decode'], class_name,
+                    result_size=False,
+                    epcs_of=lambda args, result: result))
+            for attribute in list(decoder.__dict__):
+                if attribute.startswith('decode_'):
+                    self._patch(decoder, attribute, self._timed(
+                        'decode_part', decoder.__dict__[attribute],
+                        functools.partial(lambda name, *_: name,
+                                          attribute[7:]),
+                        result_size=False))
+
+    def enable(self):
+        '''
+        Starts recording.  Enabling an enabled profiler does nothing.
+        '''
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+        self._install()
+
+    def disable(self):
+        '''
+        Stops recording and restores the original methods.  The recorded
+        statistics are kept until `reset` is called.
+        '''
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+        while self._patches:
+            restore, original = self._patches.pop()
+            restore(original)
+        from EPCPyYes.core.v1_2 import json_encoders
+        json_encoders._dispatch.clear()
+        for template, original in list(self._templates.items()):
+            template.root_render_func = original
+        self._templates.clear()
+
+
+profiler = RenderProfiler()
+'''
+The process-wide profiler.
+'''
+
+
+@contextmanager
+def profile(reset: bool = True):
+    '''
+    Enables the profiler for the duration of a `with` block.
+
+    :param reset: Drop the statistics recorded before.
+    :return: The profiler.
+    '''
+    if reset:
+        profiler.reset()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
@@ -0,0 +1,276 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Splits the events of an `EPCISEventListDocument` into a sequence of
+complete documents that stay within an event count and/or byte budget-
+for trading partners that reject files above a certain size.
+
+.. code-block:: python
+
+    for part in document.split(max_events=10000, max_bytes=5 * 2 ** 20):
+        part.render_to(f)
+
+Events are pulled from the document one at a time and each part holds
+only its own events, so a document built from a generator is split
+without ever materializing the whole event list.  The events keep the
+order the document renders them in as XML- its `transformation_events`
+follow its `template_events`.  Every part gets a copy
+of the document's SBDH header with a new
+`DocumentIdentification.instance_identifier`.
+'''
+from enum import Enum
+from itertools import chain
+
+from EPCPyYes.core.ids import LAZY_ID
+from EPCPyYes.core.v1_2 import backends
+from EPCPyYes.core.v1_2.environment import compact_environment
+from EPCPyYes.core.v1_2.events import EventType, Action
+from EPCPyYes.core.v1_2.parallel import EVENT_LIST_ENTRY
+from EPCPyYes.core.v1_2.xml_serializer import serializer
+
+
+class AggregationPolicy(Enum):
+    '''
+    Says whether an aggregation event may end up in a different document
+    than the commissioning events of its parent and children.
+    '''
+    split_anywhere = 'split_anywhere'
+    '''
+    Documents are split wherever the budget runs out.
+    '''
+    keep_with_commissioning = 'keep_with_commissioning'
+    '''
+    An aggregation event is never split from the commissioning
+    (ObjectEvent ADD) events of its parent and child EPCs in the same
+    document.  As the events are streamed the splitter can not know which
+    events are still to come, so documents are preferably ended where
+    every EPC commissioned in them has been aggregated, which keeps each
+    packing step- items into a case, say- together.  Multi-level
+    hierarchies are only kept together as long as they fit the budget.
+    A group of dependent events that does not fit the budget on its own
+    is written to a document of its own that exceeds the budget.
+    '''
+
+
+def _clone(obj):
+    '''
+    Shallow copies an object without pickling it- template classes can
+    only be pickled with registry environments.
+    '''
+    ret = object.__new__(type(obj))
+    ret.__dict__.update(obj.__dict__)
+    return ret
+
+
+def _new_header(header):
+    if header is None:
+        return None
+    header = _clone(header)
+    identification = _clone(header.document_identification)
+    identification.instance_identifier = LAZY_ID
+    header.document_identification = identification
+    return header
+
+
+def _commissioned_epcs(event):
+    if getattr(event, 'event_type', None) == EventType.Object and \
+            event.action in (Action.add, Action.add.value):
+        return event.epc_list or []
+    return []
+
+
+def _aggregated_epcs(event):
+    if getattr(event, 'event_type', None) == EventType.Aggregation:
+        epcs = list(event.child_epcs or [])
+        if event.parent_id:
+            epcs.append(event.parent_id)
+        return epcs
+    return []
+
+
+class _Part(object):
+    '''
+    The events collected for the next document along with their sizes
+    and the positions the document may be split at.
+    '''
+
+    def __init__(self, header, overhead):
+        self.header = header
+        self.overhead = overhead
+        self.events = []
+        self.sizes = []
+        self.size = overhead
+        # the (first, last) ranges of positions the part can not be split
+        # at without separating an aggregation from a commissioning event
+        # before it- merged and in order
+        self.unsafe = []
+        # closed[i] is True when every EPC commissioned before event i
+        # had been aggregated by then.
+        self.closed = []
+        self.commissioned = {}
+        self.open = set()
+
+    def dependency(self, event):
+        '''
+        :return: The position of the first commissioning event in this
+            part the event depends on or None.
+        '''
+        positions = [self.commissioned[epc] for epc in
+                     _aggregated_epcs(event) if epc in self.commissioned]
+        return min(positions) if positions else None
+
+    def add(self, event, size, dependency=None):
+        position = len(self.events)
+        self.events.append(event)
+        self.sizes.append(size)
+        self.size += size
+        self.closed.append(not self.open)
+        if dependency is not None:
+            # every range ends at the event that was added last, so a new
+            # one can only overlap the ranges at the end of the list
+            first = dependency + 1
+            while self.unsafe and self.unsafe[-1][1] >= first - 1:
+                first = min(first, self.unsafe.pop()[0])
+            self.unsafe.append((first, position))
+        self.open.difference_update(_aggregated_epcs(event))
+        for epc in _commissioned_epcs(event):
+            self.commissioned.setdefault(epc, position)
+            self.open.add(epc)
+
+    def split_point(self, dependency=None, keep=False):
+        '''
+        :param dependency: The position of the first event the next event
+            depends on.
+        :param keep: Prefer the positions where no commissioned EPC is
+            waiting for its aggregation.
+        :return: The last position the part can be split at, counting the
+            position after the last event, or 0 if there is none.
+        '''
+        last = len(self.events) if dependency is None else dependency
+        safe = [True] * len(self.events)
+        for first, end in self.unsafe:
+            safe[first:end + 1] = [False] * (end + 1 - first)
+        if keep and self.open:
+            for i in range(min(last, len(self.events) - 1), 0, -1):
+                if safe[i] and self.closed[i]:
+                    return i
+        if dependency is None:
+            return last
+        for i in range(last, 0, -1):
+            if safe[i]:
+                return i
+        return 0
+
+
+class DocumentSplitter(object):
+    '''
+    Splits an `EPCISEventListDocument` into documents within an event and
+    byte budget.  Use `EPCISEventListDocument.split`.
+    '''
+
+    def __init__(self, document, max_events: int = None,
+                 max_bytes: int = None,
+                 policy: AggregationPolicy = AggregationPolicy.split_anywhere,
+                 backend: str = None, compact=False, encoding='utf-8'):
+        '''
+        :param document: The `EPCISEventListDocument` to split.
+        :param max_events: The maximum number of events per document.
+        :param max_bytes: The maximum size of each rendered document in
+            bytes.  The size is measured for the given backend, compact
+            setting and encoding, so render the documents the same way.
+        :param policy: An `AggregationPolicy`.
+        :param backend: `template` (the default) or `fast`.
+        :param compact: Whether the documents will be rendered compact.
+        :param encoding: The encoding the documents will be written in.
+        '''
+        if not max_events and not max_bytes:
+            raise ValueError('Give max_events, max_bytes or both.')
+        backend = backend or backends.TEMPLATE_BACKEND
+        if backend not in (backends.TEMPLATE_BACKEND, 'fast') and max_bytes:
+            raise ValueError('Documents can only be split by size for the '
+                             'template and fast backends.')
+        self.document = document
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.policy = AggregationPolicy(policy)
+        self.backend = backend
+        self.compact = compact
+        self.encoding = encoding
+        if backend == backends.TEMPLATE_BACKEND:
+            env = compact_environment(document._env) if compact \
+                else document._env
+            self._entry = env.get_template(EVENT_LIST_ENTRY)
+
+    def _size(self, text):
+        return len(text.encode(self.encoding))
+
+    def event_size(self, event):
+        '''
+        :return: The number of bytes the event adds to a document.
+        '''
+        if not self.max_bytes:
+            return 0
+        if self.backend == backends.TEMPLATE_BACKEND:
+            return self._size(self._entry.render(event=event,
+                                                 compact=self.compact))
+        return self._size(''.join(serializer.iter_events([event])))
+
+    def document_for(self, events, header):
+        '''
+        :return: A copy of the document with the given events and header.
+        '''
+        document = _clone(self.document)
+        document._template_events = events
+        document._transformation_events = []
+        document._header = header
+        return document
+
+    def _new_part(self):
+        header = _new_header(self.document.header)
+        overhead = 0
+        if self.max_bytes:
+            overhead = self._size(self.document_for([], header).render(
+                backend=self.backend, compact=self.compact))
+        return _Part(header, overhead)
+
+    def _full(self, part, size):
+        return (self.max_events and
+                len(part.events) + 1 > self.max_events) or \
+               (self.max_bytes and part.size + size > self.max_bytes)
+
+    def __iter__(self):
+        keep = self.policy == AggregationPolicy.keep_with_commissioning
+        # the order the document template renders them in
+        events = chain(self.document.template_events,
+                       self.document.transformation_events)
+        part = self._new_part()
+        for event in events:
+            size = self.event_size(event)
+            dependency = part.dependency(event) if keep else None
+            if part.events and self._full(part, size):
+                split = part.split_point(dependency, keep)
+                if split:
+                    rest = list(zip(part.events[split:],
+                                    part.sizes[split:]))
+                    yield self.document_for(part.events[:split],
+                                            part.header)
+                    part = self._new_part()
+                    for pending, pending_size in rest:
+                        part.add(pending, pending_size,
+                                 part.dependency(pending) if keep else None)
+                    dependency = part.dependency(event) if keep else None
+            part.add(event, size, dependency)
+        if part.events:
+            yield self.document_for(part.events, part.header)
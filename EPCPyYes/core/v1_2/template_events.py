@@ -19,9 +19,16 @@ classes' `render` function, you can obtain the output of the Jinja2 template
 associated with the current class.  There are examples of this in the
 *Usage* section of this documentation.
 '''
-from typing import List
+import asyncio
+import functools
+import inspect
+import io
+import pickle
+from itertools import islice
+from typing import Iterable
 from datetime import datetime
 
+import EPCPyYes
 from EPCPyYes.core.v1_2 import events
 from EPCPyYes.core.v1_2.events import Action, ErrorDeclaration
 from EPCPyYes.core.v1_2.CBV.instance_lot_master_data import \
@@ -29,19 +36,222 @@ from EPCPyYes.core.v1_2.CBV.instance_lot_master_data import \
 from EPCPyYes.core.SBDH.sbdh import StandardBusinessDocumentHeader as sbdh
 from EPCPyYes.core.v1_2.json_encoders import JSONFormatMixin
 from EPCPyYes.core.v1_2 import json_encoders
-from jinja2 import Environment, PackageLoader
+from EPCPyYes.core.v1_2 import json_backends
+from EPCPyYes.core.v1_2 import backends
+from EPCPyYes.core.v1_2 import parallel
+from EPCPyYes.core.v1_2 import splitter
+from EPCPyYes.core.v1_2 import compression as compressors
+from EPCPyYes.core.v1_2.compression import DEFAULT_COMPRESSION_LEVEL
+from EPCPyYes.core.v1_2.environment import get_environment, registry, \
+    compact_environment
+from jinja2 import Environment
 
 
 def _load_default_environment():
     '''
-    Loads up the default Jinja2 environment so simple template names can
-    be passed in.
+    Returns the default Jinja2 environment so simple template names can
+    be passed in.  The environment is shared process-wide (see the
+    `EPCPyYes.core.v1_2.environment` module) so every template event
+    re-uses the same compiled templates.
 
-    :return: The defualt Jinja2 environment for this package.
+    :return: The default Jinja2 environment for this package.
     '''
-    return Environment(loader=PackageLoader('EPCPyYes', 'templates'),
-                       extensions=['jinja2.ext.with_'], trim_blocks=True,
-                       lstrip_blocks=True)
+    return get_environment()
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+'''
+The number of characters collected from the template output before they
+are written to the stream by `write_chunks`.
+'''
+
+
+def _stream_encoder(stream, encoding, compression, compression_level):
+    '''
+    Returns a function turning the collected text into what is written to
+    the stream.  Its second argument is True for the last piece of text.
+    '''
+    if isinstance(stream, io.TextIOBase):
+        if compression:
+            raise ValueError('Compressed output needs a binary stream.')
+        return lambda data, last: data
+    if not compression:
+        return lambda data, last: data.encode(encoding)
+    compressor = compressors.compressor(compression, compression_level)
+
+    def compress(data, last):
+        data = compressor.compress(data.encode(encoding))
+        return data + compressor.flush() if last else data
+
+    return compress
+
+
+def write_chunks(chunks, stream, encoding='utf-8',
+                 buffer_size=DEFAULT_BUFFER_SIZE, compression: str = None,
+                 compression_level=DEFAULT_COMPRESSION_LEVEL):
+    '''
+    Writes an iterable of string chunks to a writable.  Small chunks are
+    collected until at least `buffer_size` characters are pending so the
+    stream is not called for every fragment of template output.
+
+    :param chunks: An iterable of strings.
+    :param stream: Any object with a `write` method.  Text streams
+        (`io.TextIOBase` instances) are written strings, everything else
+        is written bytes in the given encoding.
+    :param encoding: The encoding for binary streams.  Default is utf-8.
+    :param buffer_size: The number of characters to collect before
+        writing.
+    :param compression: `gzip` or `zlib` to compress the output as it is
+        written (see `EPCPyYes.core.v1_2.compression`).  Needs a binary
+        stream.
+    :param compression_level: The compression level from 1 (fastest) to 9
+        (smallest).
+    :return: The number of bytes (or characters for text streams) written.
+    '''
+    encode = _stream_encoder(stream, encoding, compression,
+                             compression_level)
+    chunks = iter(chunks)
+    written = 0
+    pending = []
+    pending_size = 0
+    while True:
+        # joining the many tiny template fragments in batches keeps the
+        # per-chunk work out of the python loop.
+        batch = list(islice(chunks, 256))
+        if batch:
+            data = ''.join(batch)
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= buffer_size or not batch:
+            data = encode(''.join(pending), not batch)
+            if data:
+                stream.write(data)
+                written += len(data)
+            pending = []
+            pending_size = 0
+        if not batch:
+            return written
+
+
+ASYNC_BATCH_SIZE = 64
+'''
+The number of template chunks rendered by the async APIs before control
+is handed back to the event loop.
+'''
+
+# Python 3.5 and 3.6 lack get_running_loop; there get_event_loop returns
+# the running loop when called from a coroutine
+_get_running_loop = getattr(asyncio, 'get_running_loop',
+                            asyncio.get_event_loop)
+
+
+class AsyncChunkIterator(object):
+    '''
+    Asynchronous iterator over rendered output for use with `async for`.
+    Each step renders a batch of chunks and then yields to the event loop
+    so a large document never blocks it for more than a few events.
+    '''
+
+    def __init__(self, chunks, batch_size=ASYNC_BATCH_SIZE):
+        '''
+        :param chunks: An iterable of string chunks, such as the result
+            of `TemplateMixin.iter_render`.
+        :param batch_size: The number of chunks joined per step.
+        '''
+        self._chunks = iter(chunks)
+        self._batch_size = batch_size
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        batch = list(islice(self._chunks, self._batch_size))
+        if not batch:
+            raise StopAsyncIteration
+        await asyncio.sleep(0)
+        return ''.join(batch)
+
+
+async def write_chunks_async(chunks, stream, encoding='utf-8',
+                             buffer_size=DEFAULT_BUFFER_SIZE,
+                             compression: str = None,
+                             compression_level=DEFAULT_COMPRESSION_LEVEL):
+    '''
+    The asynchronous counterpart of `write_chunks`.  Awaits the result of
+    `stream.write` when it is awaitable and `stream.drain()` when the
+    stream has one (an `asyncio.StreamWriter`, for example).
+
+    :param chunks: An iterable or `AsyncChunkIterator` of strings.
+    :param stream: Any object with a `write` method.
+    :param encoding: The encoding for binary streams.  Default is utf-8.
+    :param buffer_size: The number of characters to collect before
+        writing.
+    :param compression: `gzip`, `zlib` or None.
+    :param compression_level: The compression level.
+    :return: The number of bytes (or characters for text streams) written.
+    '''
+    if not isinstance(chunks, AsyncChunkIterator):
+        chunks = AsyncChunkIterator(chunks)
+    encode = _stream_encoder(stream, encoding, compression,
+                             compression_level)
+    drain = getattr(stream, 'drain', None)
+    written = 0
+    pending = []
+    pending_size = 0
+    done = False
+    while not done:
+        try:
+            data = await chunks.__anext__()
+            pending.append(data)
+            pending_size += len(data)
+        except StopAsyncIteration:
+            done = True
+        if pending_size >= buffer_size or done:
+            data = encode(''.join(pending), done)
+            if data:
+                result = stream.write(data)
+                if inspect.isawaitable(result):
+                    await result
+                if drain:
+                    await drain()
+                written += len(data)
+            pending = []
+            pending_size = 0
+    return written
+
+
+class FragmentCacheStats(object):
+    '''
+    Counts the lookups in the rendered fragment caches of the template
+    events.  The counters are process-wide; read them from
+    `fragment_cache`.
+    '''
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self):
+        '''
+        Sets both counters back to zero.
+        '''
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self):
+        '''
+        :return: A dictionary with the `hits`, `misses` and `hit_ratio`
+            of the fragment caches.
+        '''
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0}
+
+
+fragment_cache = FragmentCacheStats()
+'''
+The hit and miss counters of the rendered fragment caches.
+'''
 
 
 class TemplateMixin(JSONFormatMixin):
@@ -49,6 +259,20 @@ class TemplateMixin(JSONFormatMixin):
     Mixin class to add template support for serializing EPCIS classes to
     text using jinja templates.
     '''
+    event_type = None
+    encoder = None
+    '''
+    The `json.JSONEncoder` used by `render_json`.  The template classes
+    share one encoder instance per type (see `json_encoders`) and are
+    encoded by the functions of `json_encoders.ENCODERS`; assign an
+    encoder to an instance to change the JSON of just that object.
+    '''
+    cache_fragments = False
+    '''
+    Set to True on a class or an instance to keep the XML and JSON it
+    renders until one of its properties is set.  `EPCPyYes.CACHE_FRAGMENTS`
+    turns the cache on for all events.
+    '''
 
     def __init__(self, *args, **kwargs):
         '''
@@ -71,6 +295,37 @@ class TemplateMixin(JSONFormatMixin):
         self._context = {'event': self,
                          'render_xml_declaration': self._render_xml_declaration}
 
+    def __getstate__(self):
+        '''
+        Jinja2 environments and templates can not be pickled so events
+        are pickled with the registry key of their environment and the
+        name of their template instead.  Both are looked up again when
+        the event is unpickled- in a worker process, for example.  Only
+        events using environments from the registry (see
+        `EPCPyYes.core.v1_2.environment`) with file based loaders can be
+        pickled.
+        '''
+        state = self.__dict__.copy()
+        state.pop('_fragments', None)
+        key = registry.key_for(state.pop('_env', None))
+        template = state.pop('_template', None)
+        if key is None or key[0][0] == 'instance' or \
+                (template is not None and template.name is None):
+            raise pickle.PicklingError(
+                '%s uses a Jinja2 environment or template that can not be '
+                'recreated after unpickling.' % type(self).__name__)
+        state['_env'] = key
+        state['_template'] = template.name if template is not None else None
+        return state
+
+    def __setstate__(self, state):
+        spec, options = state.pop('_env')
+        template = state.pop('_template')
+        self.__dict__.update(state)
+        self._env = registry.get_environment(spec, **dict(options))
+        self._template = self._env.get_template(template) if template \
+            else None
+
     @property
     def template(self):
         '''
@@ -88,7 +343,7 @@ class TemplateMixin(JSONFormatMixin):
         :return: None
         '''
         self._template = self._env.get_template(value)
-        self._template.new_context(self._context)
+        self.__dict__.pop('_fragments', None)
 
     @property
     def namespaces(self):
@@ -100,20 +355,295 @@ class TemplateMixin(JSONFormatMixin):
         '''
         return []
 
-    def render(self):
+    def get_context(self):
+        '''
+        Override to supply the template context used by `render`,
+        `iter_render` and `render_to`.
+
+        :return: The _context dictionary.
+        '''
+        return self._context
+
+    def _caching(self):
+        return self.cache_fragments or (EPCPyYes.CACHE_FRAGMENTS and
+                                        self.event_type is not None)
+
+    def _cached(self, key):
+        fragments = self.__dict__.get('_fragments')
+        if fragments is None or key not in fragments:
+            return None
+        fragment_cache.hits += 1
+        return fragments[key]
+
+    def _fragment(self, key, factory, create=True):
+        '''
+        Returns the fragment cached under `key`, calling `factory` to
+        create it on a miss.  The new fragment is only cached when
+        `create` is true and the cache is on (see `cache_fragments`).
+        Documents pass False so rendering them never fills the caches
+        of their events.
+        '''
+        fragment = self._cached(key)
+        if fragment is not None:
+            return fragment
+        if not (create and self._caching()):
+            return factory()
+        fragment_cache.misses += 1
+        fragments = self.__dict__.setdefault('_fragments', {})
+        fragment = fragments[key] = factory()
+        return fragment
+
+    def cached_xml(self, backend: str = None, compact=False):
+        '''
+        :param backend: The name of the serializer backend.
+        :param compact: Whether the XML was rendered compact.
+        :return: The XML `render` cached with the same arguments or None.
+        '''
+        return self._cached(self._xml_key(backend, compact))
+
+    @staticmethod
+    def _xml_key(backend, compact):
+        backend = backend or backends.TEMPLATE_BACKEND
+        return ('xml', backend, 'compact') if compact else ('xml', backend)
+
+    def get_template(self, compact=False):
+        '''
+        :param compact: Return the template compiled without the
+            whitespace between elements (see
+            `EPCPyYes.core.v1_2.environment.compact_environment`).
+        :return: The Jinja2 template used by the template backend.
+        '''
+        if not compact:
+            return self._template
+        if self._template.name is None:
+            raise ValueError('Compact output needs a template loaded from '
+                             'the Jinja2 environment by name.')
+        return compact_environment(self._env).get_template(
+            self._template.name)
+
+    def _template_context(self, compact):
+        context = self.get_context()
+        return dict(context, compact=True) if compact else context
+
+    def render(self, backend: str = None, compact=False):
         '''
         Renders the Class template using the _context dictionary for the
         template context.
+        :param backend: The name of the serializer backend to use (see
+            the `EPCPyYes.core.v1_2.backends` module).  The default is
+            the Jinja2 template backend.
+        :param compact: Leave out the indentation and line breaks between
+            elements.  Only the template backend supports this.
+        '''
+        backend = backend or backends.TEMPLATE_BACKEND
+        return self._fragment(self._xml_key(backend, compact),
+                              functools.partial(self._render, backend,
+                                                compact))
+
+    def _render(self, backend, compact=False):
+        if backend == backends.TEMPLATE_BACKEND:
+            return self.get_template(compact).render(
+                **self._template_context(compact))
+        return ''.join(self.iter_render(backend, compact=compact))
+
+    def render_json(self, backend: str = None):
+        '''
+        :param backend: The name of the JSON backend to use (see the
+            `EPCPyYes.core.v1_2.json_backends` module).  The default is
+            `EPCPyYes.JSON_BACKEND`.
+        :return: A JSON string with no line breaks.
+        '''
+        return self._json_fragment(backend)
 
-        :param: render_namespaces: A boolean value passed into the
-        template as a context variable.  Used by the default templates
-        to determine whether or not to declare the XML namespaces in the
-        root element.
+    def _json_fragment(self, backend: str = None, create=True):
+        backend = json_backends.get_json_backend(backend)
+        return self._fragment(('json', backend.name), functools.partial(
+            backend.encode, self), create)
+
+    def render_pretty_json(self, indent=4, sort_keys=False,
+                           backend: str = None):
+        '''
+        Pretty prints the JSON output.
+        :param indent: Default of 4.
+        :param sort_keys: Default of False.
+        :param backend: The name of the JSON backend to use.
+        :return: A formatted JSON string indented and (potentially) sorted.
         '''
-        return self._template.render(**self._context)
+        backend = json_backends.get_json_backend(backend)
+        return self._fragment(
+            ('pretty_json', backend.name, indent, sort_keys),
+            lambda: backend.dumps_pretty(self.fragment_dict(), indent,
+                                         sort_keys))
 
+    def fragment_dict(self, create=True):
+        '''
+        Like `render_dict` but returns the cached dictionary of cached
+        events.  Used by the document encoders; the dictionary is shared
+        and must not be changed.
+        :param create: Cache the dictionary if it is not cached yet and
+            the cache is on.
+        :return: A dictionary.
+        '''
+        return self._fragment(('dict',), self.render_dict, create)
 
-TemplateEventList = List[TemplateMixin]
+    def iter_render_json(self, backend: str = None):
+        '''
+        Encodes the JSON piece by piece.  Documents are encoded one event
+        at a time (see `json_encoders.iter_encode_document`).  Joining the
+        chunks gives exactly the output of `render_json`.
+        :param backend: The name of the JSON backend to use.
+        :return: An iterable of string chunks.
+        '''
+        return json_backends.get_json_backend(backend).iter_encode(self)
+
+    def render_json_to(self, stream, encoding='utf-8',
+                       buffer_size=DEFAULT_BUFFER_SIZE,
+                       compression: str = None,
+                       compression_level=DEFAULT_COMPRESSION_LEVEL,
+                       backend: str = None):
+        '''
+        Streams the JSON to a writable.  The bytes written are identical
+        to `render_json().encode(encoding)`, or its compressed form.  See
+        `render_to` for the parameters.
+        :param backend: The name of the JSON backend to use.
+        :return: The number of bytes (or characters for text streams)
+            written.
+        '''
+        return write_chunks(self.iter_render_json(backend), stream, encoding,
+                            buffer_size, compression, compression_level)
+
+    def iter_render(self, backend: str = None, compact=False):
+        '''
+        Renders the Class template piece by piece.  Joining the chunks
+        gives exactly the output of `render` without ever holding the
+        whole document in memory.
+        :param backend: The name of the serializer backend to use.
+        :param compact: Leave out the whitespace between elements.
+        :return: An iterable of string chunks.
+        '''
+        if backend is None or backend == backends.TEMPLATE_BACKEND:
+            return self.get_template(compact).generate(
+                **self._template_context(compact))
+        if compact:
+            raise ValueError('Compact output is only supported by the %s '
+                             'backend.' % backends.TEMPLATE_BACKEND)
+        return backends.get_backend(backend).iter_serialize(self)
+
+    def render_to(self, stream, encoding='utf-8',
+                  buffer_size=DEFAULT_BUFFER_SIZE, backend: str = None,
+                  compact=False, compression: str = None,
+                  compression_level=DEFAULT_COMPRESSION_LEVEL):
+        '''
+        Streams the rendered template to a writable such as a file,
+        socket file or `io.BytesIO`.  The bytes written are identical to
+        `render().encode(encoding)`, or its compressed form.
+        :param stream: Any object with a `write` method.  Text streams
+            receive strings instead of bytes.
+        :param encoding: The output encoding.  Default is utf-8.
+        :param buffer_size: The number of characters collected before each
+            write to the stream.
+        :param backend: The name of the serializer backend to use.
+        :param compact: Leave out the whitespace between elements.
+        :param compression: `gzip` or `zlib` to compress the output as it
+            is rendered.  Needs a binary stream.
+        :param compression_level: The compression level from 1 (fastest)
+            to 9 (smallest).
+        :return: The number of bytes (or characters for text streams)
+            written.
+        '''
+        return write_chunks(self.iter_render(backend, compact=compact),
+                            stream, encoding, buffer_size, compression,
+                            compression_level)
+
+    async def render_async(self, backend: str = None, executor=None,
+                           compact=False):
+        '''
+        Renders without blocking the event loop.  By default the
+        rendering is done on the loop in small steps (see
+        `aiter_render`); pass an executor to render in a worker thread
+        or process instead.
+        :param backend: The name of the serializer backend to use.
+        :param executor: An optional `concurrent.futures.Executor`.
+        :param compact: Leave out the whitespace between elements.
+        :return: The same string `render` returns.
+        '''
+        if executor is not None:
+            loop = _get_running_loop()
+            return await loop.run_in_executor(
+                executor, functools.partial(self.render, backend=backend,
+                                            compact=compact))
+        parts = []
+        async for chunk in self.aiter_render(backend, compact=compact):
+            parts.append(chunk)
+        return ''.join(parts)
+
+    def aiter_render(self, backend: str = None,
+                     batch_size=ASYNC_BATCH_SIZE, compact=False):
+        '''
+        The asynchronous version of `iter_render` for use with
+        `async for`.  Control is handed back to the event loop after
+        every `batch_size` template chunks.
+        :param backend: The name of the serializer backend to use.
+        :param batch_size: The number of chunks rendered per step.
+        :param compact: Leave out the whitespace between elements.
+        :return: An `AsyncChunkIterator`.
+        '''
+        return AsyncChunkIterator(self.iter_render(backend, compact=compact),
+                                  batch_size)
+
+    async def render_to_async(self, stream, encoding='utf-8',
+                              buffer_size=DEFAULT_BUFFER_SIZE,
+                              backend: str = None, compact=False,
+                              compression: str = None,
+                              compression_level=DEFAULT_COMPRESSION_LEVEL):
+        '''
+        The asynchronous version of `render_to`.  The stream may be a
+        regular writable or an asynchronous one such as an
+        `asyncio.StreamWriter`, which is drained after every write.
+        :return: The number of bytes (or characters for text streams)
+            written.
+        '''
+        return await write_chunks_async(
+            self.aiter_render(backend, compact=compact), stream, encoding,
+            buffer_size, compression, compression_level)
+
+
+TemplateEventList = Iterable[TemplateMixin]
+
+
+class NDJSONMixin(object):
+    '''
+    Writes the events of a document as JSON Lines (NDJSON): the JSON of
+    one event per line, as rendered by `render_json`, with no header or
+    document around them.  Read them back with
+    `EPCPyYes.core.v1_2.json_decoders.iter_decode_ndjson`.
+    '''
+
+    def iter_render_ndjson(self, backend: str = None):
+        '''
+        :param backend: The name of the JSON backend to use (see the
+            `EPCPyYes.core.v1_2.json_backends` module).
+        :return: A generator of lines, each ending with a line break.
+        '''
+        return json_backends.get_json_backend(backend).iter_encode_lines(
+            self)
+
+    def render_ndjson(self, stream, encoding='utf-8',
+                      buffer_size=DEFAULT_BUFFER_SIZE,
+                      compression: str = None,
+                      compression_level=DEFAULT_COMPRESSION_LEVEL,
+                      backend: str = None):
+        '''
+        Streams the events to a writable one line at a time, so documents
+        built from generators are written in constant memory.  See
+        `render_to` for the parameters.
+        :param backend: The name of the JSON backend to use.
+        :return: The number of bytes (or characters for text streams)
+            written.
+        '''
+        return write_chunks(self.iter_render_ndjson(backend), stream,
+                            encoding, buffer_size, compression,
+                            compression_level)
 
 
 class ObjectEvent(events.ObjectEvent, TemplateMixin):
@@ -122,6 +652,7 @@ class ObjectEvent(events.ObjectEvent, TemplateMixin):
     associated with the class.  The default environment utilizes the
     `templates` directory in the root folder of the package.
     '''
+    encoder = json_encoders.object_event_encoder
 
     def __init__(self, event_time: datetime = datetime.utcnow().isoformat(),
                  event_timezone_offset: str = '+00:00',
@@ -147,7 +678,6 @@ class ObjectEvent(events.ObjectEvent, TemplateMixin):
         TemplateMixin.__init__(self, **kwargs)
         template = template or 'epcis/object_event.xml'
         self.template = self._env.get_template(template)
-        self.encoder = json_encoders.ObjectEventEncoder()
 
     @property
     def namespaces(self):
@@ -171,6 +701,7 @@ class AggregationEvent(events.AggregationEvent, TemplateMixin):
     '''
     Generates an EPCIS Aggregation Event.
     '''
+    encoder = json_encoders.aggregation_event_encoder
 
     def __init__(self, event_time: datetime = datetime.utcnow().isoformat(),
                  event_timezone_offset: str = '+00:00',
@@ -234,10 +765,11 @@ class AggregationEvent(events.AggregationEvent, TemplateMixin):
                   }
         TemplateMixin.__init__(self, **kwargs)
         self._template = self._env.get_template('epcis/aggregation_event.xml')
-        self.encoder = json_encoders.AggregationEventEncoder()
 
 
 class TransactionEvent(events.TransactionEvent, TemplateMixin):
+    encoder = json_encoders.transaction_event_encoder
+
     def __init__(self, event_time: datetime = datetime.utcnow().isoformat(),
                  event_timezone_offset: str = '+00:00',
                  record_time: datetime = None,
@@ -261,10 +793,11 @@ class TransactionEvent(events.TransactionEvent, TemplateMixin):
                   }
         TemplateMixin.__init__(self, **kwargs)
         self.template = 'epcis/transaction_event.xml'
-        self.encoder = json_encoders.TransactionEventEncoder()
 
 
 class TransformationEvent(events.TransformationEvent, TemplateMixin):
+    encoder = json_encoders.transformation_event_encoder
+
     def __init__(self, event_time: datetime = datetime.utcnow().isoformat(),
                  event_timezone_offset: str = '+00:00',
                  record_time: datetime = None,
@@ -291,10 +824,11 @@ class TransformationEvent(events.TransformationEvent, TemplateMixin):
                   }
         TemplateMixin.__init__(self, **kwargs)
         self.template = 'epcis/transformation_event.xml'
-        self.encoder = json_encoders.TransformationEventEncoder()
 
 
-class EPCISDocument(events.EPCISDocument, TemplateMixin):
+class EPCISDocument(events.EPCISDocument, TemplateMixin, NDJSONMixin):
+    encoder = json_encoders.document_encoder
+
     def __init__(self,
                  header: sbdh = None,
                  object_events: list = [], aggregation_events: list = [],
@@ -309,21 +843,24 @@ class EPCISDocument(events.EPCISDocument, TemplateMixin):
                          created_date)
         TemplateMixin.__init__(self)
         self._template = self._env.get_template(template)
-        self.encoder = json_encoders.EPCISDocumentEncoder()
 
-    def render(self, render_namespaces=False, render_xml_declaration=False):
-        context = {'header': self.header,
-                   'object_events': self.object_events,
-                   'aggregation_events': self.aggregation_events,
-                   'transaction_events': self.transaction_events,
-                   'transformation_events': self.transformation_events,
-                   'created_date': self.created_date,
-                   'render_xml_declaration': self.render_xml_declaration,
-                   }
-        return self._template.render(**context)
+    def get_context(self):
+        return {'header': self.header,
+                'object_events': self.object_events,
+                'aggregation_events': self.aggregation_events,
+                'transaction_events': self.transaction_events,
+                'transformation_events': self.transformation_events,
+                'created_date': self.created_date,
+                'render_xml_declaration': self.render_xml_declaration,
+                }
 
+    def render(self, render_namespaces=False, render_xml_declaration=False,
+               backend: str = None, compact=False):
+        return TemplateMixin.render(self, backend, compact)
 
-class EPCISEventListDocument(events.EPCISDocument, TemplateMixin):
+
+class EPCISEventListDocument(events.EPCISDocument, TemplateMixin,
+                             NDJSONMixin):
     '''
     This template event of the EPCISDocument type allows you to specify
     a generic list of EPCPyYes events of any type in any order- as opposed
@@ -332,10 +869,14 @@ class EPCISEventListDocument(events.EPCISDocument, TemplateMixin):
 
     The EPCISEventListDocument has a single list called
     `template_events` which can be supplied in the constructor or
-    can be accessed via the property of the same name.  The class must
-    be initialized, however, with at least one event in the
-    `template_events` parameter.
+    can be accessed via the property of the same name.  Any iterable
+    will do- including a generator that builds events from a database
+    cursor.  Events are pulled from the iterable, rendered and dropped
+    one at a time, so a generator can only be rendered once.
+    TransformationEvents are rendered in place, each wrapped in its own
+    <extension> element as the EPCIS 1.2 schema requires.
     '''
+    encoder = json_encoders.document_encoder
 
     def __init__(self, template_events: TemplateEventList,
                  header: sbdh = None,
@@ -345,9 +886,9 @@ class EPCISEventListDocument(events.EPCISDocument, TemplateMixin):
                  template='epcis/epcis_events_document.xml',
                  additional_context:dict = None):
         '''
-        Initializes the class with at least one event in the
+        Initializes the class with the events in the
         `template_events` paramter.
-        :param template_events: A list of
+        :param template_events: A list, generator or other iterable of
         `EPCPyYes.core.v1_2.template_event.TemplateMixin` objects.
         :param header: An EPCPyYes SBDH object.
         :param render_xml_declaration:
@@ -364,17 +905,10 @@ class EPCISEventListDocument(events.EPCISDocument, TemplateMixin):
         self._template_events = template_events
         self._render_namespaces = render_namespaces
         self._template = self._env.get_template(template)
-        self.encoder = json_encoders.EPCISDocumentEncoder()
         self.additional_context = additional_context
 
-    def render(self):
-        # we remove transformation events from the main event
-        # list since they must go into the <extension> element.
-        for event in self.template_events:
-            if isinstance(event, TransformationEvent):
-                self.transformation_events.append(event)
-                self.template_events.remove(event)
-        context = {
+    def get_context(self):
+        return {
             'header': self.header,
             'template_events': self.template_events,
             'transformation_events': self.transformation_events,
@@ -383,7 +917,69 @@ class EPCISEventListDocument(events.EPCISDocument, TemplateMixin):
             'created_date': self.created_date,
             'additional_context': self.additional_context
         }
-        return self._template.render(**context)
+
+    def render(self, backend: str = None, parallel=None, compact=False):
+        '''
+        Renders the document.
+        :param backend: The name of the serializer backend to use.
+        :param parallel: The number of worker processes (or a
+            `concurrent.futures.Executor`) to render the events with.
+            See the `EPCPyYes.core.v1_2.parallel` module.
+        :param compact: Leave out the indentation and line breaks between
+            elements.
+        :return: The rendered document.
+        '''
+        if parallel:
+            return ''.join(self.iter_render(backend, parallel, compact))
+        return TemplateMixin.render(self, backend, compact)
+
+    def iter_render(self, backend: str = None, workers=None, compact=False):
+        '''
+        :param backend: The name of the serializer backend to use.
+        :param workers: The number of worker processes (or an executor)
+            to render the events with.  Default is to render in this
+            process.
+        :param compact: Leave out the whitespace between elements.
+        :return: An iterable of string chunks.
+        '''
+        if workers:
+            return parallel.iter_render_parallel(self, workers, backend,
+                                                 compact=compact)
+        return TemplateMixin.iter_render(self, backend, compact)
+
+    def render_to(self, stream, encoding='utf-8',
+                  buffer_size=DEFAULT_BUFFER_SIZE, backend: str = None,
+                  workers=None, compact=False, compression: str = None,
+                  compression_level=DEFAULT_COMPRESSION_LEVEL):
+        '''
+        Streams the document to a writable, optionally rendering the
+        events in `workers` worker processes and compressing the output.
+        See `TemplateMixin.render_to`.
+        '''
+        return write_chunks(self.iter_render(backend, workers, compact),
+                            stream, encoding, buffer_size, compression,
+                            compression_level)
+
+    def split(self, max_events: int = None, max_bytes: int = None,
+              policy=splitter.AggregationPolicy.split_anywhere,
+              backend: str = None, compact=False, encoding='utf-8'):
+        '''
+        Splits the document into documents of at most `max_events` events
+        and/or `max_bytes` bytes.  Each document gets a copy of the header
+        with a new instance identifier.  See the
+        `EPCPyYes.core.v1_2.splitter` module.
+        :param max_events: The maximum number of events per document.
+        :param max_bytes: The maximum rendered size of each document.
+        :param policy: A `splitter.AggregationPolicy` saying whether
+            aggregation events stay with their commissioning events.
+        :param backend: The backend the documents will be rendered with.
+        :param compact: Whether the documents will be rendered compact.
+        :param encoding: The encoding the documents will be written in.
+        :return: A generator of `EPCISEventListDocument` instances.
+        '''
+        return iter(splitter.DocumentSplitter(self, max_events, max_bytes,
+                                              policy, backend, compact,
+                                              encoding))
 
     @property
     def template_events(self):
@@ -0,0 +1,446 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The `fast` serializer backend.  Writes EPCIS 1.2 XML straight from the
+classes in the `events` and `SBDH.sbdh` modules using pre-built string
+fragments and list joins instead of the Jinja2 templates.
+
+The output carries the same information as the default templates but is
+not indented, escapes markup characters in values and always writes the
+EPC list elements the schema requires (`epcList` and `childEPCs`) even
+when they are empty.  Custom templates are ignored by this backend;
+events it does not know how to serialize (for example custom
+`TemplateMixin` subclasses) are rendered with their own templates.
+
+.. code-block:: python
+
+    from EPCPyYes.core.v1_2.xml_serializer import serializer
+
+    xml = serializer.serialize(document)
+    # or
+    xml = document.render(backend='fast')
+'''
+import functools
+from xml.sax.saxutils import escape, quoteattr
+
+from EPCPyYes.core.v1_2 import events
+from EPCPyYes.core.SBDH import sbdh
+
+XML_DECLARATION = \
+    '<?xml version="1.0" encoding="UTF-8" standalone="no" ?>\n'
+DOCUMENT_START = ('<epcis:EPCISDocument '
+                  'xmlns:epcis="urn:epcglobal:epcis:xsd:1" '
+                  'xmlns:cbvmd="urn:epcglobal:cbv:mda"')
+DOCUMENT_BODY_START = '<EPCISBody>\n<EventList>\n'
+DOCUMENT_END = '</EventList>\n</EPCISBody>\n</epcis:EPCISDocument>'
+EXTENSION_START = '<extension>\n'
+EXTENSION_END = '</extension>\n'
+
+_EPC_SEPARATOR = '</epc>\n<epc>'
+
+
+def text(value) -> str:
+    '''
+    Returns the string value of `value` with any XML markup characters
+    escaped.  Values without markup- nearly all EPCIS data- are returned
+    without copying.
+    '''
+    value = str(value)
+    if '&' in value or '<' in value or '>' in value:
+        return escape(value)
+    return value
+
+
+def attribute(value) -> str:
+    '''
+    Returns `value` as a quoted and escaped XML attribute value.
+    '''
+    return quoteattr(str(value))
+
+
+def enum_value(value):
+    '''
+    Returns the value of an Enum member or the value itself for anything
+    else- the same as `value.value or value` in the templates.
+    '''
+    return getattr(value, 'value', None) or value
+
+
+def epc_list(tag: str, epcs) -> str:
+    '''
+    Serializes a list of EPCs in a single join.
+    :param tag: The name of the list element, for example `epcList`.
+    :param epcs: A list of EPC URNs.
+    :return: The list element with one `epc` element per EPC.
+    '''
+    if not epcs:
+        return '<%s/>\n' % tag
+    body = _EPC_SEPARATOR.join(epcs)
+    separators = len(epcs) - 1
+    # the separators are the only markup a clean list contains
+    if '&' in body or body.count('<') != separators or \
+            body.count('>') != separators:
+        body = _EPC_SEPARATOR.join([text(epc) for epc in epcs])
+    return '<%s>\n<epc>%s</epc>\n</%s>\n' % (tag, body, tag)
+
+
+def quantity_list(tag: str, quantity_elements) -> str:
+    parts = ['<%s>\n' % tag]
+    for element in quantity_elements or []:
+        parts.append('<quantityElement>\n<epcClass>%s</epcClass>\n'
+                     '<quantity>%s</quantity>\n' %
+                     (text(element.epc_class), text(element.quantity)))
+        if element.uom:
+            parts.append('<uom>%s</uom>\n' % text(element.uom))
+        parts.append('</quantityElement>\n')
+    parts.append('</%s>\n' % tag)
+    return ''.join(parts)
+
+
+def source_list(sources) -> str:
+    return '<sourceList>\n%s</sourceList>\n' % ''.join([
+        '<source type=%s>%s</source>\n' % (attribute(source.type),
+                                           text(source.source))
+        for source in sources])
+
+
+def destination_list(destinations) -> str:
+    return '<destinationList>\n%s</destinationList>\n' % ''.join([
+        '<destination type=%s>%s</destination>\n' % (
+            attribute(destination.type), text(destination.destination))
+        for destination in destinations])
+
+
+def business_transaction_list(business_transactions) -> str:
+    parts = ['<bizTransactionList>\n']
+    for bt in business_transactions:
+        if bt.type:
+            parts.append('<bizTransaction type=%s>%s</bizTransaction>\n' % (
+                attribute(enum_value(bt.type)), text(bt.biz_transaction)))
+        else:
+            parts.append('<bizTransaction>%s</bizTransaction>\n' %
+                         text(bt.biz_transaction))
+    parts.append('</bizTransactionList>\n')
+    return ''.join(parts)
+
+
+def ilmd(attributes) -> str:
+    parts = ['<ilmd>\n']
+    for item in attributes:
+        if 'CBV' in item.__module__:
+            name = 'cbvmd:%s' % enum_value(item.name)
+        else:
+            name = str(item.name)
+        parts.append('<%s>%s</%s>\n' % (name, text(item.value), name))
+    parts.append('</ilmd>\n')
+    return ''.join(parts)
+
+
+def event_times(event: events.EPCISEvent, parts: list):
+    parts.append('<eventTime>%s</eventTime>\n' % text(event.event_time))
+    if event.record_time:
+        parts.append('<recordTime>%s</recordTime>\n' %
+                     text(event.record_time))
+    if event.event_timezone_offset:
+        parts.append('<eventTimeZoneOffset>%s</eventTimeZoneOffset>\n' %
+                     text(event.event_timezone_offset))
+    if event.event_id or event.error_declaration:
+        parts.append('<baseExtension>\n')
+        if event.event_id:
+            parts.append('<eventID>%s</eventID>\n' % text(event.event_id))
+        declaration = event.error_declaration
+        if declaration:
+            parts.append('<errorDeclaration>\n'
+                         '<declarationTime>%s</declarationTime>\n' %
+                         text(declaration.declaration_time))
+            if declaration.reason:
+                parts.append('<reason>%s</reason>\n' %
+                             text(declaration.reason))
+            parts.append('<correctiveEventIDs>\n')
+            for event_id in declaration.corrective_event_ids or []:
+                parts.append('<correctiveEventID>%s</correctiveEventID>\n' %
+                             text(event_id))
+            parts.append('</correctiveEventIDs>\n</errorDeclaration>\n')
+        parts.append('</baseExtension>\n')
+
+
+def business_data(event: events.EPCISBusinessEvent, parts: list,
+                  transactions=True):
+    action = getattr(event, 'action', None)
+    if action:
+        parts.append('<action>%s</action>\n' % text(enum_value(action)))
+    if event.biz_step:
+        parts.append('<bizStep>%s</bizStep>\n' % text(event.biz_step))
+    if event.disposition:
+        parts.append('<disposition>%s</disposition>\n' %
+                     text(event.disposition))
+    if event.read_point:
+        parts.append('<readPoint>\n<id>%s</id>\n</readPoint>\n' %
+                     text(event.read_point))
+    if event.biz_location:
+        parts.append('<bizLocation>\n<id>%s</id>\n</bizLocation>\n' %
+                     text(event.biz_location))
+    if transactions and event.business_transaction_list:
+        parts.append(
+            business_transaction_list(event.business_transaction_list))
+
+
+def extension(parts: list, quantities_tag=None, quantities=None,
+              sources=None, destinations=None, attributes=None):
+    if not (quantities or sources or destinations or attributes):
+        return
+    parts.append(EXTENSION_START)
+    if quantities:
+        parts.append(quantity_list(quantities_tag, quantities))
+    if sources:
+        parts.append(source_list(sources))
+    if destinations:
+        parts.append(destination_list(destinations))
+    if attributes:
+        parts.append(ilmd(attributes))
+    parts.append(EXTENSION_END)
+
+
+def object_event(event: events.ObjectEvent) -> str:
+    parts = ['<ObjectEvent>\n']
+    event_times(event, parts)
+    parts.append(epc_list('epcList', event.epc_list))
+    business_data(event, parts)
+    extension(parts, 'quantityList', event.quantity_list, event.source_list,
+              event.destination_list, event.ilmd)
+    parts.append('</ObjectEvent>\n')
+    return ''.join(parts)
+
+
+def aggregation_event(event: events.AggregationEvent) -> str:
+    parts = ['<AggregationEvent>\n']
+    event_times(event, parts)
+    if event.parent_id:
+        parts.append('<parentID>%s</parentID>\n' % text(event.parent_id))
+    parts.append(epc_list('childEPCs', event.child_epcs))
+    business_data(event, parts)
+    extension(parts, 'childQuantityList', event.child_quantity_list,
+              event.source_list, event.destination_list)
+    parts.append('</AggregationEvent>\n')
+    return ''.join(parts)
+
+
+def transaction_event(event: events.TransactionEvent) -> str:
+    parts = ['<TransactionEvent>\n']
+    event_times(event, parts)
+    if event.business_transaction_list:
+        parts.append(
+            business_transaction_list(event.business_transaction_list))
+    if event.parent_id:
+        parts.append('<parentID>%s</parentID>\n' % text(event.parent_id))
+    parts.append(epc_list('epcList', event.epc_list))
+    business_data(event, parts, transactions=False)
+    extension(parts, 'quantityList', event.quantity_list, event.source_list,
+              event.destination_list)
+    parts.append('</TransactionEvent>\n')
+    return ''.join(parts)
+
+
+def transformation_event(event: events.TransformationEvent) -> str:
+    parts = ['<TransformationEvent>\n']
+    event_times(event, parts)
+    if event.input_epc_list:
+        parts.append(epc_list('inputEPCList', event.input_epc_list))
+    parts.append(quantity_list('inputQuantityList',
+                               event.input_quantity_list))
+    if event.output_epc_list:
+        parts.append(epc_list('outputEPCList', event.output_epc_list))
+    parts.append(quantity_list('outputQuantityList',
+                               event.output_quantity_list))
+    if event.transformation_id:
+        parts.append('<transformationID>%s</transformationID>\n' %
+                     text(event.transformation_id))
+    business_data(event, parts)
+    if event.source_list:
+        parts.append(source_list(event.source_list))
+    if event.destination_list:
+        parts.append(destination_list(event.destination_list))
+    if event.ilmd:
+        parts.append(ilmd(event.ilmd))
+    parts.append('</TransformationEvent>\n')
+    return ''.join(parts)
+
+
+def header(sbd_header: sbdh.StandardBusinessDocumentHeader) -> str:
+    ns = sbd_header.namespace
+    parts = ['<%s:StandardBusinessDocumentHeader>\n'
+             '<%s:HeaderVersion>%s</%s:HeaderVersion>\n' %
+             (ns, ns, text(sbd_header.header_version), ns)]
+    for partner in sbd_header.partners or []:
+        partner_type = partner.partner_type
+        parts.append('<%s:%s>\n' % (ns, partner_type))
+        if partner.partner_id:
+            parts.append('<%s:Identifier Authority=%s>%s</%s:Identifier>\n' % (
+                ns, attribute(partner.partner_id.authority),
+                text(partner.partner_id.value), ns))
+        if partner.has_contact_info:
+            parts.append('<%s:ContactInformation>\n' % ns)
+            for tag, value in (
+                    ('Contact', partner.contact),
+                    ('EmailAddress', partner.email_address),
+                    ('FaxNumber', partner.fax_number),
+                    ('TelephoneNumber', partner.telephone_number),
+                    ('ContactTypeIdentifier',
+                     partner.contact_type_identifier)):
+                if value:
+                    parts.append('<%s:%s>%s</%s:%s>\n' %
+                                 (ns, tag, text(value), ns, tag))
+            parts.append('</%s:ContactInformation>\n' % ns)
+        parts.append('</%s:%s>\n' % (ns, partner_type))
+    identification = sbd_header.document_identification
+    parts.append('<%s:DocumentIdentification>\n' % ns)
+    for tag, value, required in (
+            ('Standard', identification.standard, True),
+            ('TypeVersion', identification.type_version, True),
+            ('InstanceIdentifier', identification.instance_identifier,
+             False),
+            ('Type', identification.document_type, True),
+            ('MultipleType', identification.multiple_type, False),
+            ('CreationDateAndTime', identification.creation_date_and_time,
+             False)):
+        if required or value:
+            parts.append('<%s:%s>%s</%s:%s>\n' %
+                         (ns, tag, text(value), ns, tag))
+    parts.append('</%s:DocumentIdentification>\n'
+                 '</%s:StandardBusinessDocumentHeader>\n' % (ns, ns))
+    return ''.join(parts)
+
+
+class XMLSerializer(object):
+    '''
+    Serializes events, SBDH headers and EPCIS documents to EPCIS 1.2 XML.
+    Events are dispatched on their `event_type` attribute so the
+    serializer works with both the plain `events` classes and the
+    `template_events` classes.  Instances hold no state and can be
+    shared between threads.
+    '''
+
+    def __init__(self):
+        self.event_serializers = {
+            events.EventType.Object: object_event,
+            events.EventType.Aggregation: aggregation_event,
+            events.EventType.Transaction: transaction_event,
+            events.EventType.Transformation: transformation_event,
+        }
+
+    def serialize(self, obj) -> str:
+        '''
+        :param obj: An event, SBDH header or EPCIS document.
+        :return: The XML for `obj` as a string.
+        '''
+        return ''.join(self.iter_serialize(obj))
+
+    def iter_serialize(self, obj):
+        '''
+        :param obj: An event, SBDH header or EPCIS document.
+        :return: An iterable of string chunks- one per event for
+            documents.
+        '''
+        if isinstance(obj, events.EPCISDocument):
+            return self.iter_document(obj)
+        if isinstance(obj, sbdh.StandardBusinessDocumentHeader):
+            return [header(obj)]
+        return [self.serialize_event(obj)]
+
+    def serialize_event(self, event) -> str:
+        '''
+        :param event: An EPCIS event.
+        :return: The event's XML element.
+        '''
+        try:
+            func = self.event_serializers[event.event_type]
+        except (KeyError, AttributeError):
+            if hasattr(event, 'iter_render'):
+                return ''.join(event.iter_render())
+            raise TypeError('Can not serialize %r to XML.' % event)
+        return func(event)
+
+    def cached_event(self, event) -> str:
+        '''
+        Like `serialize_event` but re-uses the XML already cached by
+        template events (see `TemplateMixin.cache_fragments`) when this is
+        the shared `fast` backend serializer.
+        :param event: An EPCIS event.
+        :return: The event's XML element.
+        '''
+        if self is serializer and hasattr(event, '_fragment'):
+            return event._fragment(
+                ('xml', 'fast'), functools.partial(self.serialize_event,
+                                                   event), False)
+        return self.serialize_event(event)
+
+    def iter_events(self, event_iterable, extension=False):
+        serialize_event = self.cached_event
+        for event in event_iterable:
+            if extension or getattr(event, 'event_type', None) == \
+                    events.EventType.Transformation:
+                yield EXTENSION_START + serialize_event(event) + \
+                      EXTENSION_END
+            else:
+                yield serialize_event(event)
+
+    def document_start(self, document: events.EPCISDocument) -> str:
+        '''
+        :return: Everything in the document up to the first event.
+        '''
+        sbd_header = document.header
+        start = [XML_DECLARATION] if document.render_xml_declaration else []
+        start.append(DOCUMENT_START)
+        if sbd_header:
+            start.append(' xmlns:%s=%s' % (
+                sbd_header.namespace, attribute(sbd_header.schema_location)))
+        start.append(' schemaVersion="1.2" creationDate=%s>\n' %
+                     attribute(document.created_date))
+        if sbd_header:
+            start.append('<EPCISHeader>\n%s</EPCISHeader>\n' %
+                         header(sbd_header))
+        start.append(DOCUMENT_BODY_START)
+        return ''.join(start)
+
+    def iter_document_end(self, document: events.EPCISDocument):
+        '''
+        :return: A generator of the document's `transformation_events`
+            list and the closing tags.
+        '''
+        yield from self.iter_events(document.transformation_events or [],
+                                    extension=True)
+        yield DOCUMENT_END
+
+    def iter_document(self, document: events.EPCISDocument):
+        '''
+        Serializes an `EPCISDocument` or `EPCISEventListDocument`.
+        TransformationEvents are each wrapped in an `extension` element.
+        :return: A generator of string chunks.
+        '''
+        yield self.document_start(document)
+        template_events = getattr(document, 'template_events', None)
+        if template_events is not None:
+            yield from self.iter_events(template_events)
+        else:
+            yield from self.iter_events(document.object_events or [])
+            yield from self.iter_events(document.aggregation_events or [])
+            yield from self.iter_events(document.transaction_events or [])
+        yield from self.iter_document_end(document)
+
+
+serializer = XMLSerializer()
+'''
+The shared instance registered as the `fast` backend.
+'''
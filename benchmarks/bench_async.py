@@ -0,0 +1,77 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Measures how long an asyncio event loop is blocked while a large
+EPCISEventListDocument is rendered with render(), render_async() and
+render_async() on a thread pool.
+
+    python -m benchmarks.bench_async [events] [epcs_per_event]
+'''
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.workloads import make_events, make_sbdh, report
+
+
+async def heartbeat(gaps):
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(0)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def measure_loop(render):
+    gaps = []
+    task = asyncio.ensure_future(heartbeat(gaps))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await render()
+    elapsed = time.perf_counter() - start
+    # let the heartbeat record the gap spanning the end of the render
+    await asyncio.sleep(0)
+    task.cancel()
+    return elapsed, max(gaps)
+
+
+def main(count=2000, epcs_per_event=100):
+    doc = EPCISEventListDocument(make_events(count, epcs_per_event),
+                                 header=make_sbdh())
+    executor = ThreadPoolExecutor(1)
+
+    async def blocking():
+        doc.render()
+
+    modes = (('render()', blocking),
+             ('render_async()', doc.render_async),
+             ('render_async(executor)',
+              lambda: doc.render_async(executor=executor)))
+    loop = asyncio.new_event_loop()
+    rows = []
+    for name, render in modes:
+        elapsed, gap = loop.run_until_complete(measure_loop(render))
+        rows.append((name, '%.2f' % elapsed, '%.1f' % (gap * 1000)))
+    loop.close()
+    executor.shutdown()
+    report('%d events, %d EPCs each' % (count, epcs_per_event), rows,
+           ('mode', 'seconds', 'longest loop stall ms'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
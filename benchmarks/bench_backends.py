@@ -0,0 +1,57 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares the events per second of the Jinja2 template backend with the
+fast XML serializer backend for each event type and for a whole
+EPCISEventListDocument.
+
+    python -m benchmarks.bench_backends [events] [epcs_per_event]
+'''
+import sys
+
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_object_event, make_aggregation_event, \
+    make_transaction_event, make_transformation_event, make_events, \
+    make_sbdh, measure, report
+
+BACKENDS = ('template', 'fast')
+
+
+def main(count=2000, epcs_per_event=10):
+    rows = []
+    for name, factory in (('ObjectEvent', make_object_event),
+                          ('AggregationEvent', make_aggregation_event),
+                          ('TransactionEvent', make_transaction_event),
+                          ('TransformationEvent', make_transformation_event)):
+        event = factory(epcs_per_event=epcs_per_event)
+        rates = [1 / measure(lambda: event.render(backend=backend),
+                             number=count // 10) for backend in BACKENDS]
+        rows.append((name, '%.0f' % rates[0], '%.0f' % rates[1],
+                     '%.1fx' % (rates[1] / rates[0])))
+    doc = EPCISEventListDocument(
+        make_events(count, epcs_per_event, transformation_every=10),
+        header=make_sbdh())
+    rates = [count / measure(lambda: doc.render_to(NullWriter(),
+                                                   backend=backend))
+             for backend in BACKENDS]
+    rows.append(('document render_to', '%.0f' % rates[0], '%.0f' % rates[1],
+                 '%.1fx' % (rates[1] / rates[0])))
+    report('Events per second, %d EPCs per event' % epcs_per_event, rows,
+           ('workload', 'template', 'fast', 'speedup'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
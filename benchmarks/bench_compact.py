@@ -0,0 +1,57 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares the size and rendering throughput of indented and compact
+EPCISEventListDocument output.  The fragment cache is switched off so
+every round renders the events again.
+
+    python -m benchmarks.bench_compact [events] [epcs_per_event]
+'''
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_events, make_sbdh, measure, report
+
+RENDERS = (
+    ('template', {}),
+    ('template compact', {'compact': True}),
+    ('fast', {'backend': 'fast'}),
+)
+
+
+def main(count=1000, epcs_per_event=100):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    doc = EPCISEventListDocument(
+        make_events(count, epcs_per_event, transformation_every=10),
+        header=make_sbdh())
+    rows = []
+    baseline = None
+    for name, kwargs in RENDERS:
+        writer = NullWriter()
+        doc.render_to(writer, **kwargs)
+        elapsed = measure(lambda: doc.render_to(NullWriter(), **kwargs))
+        baseline = baseline or writer.size
+        rows.append((name, '%.1f' % (writer.size / 2 ** 20),
+                     '%.0f%%' % (100.0 * writer.size / baseline),
+                     '%.0f' % (count / elapsed),
+                     '%.1f' % (writer.size / 2 ** 20 / elapsed)))
+    report('%d events, %d EPCs per event' % (count, epcs_per_event), rows,
+           ('output', 'MB', 'size', 'events/s', 'MB/s'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,62 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Measures render_to with gzip compression at each compression level
+against rendering and then compressing the whole string.  Rates are
+uncompressed document bytes per second.
+
+    python -m benchmarks.bench_compression [events] [epcs_per_event]
+'''
+import gzip
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_events, make_sbdh, measure, report
+
+
+def main(count=1000, epcs_per_event=100):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    doc = EPCISEventListDocument(
+        make_events(count, epcs_per_event, transformation_every=10),
+        header=make_sbdh())
+    rows = []
+    for backend in ('template', 'fast'):
+        size = len(doc.render(backend=backend).encode('utf-8'))
+        elapsed = measure(lambda: doc.render_to(NullWriter(),
+                                                backend=backend))
+        rows.append((backend, '-', '%.1f' % (size / 2 ** 20),
+                     '%.1f' % (size / 2 ** 20 / elapsed)))
+        for level in range(1, 10):
+            writer = NullWriter()
+            doc.render_to(writer, backend=backend, compression='gzip',
+                          compression_level=level)
+            elapsed = measure(lambda: doc.render_to(
+                NullWriter(), backend=backend, compression='gzip',
+                compression_level=level))
+            rows.append((backend, level, '%.2f' % (writer.size / 2 ** 20),
+                         '%.1f' % (size / 2 ** 20 / elapsed)))
+    data = doc.render().encode('utf-8')
+    elapsed = measure(lambda: gzip.compress(doc.render().encode('utf-8')))
+    rows.append(('render + gzip.compress', 9,
+                 '%.2f' % (len(gzip.compress(data)) / 2 ** 20),
+                 '%.1f' % (len(data) / 2 ** 20 / elapsed)))
+    report('%d events, %d EPCs per event' % (count, epcs_per_event), rows,
+           ('backend', 'level', 'MB out', 'MB/s'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
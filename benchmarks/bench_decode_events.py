@@ -0,0 +1,69 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Times decoding a mix of small object, aggregation and transformation
+event payloads- one EPC each- with a decoder built per payload (the way
+the decoders were used before `decode_events`), with `decode_events`
+and with `decode_events` in a pool of worker processes.
+
+    python -m benchmarks.bench_decode_events [events] [workers]
+'''
+import json
+import os
+import sys
+from itertools import cycle, islice
+
+from EPCPyYes.core.v1_2.json_decoders import decode_events, EVENT_DECODERS
+from benchmarks.workloads import iter_events, measure, report
+
+
+def per_payload(payloads):
+    for payload in payloads:
+        key, = payload
+        yield EVENT_DECODERS[key](payload).get_event()
+
+
+def main(count=1000000, workers=None):
+    workers = workers or os.cpu_count()
+    # a pool of distinct events repeated up to the count keeps setting up
+    # the payloads out of the timings
+    pool = [event.render_json(backend='json') for event in
+            iter_events(1000, epcs_per_event=1, ilmd_size=0,
+                        transformation_every=4)]
+    strings = list(islice(cycle(pool), count))
+    dicts = list(islice(cycle([json.loads(payload) for payload in pool]),
+                        count))
+
+    def drain(events):
+        for _ in events:
+            pass
+
+    rows = []
+    for name, func in (
+            ('decoder per payload', lambda: drain(per_payload(dicts))),
+            ('decode_events', lambda: drain(decode_events(dicts))),
+            ('decode_events JSON',
+             lambda: drain(decode_events(strings))),
+            ('decode_events JSON %d workers' % workers,
+             lambda: drain(decode_events(strings, workers=workers,
+                                         batch_size=1024)))):
+        elapsed = measure(func, repeat=1)
+        rows.append((name, '%.2f' % elapsed, '%.0f' % (count / elapsed)))
+    report('Decoding %d events' % count, rows,
+           ('mode', 'seconds', 'events/s'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,78 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Times decoding quantity lists and error declarations with the decoder
+mixins against the previous implementation, which built a namedtuple
+class for every element.
+
+    python -m benchmarks.bench_decode_quantities [elements]
+'''
+import sys
+from collections import namedtuple
+
+from EPCPyYes.core.v1_2.events import QuantityElement, ErrorDeclaration
+from EPCPyYes.core.v1_2.json_decoders import AggregationEventDecoder
+from benchmarks.workloads import measure, report
+
+
+def namedtuple_quantities(child_quantity_list):
+    ret = []
+    for child_quantity in child_quantity_list:
+        child_quantity = namedtuple('Quantity', child_quantity.keys())(
+            *child_quantity.values())
+        ret.append(QuantityElement(
+            epc_class=getattr(child_quantity, 'epcClass'),
+            quantity=getattr(child_quantity, 'quantity'),
+            uom=getattr(child_quantity, 'uom')))
+    return ret
+
+
+def namedtuple_error_declaration(error_declaration):
+    error_declaration = namedtuple(
+        'ErrorDeclaration', error_declaration.keys())(
+        *error_declaration.values())
+    return ErrorDeclaration(
+        declaration_time=error_declaration.declarationTime,
+        reason=error_declaration.reason,
+        corrective_event_ids=getattr(error_declaration,
+                                     'correctiveEventIDs'))
+
+
+def main(count=10000):
+    quantities = [{'epcClass': 'urn:epc:idpat:sgtin:305555.0555551.*',
+                   'quantity': i, 'uom': 'EA'} for i in range(count)]
+    declarations = [{'declarationTime': '2018-01-01T00:00:00+00:00',
+                     'reason': 'urn:epcglobal:cbv:er:incorrect_data',
+                     'correctiveEventIDs': ['a', 'b']}] * count
+    decoder = AggregationEventDecoder({'aggregationEvent': {}})
+    rows = []
+    for name, before, after in (
+            ('%d quantity elements' % count,
+             lambda: namedtuple_quantities(quantities),
+             lambda: decoder.decode_child_quantity_list(quantities)),
+            ('%d error declarations' % count,
+             lambda: [namedtuple_error_declaration(d) for d in declarations],
+             lambda: [decoder.decode_error_declaration(d)
+                      for d in declarations])):
+        slow = measure(before)
+        fast = measure(after)
+        rows.append((name, '%.1f' % (slow * 1000), '%.1f' % (fast * 1000),
+                     '%.0fx' % (slow / fast)))
+    report('Decode time', rows, ('workload', 'namedtuple ms', 'mapped ms',
+                                 'speedup'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
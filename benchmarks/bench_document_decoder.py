@@ -0,0 +1,71 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Decodes a generated EPCIS JSON document with `json.load` followed by the
+event decoders and with the incremental `EPCISDocumentDecoder`,
+reporting the throughput and the peak memory of each.
+
+    python -m benchmarks.bench_document_decoder [events] [epcs_per_event]
+'''
+import json
+import os
+import sys
+import tempfile
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.json_decoders import EPCISDocumentDecoder, \
+    decode_event
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import peak
+from benchmarks.workloads import iter_events, make_sbdh, report
+
+
+def load_whole(path):
+    with open(path, 'rb') as f:
+        document = json.load(f)
+    for payload in document['events']:
+        decode_event(payload)
+
+
+def decode_incrementally(path):
+    with open(path, 'rb') as f:
+        for _ in EPCISDocumentDecoder(f):
+            pass
+
+
+def main(count=20000, epcs_per_event=10):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    fd, path = tempfile.mkstemp(suffix='.json')
+    rows = []
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            EPCISEventListDocument(iter_events(count, epcs_per_event),
+                                   header=make_sbdh()).render_json_to(f)
+        size = os.path.getsize(path) / 2 ** 20
+        for name, func in (('json.load + decoders', load_whole),
+                           ('EPCISDocumentDecoder', decode_incrementally)):
+            elapsed, peak_size = peak(lambda: func(path))
+            rows.append((name, '%.2f' % elapsed, '%.0f' % (count / elapsed),
+                         '%.1f' % (size / elapsed),
+                         '%.1f' % (peak_size / 2 ** 20)))
+    finally:
+        os.remove(path)
+    report('%.1f MiB document, %d events, %d EPCs each' % (
+        size, count, epcs_per_event), rows,
+        ('mode', 'seconds', 'events/s', 'MB/s', 'peak MiB'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,83 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares building template events against a private Jinja2 environment
+per event (the behavior before the environment registry) with building
+them against the shared, registry-provided environment.
+
+    python -m benchmarks.bench_environment [events]
+'''
+import gc
+import sys
+import tracemalloc
+
+from jinja2 import Environment, PackageLoader
+
+from EPCPyYes.core.v1_2.template_events import ObjectEvent, AggregationEvent
+from benchmarks.workloads import make_epcs, measure, report
+
+
+def private_environment():
+    return Environment(loader=PackageLoader('EPCPyYes', 'templates'),
+                       extensions=['jinja2.ext.with_'], trim_blocks=True,
+                       lstrip_blocks=True)
+
+
+def build(count, event_class, shared):
+    epcs = make_epcs(1000, 10)
+    events = []
+    for _ in range(count):
+        env = None if shared else private_environment()
+        events.append(event_class(epc_list=epcs, env=env) if
+                      event_class is ObjectEvent else
+                      event_class(child_epcs=epcs, env=env))
+    return events
+
+
+def memory_per_event(count, event_class, shared):
+    gc.collect()
+    tracemalloc.start()
+    events = build(count, event_class, shared)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return current / count
+
+
+def main(count=2000):
+    # warm up the shared environment so it is not charged to the first event
+    build(1, ObjectEvent, True)
+    rows = []
+    for event_class in (ObjectEvent, AggregationEvent):
+        private_time = measure(lambda: build(count, event_class, False))
+        shared_time = measure(lambda: build(count, event_class, True))
+        private_mem = memory_per_event(count, event_class, False)
+        shared_mem = memory_per_event(count, event_class, True)
+        rows.append((
+            event_class.__name__,
+            '%.1f' % (private_time / count * 1e6),
+            '%.1f' % (shared_time / count * 1e6),
+            '%.1f' % ((private_time - shared_time) / count * 1e6),
+            '%.0f' % private_mem,
+            '%.0f' % shared_mem,
+            '%.0f' % (private_mem - shared_mem),
+        ))
+    report('Event construction, %d events' % count, rows,
+           ('event', 'private us', 'shared us', 'saved us',
+            'private B', 'shared B', 'saved B'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
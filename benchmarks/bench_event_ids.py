@@ -0,0 +1,74 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Times decoding small events with their ids never read (generated lazily,
+so never at all) against reading every id- which costs what generating
+the ids eagerly did- with each of the ID generators.
+
+    python -m benchmarks.bench_event_ids [events]
+'''
+import json
+import sys
+from itertools import cycle, islice
+
+import EPCPyYes
+from EPCPyYes.core import ids
+from EPCPyYes.core.SBDH import sbdh
+from EPCPyYes.core.v1_2.json_decoders import decode_events
+from benchmarks.workloads import iter_events, measure, report
+
+
+def main(count=200000):
+    pool = [json.loads(event.render_json(backend='json')) for event in
+            iter_events(1000, epcs_per_event=1, ilmd_size=0,
+                        transformation_every=4)]
+    payloads = list(islice(cycle(pool), count))
+
+    def decode(read_ids):
+        for event in decode_events(payloads):
+            if read_ids:
+                event.id
+
+    def identifications(eager):
+        for _ in range(count):
+            identification = sbdh.DocumentIdentification()
+            if eager:
+                identification.instance_identifier
+
+    generator = EPCPyYes.ID_GENERATOR
+    rows = []
+    try:
+        lazy = measure(lambda: decode(False))
+        rows.append(('decode, ids unread', '', '%.2f' % lazy,
+                     '%.0f' % (count / lazy)))
+        for name in ids.available_id_generators():
+            EPCPyYes.ID_GENERATOR = name
+            elapsed = measure(lambda: decode(True))
+            rows.append(('decode, ids read', name, '%.2f' % elapsed,
+                         '%.0f' % (count / elapsed)))
+        EPCPyYes.ID_GENERATOR = 'uuid4'
+        for eager in (False, True):
+            elapsed = measure(lambda: identifications(eager))
+            rows.append(('DocumentIdentification, %s' % (
+                'identifier read' if eager else 'identifier unread'),
+                'uuid4', '%.2f' % elapsed, '%.0f' % (count / elapsed)))
+    finally:
+        EPCPyYes.ID_GENERATOR = generator
+    report('%d events' % count, rows,
+           ('workload', 'generator', 'seconds', 'per second'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,61 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Measures re-rendering the same EPCISEventListDocument- as when a
+document is sent to several partners- with the rendered fragment cache
+switched off and on.  With the cache on the events are rendered once
+first so the document can re-use their fragments.
+
+    python -m benchmarks.bench_fragment_cache [events] [epcs_per_event]
+'''
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    fragment_cache
+from benchmarks.workloads import make_events, make_sbdh, measure, report
+
+RENDERS = (
+    ('render', lambda doc: doc.render(), lambda event: event.render()),
+    ('render fast', lambda doc: doc.render(backend='fast'),
+     lambda event: event.render(backend='fast')),
+    ('render_json', lambda doc: doc.render_json(backend='json'),
+     lambda event: event.render_json(backend='json')),
+)
+
+
+def main(count=2000, epcs_per_event=10):
+    doc = EPCISEventListDocument(
+        make_events(count, epcs_per_event, transformation_every=10),
+        header=make_sbdh())
+    rows = []
+    for name, render, warm in RENDERS:
+        EPCPyYes.CACHE_FRAGMENTS = False
+        uncached = measure(lambda: render(doc))
+        EPCPyYes.CACHE_FRAGMENTS = True
+        # documents only re-use what their events have cached
+        for event in doc.template_events:
+            warm(event)
+        cached = measure(lambda: render(doc))
+        rows.append((name, '%.0f' % (count / uncached),
+                     '%.0f' % (count / cached),
+                     '%.1fx' % (uncached / cached)))
+    report('Events per second re-rendering a document of %d events' % count,
+           rows, ('workload', 'uncached', 'cached', 'speedup'))
+    print('cache: %r' % fragment_cache.as_dict())
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,50 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares rendering events with the regular template environment and
+with an environment that inlines the template includes.  The fragment
+cache is switched off so every round renders the events again.
+
+    python -m benchmarks.bench_inline [events] [epcs_per_event]
+'''
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.environment import get_environment
+from benchmarks.workloads import make_events, measure, report
+
+
+def main(count=2000, epcs_per_event=10):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    rows = []
+    baseline = None
+    for name, inline in (('includes', False), ('inlined', True)):
+        env = get_environment(inline_includes=inline)
+        events = make_events(count, epcs_per_event, transformation_every=10)
+        for event in events:
+            event._env = env
+            event.template = env.get_template(event.template.name)
+            event.render()
+        elapsed = measure(lambda: [event.render() for event in events])
+        baseline = baseline or elapsed
+        rows.append((name, '%.0f' % (count / elapsed),
+                     '%.1f' % (elapsed / count * 1e6),
+                     '%.2fx' % (baseline / elapsed)))
+    report('%d events, %d EPCs per event' % (count, epcs_per_event), rows,
+           ('templates', 'events/s', 'us/event', 'speedup'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
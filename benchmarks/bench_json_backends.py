@@ -0,0 +1,56 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares the events per second of the JSON backends rendering an
+EPCISEventListDocument with `render_json`, `render_pretty_json(indent=2)`
+and `render_json_to`.  The fragment cache is off so every round encodes
+every event.
+
+    python -m benchmarks.bench_json_backends [events] [epcs_per_event]
+'''
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.json_backends import available_json_backends
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_events, make_sbdh, measure, report
+
+
+def main(count=2000, epcs_per_event=10):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    doc = EPCISEventListDocument(
+        make_events(count, epcs_per_event, transformation_every=10),
+        header=make_sbdh())
+    backends = available_json_backends()
+    rows = []
+    for name, render in (
+            ('render_json', lambda backend: doc.render_json(backend=backend)),
+            ('render_pretty_json',
+             lambda backend: doc.render_pretty_json(2, backend=backend)),
+            ('render_json_to',
+             lambda backend: doc.render_json_to(NullWriter(),
+                                                backend=backend))):
+        rates = [count / measure(lambda: render(backend))
+                 for backend in backends]
+        rows.append([name] + ['%.0f' % rate for rate in rates] +
+                    ['%.1fx' % (rates[-1] / rates[0])])
+    report('Events per second, %d events, %d EPCs per event' % (
+        count, epcs_per_event), rows,
+        ['workload'] + backends + ['%s/%s' % (backends[-1], backends[0])])
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
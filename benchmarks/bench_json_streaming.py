@@ -0,0 +1,54 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares the peak memory and time of encoding an EPCISEventListDocument
+built from a generator to JSON: building the whole dictionary tree and
+dumping it, `render_json` and streaming it with `render_json_to`.
+
+    python -m benchmarks.bench_json_streaming [events] [epcs_per_event]
+'''
+import json
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter, peak
+from benchmarks.workloads import iter_events, make_sbdh, report
+
+
+def main(count=2000, epcs_per_event=100):
+    EPCPyYes.CACHE_FRAGMENTS = False
+
+    def document():
+        return EPCISEventListDocument(iter_events(count, epcs_per_event),
+                                      header=make_sbdh())
+
+    modes = (
+        ('json.dumps(default())',
+         lambda doc: json.dumps(doc.encoder.default(doc))),
+        ('render_json()', lambda doc: doc.render_json()),
+        ('render_json_to()', lambda doc: doc.render_json_to(NullWriter())),
+    )
+    rows = []
+    for name, func in modes:
+        doc = document()
+        elapsed, peak_size = peak(lambda: func(doc))
+        rows.append((name, '%.2f' % elapsed, '%.1f' % (peak_size / 2 ** 20)))
+    report('%d generated events, %d EPCs each' % (count, epcs_per_event),
+           rows, ('mode', 'seconds', 'peak MiB'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
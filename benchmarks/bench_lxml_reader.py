@@ -0,0 +1,93 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Reads a generated EPCIS document back with `lxml_reader.EPCISReader` and
+reports the throughput in MB/s and the growth of the peak resident
+memory- which includes libxml2's own allocations- against parsing the
+whole tree with `lxml.etree.parse`.  Each mode runs in a fresh process.
+
+    python -m benchmarks.bench_lxml_reader [events] [epcs_per_event]
+'''
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from lxml import etree
+
+from EPCPyYes.core.v1_2.lxml_reader import EPCISReader
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import iter_events, make_sbdh, report
+
+
+def parse_tree(path):
+    etree.parse(path, etree.XMLParser(huge_tree=True))
+
+
+def read_events(path):
+    for _ in EPCISReader(path):
+        pass
+
+
+def convert_to_json(path):
+    EPCISReader(path).document().render_json_to(NullWriter())
+
+
+MODES = (
+    ('etree.parse', parse_tree),
+    ('EPCISReader', read_events),
+    ('EPCISReader -> render_json_to', convert_to_json),
+)
+
+
+def _run(func, path, queue):
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, resource.getrusage(
+        resource.RUSAGE_SELF).ru_maxrss - start_rss))
+
+
+def main(count=20000, epcs_per_event=10):
+    fd, path = tempfile.mkstemp(suffix='.xml')
+    rows = []
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            EPCISEventListDocument(
+                iter_events(count, epcs_per_event, transformation_every=10),
+                header=make_sbdh()).render_to(f, backend='fast')
+        size = os.path.getsize(path) / 2 ** 20
+        context = multiprocessing.get_context('fork')
+        for name, func in MODES:
+            queue = context.Queue()
+            process = context.Process(target=_run, args=(func, path, queue))
+            process.start()
+            elapsed, rss = queue.get()
+            process.join()
+            rows.append((name, '%.2f' % elapsed, '%.0f' % (count / elapsed),
+                         '%.1f' % (size / elapsed), '%.1f' % (rss / 1024)))
+    finally:
+        os.remove(path)
+    report('%.1f MiB document, %d events, %d EPCs each' % (
+        size, count, epcs_per_event), rows,
+        ('mode', 'seconds', 'events/s', 'MB/s', 'peak RSS +MiB'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
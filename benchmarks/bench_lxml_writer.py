@@ -0,0 +1,77 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Writes a 1M EPC EPCISEventListDocument to a file with the template
+backend (render and render_to) and with the lxml incremental writer and
+reports the time and the growth of the peak resident memory of each.
+Every mode runs in its own process so the peak memory figures do not
+affect each other.
+
+    python -m benchmarks.bench_lxml_writer [events] [epcs_per_event]
+'''
+import os
+import subprocess
+import sys
+
+from benchmarks.workloads import report
+
+MODES = ('render', 'render_to', 'lxml')
+
+CHILD = '''
+import os, resource, sys, tempfile, time
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from EPCPyYes.core.v1_2.lxml_writer import writer
+from benchmarks.workloads import make_events, make_sbdh
+mode, count, epcs_per_event = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+doc = EPCISEventListDocument(make_events(count, epcs_per_event),
+                             header=make_sbdh())
+path = os.path.join(tempfile.mkdtemp(), 'events.xml')
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+with open(path, 'wb') as f:
+    if mode == 'render':
+        f.write(doc.render().encode('utf-8'))
+    elif mode == 'render_to':
+        doc.render_to(f)
+    else:
+        writer.write(doc, f)
+elapsed = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, (after - before) / 1024, os.path.getsize(path) / 2 ** 20)
+os.remove(path)
+'''
+
+
+def run(mode, count, epcs_per_event):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.getcwd(), env.get('PYTHONPATH', '')])
+    out = subprocess.check_output(
+        [sys.executable, '-c', CHILD, mode, str(count), str(epcs_per_event)],
+        env=env)
+    return [float(value) for value in out.decode().split()]
+
+
+def main(count=1000, epcs_per_event=1000):
+    rows = []
+    for mode in MODES:
+        elapsed, growth, size = run(mode, count, epcs_per_event)
+        rows.append((mode, '%.2f' % elapsed, '%.1f' % growth, '%.1f' % size))
+    report('%d events x %d EPCs written to a file' % (count, epcs_per_event),
+           rows, ('mode', 'seconds', 'peak RSS growth MiB', 'file MiB'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
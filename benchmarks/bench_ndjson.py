@@ -0,0 +1,67 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Writes a document built from a generator as JSON Lines to a temporary
+file and reads it back, reporting the throughput and the peak memory of
+each direction for every JSON backend.  The peak stays flat as the
+event count grows.
+
+    python -m benchmarks.bench_ndjson [events] [epcs_per_event]
+'''
+import os
+import sys
+import tempfile
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.json_backends import available_json_backends
+from EPCPyYes.core.v1_2.json_decoders import iter_decode_ndjson
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import peak
+from benchmarks.workloads import iter_events, report
+
+
+def main(count=20000, epcs_per_event=10):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    fd, path = tempfile.mkstemp(suffix='.ndjson')
+    os.close(fd)
+    rows = []
+    try:
+        for backend in available_json_backends():
+            doc = EPCISEventListDocument(iter_events(count, epcs_per_event))
+
+            def write():
+                with open(path, 'wb') as f:
+                    doc.render_ndjson(f, backend=backend)
+
+            def read():
+                with open(path, 'rb') as f:
+                    for _ in iter_decode_ndjson(f, backend):
+                        pass
+
+            for name, func in (('write', write), ('read', read)):
+                elapsed, peak_size = peak(func)
+                size = os.path.getsize(path)
+                rows.append(('%s %s' % (backend, name), '%.2f' % elapsed,
+                             '%.0f' % (count / elapsed),
+                             '%.1f' % (size / 2 ** 20 / elapsed),
+                             '%.2f' % (peak_size / 2 ** 20)))
+    finally:
+        os.remove(path)
+    report('%d generated events, %d EPCs each' % (count, epcs_per_event),
+           rows, ('mode', 'seconds', 'events/s', 'MB/s', 'peak MiB'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,59 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Renders an EPCISEventListDocument in this process and with 1 to N
+worker processes and reports events per second and the speedup over
+rendering in this process.
+
+    python -m benchmarks.bench_parallel [events] [max_workers] [backend]
+'''
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_events, make_sbdh, report
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(count=20000, max_workers=None, backend='template'):
+    count = int(count)
+    max_workers = int(max_workers or os.cpu_count() or 1)
+    doc = EPCISEventListDocument(
+        make_events(count, 10, transformation_every=10), header=make_sbdh())
+    serial = timed(lambda: doc.render_to(NullWriter(), backend=backend))
+    rows = [('in process', '%.0f' % (count / serial), '1.00x')]
+    for workers in range(1, max_workers + 1):
+        # the pool is started up front so its start-up time is not counted
+        with ProcessPoolExecutor(workers) as executor:
+            executor.submit(int).result()
+            elapsed = timed(lambda: doc.render_to(
+                NullWriter(), backend=backend, workers=executor))
+        rows.append(('%d workers' % workers, '%.0f' % (count / elapsed),
+                     '%.2fx' % (serial / elapsed)))
+    report('%d events, %s backend, %d CPUs' % (count, backend,
+                                               os.cpu_count()),
+           rows, ('mode', 'events/s', 'speedup'))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,78 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Shows that rendering an EPCISEventListDocument scales linearly with the
+number of events (TransformationEvents included) and compares the cost of
+the old remove-while-iterating partitioning step on the same lists.
+
+    python -m benchmarks.bench_partition [max_events] [legacy_max_events]
+'''
+import sys
+import time
+
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \
+    TransformationEvent
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_events, report
+
+SIZES = (10000, 30000, 100000, 300000, 1000000)
+
+
+def legacy_partition(template_events):
+    '''
+    The partitioning step EPCISEventListDocument.render used to perform.
+    '''
+    transformation_events = []
+    for event in template_events:
+        if isinstance(event, TransformationEvent):
+            transformation_events.append(event)
+            template_events.remove(event)
+    return transformation_events
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(max_events=1000000, legacy_max_events=100000):
+    # a small pool of one-EPC events is repeated to build the large lists
+    # so memory use stays flat and only the document handling is measured
+    pool = make_events(100, epcs_per_event=1, ilmd_size=0,
+                       transformation_every=5)
+    rows = []
+    base = None
+    for size in SIZES:
+        if size > max_events:
+            break
+        events = (pool * (size // len(pool) + 1))[:size]
+        doc = EPCISEventListDocument(events)
+        render = timed(lambda: doc.render_to(NullWriter()))
+        assert len(events) == size
+        per_event = render / size * 1e6
+        base = base or per_event
+        legacy = '-'
+        if size <= legacy_max_events:
+            legacy = '%.2f' % timed(lambda: legacy_partition(list(events)))
+        rows.append((size, '%.2f' % render, '%.2f' % per_event,
+                     '%.2f' % (per_event / base), legacy))
+    report('EPCISEventListDocument.render_to, 1 in 5 events a '
+           'TransformationEvent', rows,
+           ('events', 'seconds', 'us/event', 'vs 10k', 'legacy partition s'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,57 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Measures the overhead of the render profiler: rendering before it was
+ever enabled, while it is enabled and after it was disabled again.  The
+fragment cache is switched off so every round renders the events again.
+
+    python -m benchmarks.bench_profiling [events] [epcs_per_event]
+'''
+import sys
+
+import EPCPyYes
+from EPCPyYes.core.v1_2 import profiling
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.bench_streaming import NullWriter
+from benchmarks.workloads import make_events, make_sbdh, measure, report
+
+
+def main(count=1000, epcs_per_event=10):
+    EPCPyYes.CACHE_FRAGMENTS = False
+    doc = EPCISEventListDocument(
+        make_events(count, epcs_per_event, transformation_every=10),
+        header=make_sbdh())
+
+    def render():
+        doc.render_to(NullWriter())
+        doc.render_json()
+
+    rows = []
+    baseline = None
+    for name in ('never enabled', 'enabled', 'disabled'):
+        if name == 'enabled':
+            profiling.profiler.enable()
+        elif name == 'disabled':
+            profiling.profiler.disable()
+        elapsed = measure(render)
+        baseline = baseline or elapsed
+        rows.append((name, '%.0f' % (count / elapsed),
+                     '%+.1f%%' % (100.0 * (elapsed - baseline) / baseline)))
+    report('%d events, %d EPCs per event' % (count, epcs_per_event), rows,
+           ('profiler', 'events/s', 'overhead'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
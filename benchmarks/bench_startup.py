@@ -0,0 +1,82 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Measures the time-to-first-render of a fresh worker process with the
+template sources, with a warm on-disk bytecode cache and with a
+precompiled template bundle.
+
+    python -m benchmarks.bench_startup [runs]
+'''
+import os
+import subprocess
+import sys
+import tempfile
+
+from EPCPyYes.core.v1_2.environment import compile_templates
+from benchmarks.workloads import report
+
+CHILD = '''
+import time
+start = time.perf_counter()
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument, \\
+    ObjectEvent, AggregationEvent
+from EPCPyYes.core.SBDH.template_sbdh import StandardBusinessDocumentHeader
+epcs = ['urn:epc:id:sgtin:305555.1555555.%d' % i for i in range(10)]
+EPCISEventListDocument(
+    [ObjectEvent(epc_list=epcs), AggregationEvent(child_epcs=epcs)],
+    header=StandardBusinessDocumentHeader()).render()
+print(time.perf_counter() - start)
+'''
+
+
+def first_render(env_vars):
+    env = dict(os.environ, **env_vars)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.getcwd(), env.get('PYTHONPATH', '')])
+    out = subprocess.check_output([sys.executable, '-c', CHILD], env=env)
+    return float(out.decode().strip().splitlines()[-1])
+
+
+def best(env_vars, runs):
+    return min(first_render(env_vars) for _ in range(runs))
+
+
+def main(runs=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        missing = os.path.join(tmp, 'missing.zip')
+        cache_dir = os.path.join(tmp, 'bytecode')
+        os.mkdir(cache_dir)
+        bundle = compile_templates(os.path.join(tmp, 'compiled.zip'))
+        sources = {'EPCPYYES_COMPILED_TEMPLATES': missing}
+        bytecode = {'EPCPYYES_COMPILED_TEMPLATES': missing,
+                    'EPCPYYES_TEMPLATE_CACHE': cache_dir}
+        # populate the bytecode cache
+        first_render(bytecode)
+        compiled = {'EPCPYYES_COMPILED_TEMPLATES': bundle}
+        baseline = best(sources, runs)
+        rows = []
+        for name, env_vars in (('template sources', sources),
+                               ('bytecode cache', bytecode),
+                               ('compiled bundle', compiled)):
+            elapsed = best(env_vars, runs) if env_vars is not sources \
+                else baseline
+            rows.append((name, '%.1f' % (elapsed * 1000),
+                         '%.2fx' % (baseline / elapsed)))
+        report('Time to first render (import + render), best of %d' % runs,
+               rows, ('mode', 'ms', 'speedup'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,66 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Compares the peak memory and time of rendering an EPCISEventListDocument
+to a string with streaming it to a writable.
+
+    python -m benchmarks.bench_streaming [events] [epcs_per_event]
+'''
+import sys
+import time
+import tracemalloc
+
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from benchmarks.workloads import make_events, make_sbdh, report
+
+
+class NullWriter(object):
+    '''
+    A writable that counts and discards what is written to it.
+    '''
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def peak(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak_size
+
+
+def main(count=2000, epcs_per_event=100):
+    events = make_events(count, epcs_per_event)
+    doc = EPCISEventListDocument(events, header=make_sbdh())
+    rows = []
+    size = len(doc.render().encode('utf-8'))
+    for name, func in (('render()', doc.render),
+                       ('render_to()', lambda: doc.render_to(NullWriter()))):
+        elapsed, peak_size = peak(func)
+        rows.append((name, '%.2f' % elapsed, '%.1f' % (peak_size / 2 ** 20)))
+    report('%d events, %d EPCs each, %.1f MiB document' %
+           (count, epcs_per_event, size / 2 ** 20), rows,
+           ('mode', 'seconds', 'peak MiB'))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,302 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+The benchmark suite.  Runs every case against a grid of synthetic
+workloads and writes the results to a JSON file so runs on different
+commits can be compared:
+
+    python -m benchmarks.suite run --output base.json
+    git checkout my-branch
+    python -m benchmarks.suite run --output head.json
+    python -m benchmarks.suite compare base.json head.json
+
+The workload parameters take comma separated lists and every
+combination is run:
+
+    python -m benchmarks.suite run --events 100,1000 --epcs 10,100 \\
+        --ilmd 0,5 --sbdh on,off --cases render,render_json
+
+`compare` prints the change in throughput of every case and exits with
+status 1 if any case got slower than the `--threshold` (10% by default).
+The fragment cache is switched off so every round does the full work.
+The JSON cases use `EPCPyYes.JSON_BACKEND` unless `--json-backend` picks
+one; the backend used is recorded with the environment of the run.
+'''
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+
+import jinja2
+import lxml
+
+import EPCPyYes
+from EPCPyYes.core.v1_2.events import EventType
+from EPCPyYes.core.v1_2.json_backends import get_json_backend
+from EPCPyYes.core.v1_2.json_decoders import ObjectEventDecoder, \
+    AggregationEventDecoder
+from EPCPyYes.core.v1_2.template_events import EPCISEventListDocument
+from EPCPyYes.core.tests.test_utils import validate_epcis_doc, \
+    get_epcis_parser
+from benchmarks.workloads import make_events, make_sbdh, measure, report
+
+FORMAT_VERSION = 1
+
+
+class Workload(object):
+    '''
+    A synthetic document and the inputs the cases need.
+    '''
+
+    def __init__(self, events, epcs, ilmd, sbdh):
+        self.params = OrderedDict((('events', events), ('epcs', epcs),
+                                   ('ilmd', ilmd), ('sbdh', sbdh)))
+        self.events = make_events(events, epcs, ilmd,
+                                  transformation_every=10)
+        self.document = EPCISEventListDocument(
+            self.events, header=make_sbdh() if sbdh else None)
+        self.xml = self.document.render().encode('utf-8')
+        self.object_json = self.event_json(EventType.Object)
+        self.aggregation_json = self.event_json(EventType.Aggregation)
+
+    def event_json(self, event_type):
+        return [event.render_json() for event in self.events
+                if event.event_type == event_type]
+
+
+def _decode(decoder, payloads):
+    def decode():
+        for payload in payloads:
+            decoder(payload).get_event()
+    return decode
+
+
+CASES = OrderedDict((
+    ('render', lambda w: (w.document.render, len(w.events))),
+    ('render_json', lambda w: (w.document.render_json, len(w.events))),
+    ('render_pretty_json',
+     lambda w: (w.document.render_pretty_json, len(w.events))),
+    ('render_dict', lambda w: (w.document.render_dict, len(w.events))),
+    ('decode_object', lambda w: (_decode(ObjectEventDecoder, w.object_json),
+                                 len(w.object_json))),
+    ('decode_aggregation',
+     lambda w: (_decode(AggregationEventDecoder, w.aggregation_json),
+                len(w.aggregation_json))),
+    ('validate', lambda w: (lambda: validate_epcis_doc(w.xml),
+                            len(w.events))),
+))
+'''
+The benchmark cases.  Each takes a `Workload` and returns the function
+to time and the number of events it handles per call.
+'''
+
+
+def _size(result):
+    if isinstance(result, str):
+        return len(result.encode('utf-8'))
+    if isinstance(result, bytes):
+        return len(result)
+    return None
+
+
+def _git(*args):
+    try:
+        return subprocess.check_output(
+            ('git',) + args, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    '''
+    :return: A description of the code and platform the suite ran on.
+    '''
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return OrderedDict((
+        ('commit', _git('rev-parse', 'HEAD')),
+        ('dirty', bool(status) if status is not None else None),
+        ('python', platform.python_version()),
+        ('implementation', platform.python_implementation()),
+        ('jinja2', jinja2.__version__),
+        ('lxml', lxml.__version__),
+        ('json_backend', get_json_backend().name),
+        ('platform', platform.platform()),
+        ('timestamp', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+    ))
+
+
+def run(grid, cases, repeat=3):
+    '''
+    Runs the cases for every workload in the grid.
+
+    :param grid: A list of (events, epcs, ilmd, sbdh) tuples.
+    :param cases: The names of the cases to run.
+    :param repeat: The number of rounds- the best round is reported.
+    :return: A list of result dictionaries.
+    '''
+    EPCPyYes.CACHE_FRAGMENTS = False
+    if 'validate' in cases:
+        # parsing the schema is not part of the validation time
+        get_epcis_parser()
+    results = []
+    for params in grid:
+        workload = Workload(*params)
+        for name in cases:
+            function, events = CASES[name](workload)
+            size = _size(function())
+            seconds = measure(function, repeat=repeat)
+            results.append(OrderedDict((
+                ('case', name),
+                ('params', workload.params),
+                ('seconds', seconds),
+                ('events', events),
+                ('events_per_second', events / seconds if seconds else None),
+                ('bytes', size),
+                ('mb_per_second', size / 2 ** 20 / seconds
+                    if size and seconds else None),
+            )))
+    return results
+
+
+def _key(result):
+    return (result['case'],) + tuple(sorted(result['params'].items()))
+
+
+def _label(result):
+    return '%s %s' % (result['case'], ' '.join(
+        '%s=%s' % item for item in result['params'].items()))
+
+
+def compare(base, head, threshold=0.1):
+    '''
+    Compares two result files.
+
+    :param base: The results of the base commit.
+    :param head: The results to compare with the base.
+    :param threshold: The relative slowdown reported as a regression.
+    :return: The rows of the comparison and the regressed case labels.
+    '''
+    base_results = {_key(result): result for result in base['results']}
+    rows = []
+    regressions = []
+    for result in head['results']:
+        before = base_results.get(_key(result))
+        if before is None:
+            continue
+        change = before['seconds'] / result['seconds'] - 1.0
+        label = _label(result)
+        status = ''
+        if change < -threshold:
+            status = 'SLOWER'
+            regressions.append(label)
+        elif change > threshold:
+            status = 'faster'
+        rows.append((label, '%.0f' % before['events_per_second'],
+                     '%.0f' % result['events_per_second'],
+                     '%+.1f%%' % (100 * change), status))
+    return rows, regressions
+
+
+def _describe(environment):
+    return '%s, %s JSON' % ((environment['commit'] or '?')[:10],
+                            environment.get('json_backend', 'json'))
+
+
+def _values(convert):
+    return lambda text: [convert(value) for value in text.split(',')]
+
+
+def _flag(text):
+    if text.lower() in ('on', 'yes', 'true', '1'):
+        return True
+    if text.lower() in ('off', 'no', 'false', '0'):
+        return False
+    raise argparse.ArgumentTypeError('Expected on or off, got %s' % text)
+
+
+def _cases(text):
+    cases = text.split(',')
+    for case in cases:
+        if case not in CASES:
+            raise argparse.ArgumentTypeError(
+                'Unknown case %s- choose from %s' % (case, ', '.join(CASES)))
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Runs the EPCPyYes benchmark suite.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    run_parser = commands.add_parser('run', help='Run the benchmarks.')
+    run_parser.add_argument('--events', type=_values(int), default=[1000],
+                            help='Events per document.')
+    run_parser.add_argument('--epcs', type=_values(int), default=[10],
+                            help='EPCs per event.')
+    run_parser.add_argument('--ilmd', type=_values(int), default=[2],
+                            help='ILMD attributes per object and '
+                                 'transformation event.')
+    run_parser.add_argument('--sbdh', type=_values(_flag), default=[True],
+                            help='Render an SBDH header (on/off).')
+    run_parser.add_argument('--cases', type=_cases, default=list(CASES),
+                            help='The cases to run.')
+    run_parser.add_argument('--json-backend',
+                            help='The JSON backend of the JSON cases.')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', help='The JSON file to write.')
+    compare_parser = commands.add_parser(
+        'compare', help='Compare two result files.')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='The relative slowdown reported as a '
+                                     'regression.')
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.head) as f:
+            head = json.load(f)
+        rows, regressions = compare(base, head, args.threshold)
+        report('%s (%s) -> %s (%s)' % (
+            args.base, _describe(base['environment']),
+            args.head, _describe(head['environment'])),
+            rows, ('case', 'base events/s', 'head events/s', 'change', ''))
+        return 1 if regressions else 0
+    if args.json_backend:
+        EPCPyYes.JSON_BACKEND = get_json_backend(args.json_backend).name
+    grid = list(itertools.product(args.events, args.epcs, args.ilmd,
+                                  args.sbdh))
+    results = run(grid, args.cases, args.repeat)
+    report('EPCPyYes benchmark suite, %s JSON backend' %
+           get_json_backend().name, [
+        (_label(result), '%.0f' % result['events_per_second'],
+         '%.1f' % result['mb_per_second'] if result['mb_per_second']
+         else '') for result in results],
+        ('case', 'events/s', 'MB/s'))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(OrderedDict((('format', FORMAT_VERSION),
+                                   ('environment', environment()),
+                                   ('results', results))), f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright 2018 SerialLab Corp.  All rights reserved.
+'''
+Synthetic EPCIS workloads and timing helpers shared by the benchmarks.
+'''
+import time
+
+from EPCPyYes.core.v1_2.helpers import gtin_urn_generator, \
+    get_current_utc_time_and_offset, gln13_data_to_sgln_urn
+from EPCPyYes.core.v1_2.events import Action, BusinessTransaction, Source, \
+    Destination, QuantityElement
+from EPCPyYes.core.v1_2.template_events import ObjectEvent, \
+    AggregationEvent, TransactionEvent, TransformationEvent
+from EPCPyYes.core.v1_2.CBV.business_steps import BusinessSteps
+from EPCPyYes.core.v1_2.CBV.dispositions import Disposition
+from EPCPyYes.core.v1_2.CBV.business_transactions import \
+    BusinessTransactionType
+from EPCPyYes.core.v1_2.CBV.source_destination import SourceDestinationTypes
+from EPCPyYes.core.v1_2.CBV.instance_lot_master_data import \
+    InstanceLotMasterDataAttribute, LotLevelAttributeName, \
+    ItemLevelAttributeName
+from EPCPyYes.core.v1_2.CBV import helpers as cbv_helpers
+from EPCPyYes.core.SBDH import sbdh, template_sbdh
+
+BIZ_LOCATION = gln13_data_to_sgln_urn('305555', '123456')
+READ_POINT = gln13_data_to_sgln_urn('305555', '123456', '12')
+TRADE_ITEM = cbv_helpers.make_trade_item_master_data_urn('305555', '0',
+                                                         '555551')
+ILMD_NAMES = [LotLevelAttributeName.itemExpirationDate,
+              ItemLevelAttributeName.lotNumber,
+              LotLevelAttributeName.bestBeforeDate,
+              LotLevelAttributeName.sellByDate,
+              LotLevelAttributeName.countryOfOrigin]
+
+
+def make_epcs(start, count):
+    return list(gtin_urn_generator('305555', '1', '555555',
+                                   range(start, start + count)))
+
+
+def make_ilmd(size):
+    return [InstanceLotMasterDataAttribute(
+        name=ILMD_NAMES[i % len(ILMD_NAMES)].value, value='DL%d' % i)
+        for i in range(size)]
+
+
+def business_data():
+    return {
+        'biz_location': BIZ_LOCATION,
+        'read_point': READ_POINT,
+        'business_transaction_list': [
+            BusinessTransaction('urn:epcglobal:cbv:bt:0555555555555.DE45_111',
+                                BusinessTransactionType.Despatch_Advice)],
+        'source_list': [
+            Source(SourceDestinationTypes.possessing_party.value,
+                   BIZ_LOCATION)],
+        'destination_list': [
+            Destination(SourceDestinationTypes.owning_party.value,
+                        BIZ_LOCATION)],
+    }
+
+
+def make_object_event(start=1000, epcs_per_event=10, ilmd_size=2):
+    now, tzoffset = get_current_utc_time_and_offset()
+    return ObjectEvent(now, tzoffset, now, Action.add.value,
+                       epc_list=make_epcs(start, epcs_per_event),
+                       biz_step=BusinessSteps.commissioning.value,
+                       disposition=Disposition.encoded.value,
+                       ilmd=make_ilmd(ilmd_size), **business_data())
+
+
+def make_aggregation_event(start=1000, epcs_per_event=10):
+    now, tzoffset = get_current_utc_time_and_offset()
+    return AggregationEvent(
+        now, tzoffset, now, Action.add.value,
+        parent_id='urn:epc:id:sscc:305555.0%09d' % start,
+        child_epcs=make_epcs(start, epcs_per_event),
+        biz_step=BusinessSteps.packing.value,
+        disposition=Disposition.in_progress.value, **business_data())
+
+
+def make_transaction_event(start=1000, epcs_per_event=10):
+    now, tzoffset = get_current_utc_time_and_offset()
+    return TransactionEvent(
+        now, tzoffset, now, Action.add.value,
+        epc_list=make_epcs(start, epcs_per_event),
+        biz_step=BusinessSteps.shipping.value,
+        disposition=Disposition.in_transit.value,
+        quantity_list=[QuantityElement(TRADE_ITEM, 10, 'EA')],
+        **business_data())
+
+
+def make_transformation_event(start=1000, epcs_per_event=10, ilmd_size=2):
+    now, tzoffset = get_current_utc_time_and_offset()
+    return TransformationEvent(
+        now, tzoffset, now,
+        input_epc_list=make_epcs(start, epcs_per_event),
+        output_epc_list=make_epcs(start + 1000000, epcs_per_event),
+        output_quantity_list=[QuantityElement(TRADE_ITEM, 10, 'EA')],
+        biz_step=BusinessSteps.repackaging.value,
+        disposition=Disposition.in_progress.value,
+        ilmd=make_ilmd(ilmd_size), **business_data())
+
+
+def make_sbdh():
+    now, _ = get_current_utc_time_and_offset()
+    return template_sbdh.StandardBusinessDocumentHeader(
+        document_identification=sbdh.DocumentIdentification(
+            creation_date_and_time=now),
+        partners=[
+            sbdh.Partner(sbdh.PartnerType.SENDER,
+                         sbdh.PartnerIdentification('SGLN', BIZ_LOCATION)),
+            sbdh.Partner(sbdh.PartnerType.RECEIVER,
+                         sbdh.PartnerIdentification('SGLN', READ_POINT)),
+        ])
+
+
+def iter_events(count, epcs_per_event=10, ilmd_size=2,
+                transformation_every=0):
+    '''
+    Yields a mix of commissioning object events followed by the
+    aggregation event that packs them- optionally with a transformation
+    event every `transformation_every` events.
+    '''
+    for i in range(count):
+        start = 1000 + i * epcs_per_event
+        if transformation_every and i % transformation_every == \
+                transformation_every - 1:
+            yield make_transformation_event(start, epcs_per_event, ilmd_size)
+        elif i % 2:
+            yield make_aggregation_event(start - epcs_per_event,
+                                         epcs_per_event)
+        else:
+            yield make_object_event(start, epcs_per_event, ilmd_size)
+
+
+def make_events(count, epcs_per_event=10, ilmd_size=2,
+                transformation_every=0):
+    return list(iter_events(count, epcs_per_event, ilmd_size,
+                            transformation_every))
+
+
+def measure(func, repeat=3, number=1):
+    '''
+    Runs `func` `number` times per round for `repeat` rounds and returns
+    the best round's time per call in seconds.
+    '''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(title, rows, headers):
+    '''
+    Prints a simple fixed width table.
+    '''
+    print(title)
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows))
+              for i, h in enumerate(headers)]
+    print('  '.join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(str(c).rjust(w) for c, w in zip(row, widths)))
+    print()
@@ -39,7 +39,7 @@ setup(
     author="Serial Lab",
     author_email='slab@serial-lab.com',
     url='https://gitlab.com/serial-lab/EPCPyYes',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     package_dir={'EPCPyYes': 'EPCPyYes'},
     entry_points={
     },
@@ -47,6 +47,7 @@ setup(
                get_data_files('EPCPyYes/core/tests/schemas/'),
     include_package_data=True,
     install_requires=requirements,
+    extras_require={'orjson': ['orjson']},
     license="GNU Affero General Public License v3",
     zip_safe=False,
     keywords='EPCPyYes EPCIS GS1 RFID Serialization',